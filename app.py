@@ -3,12 +3,25 @@ StockAnalysisDashboard - Main Application
 Multi-page Streamlit application with user authentication
 """
 
+import importlib
+import pandas as pd
 import streamlit as st
 from auth.authentication import check_authentication, show_login_page
-from components.sidebar import render_sidebar
-from pages import stock_analysis, portfolio_manager, market_news, earnings_viewer
-from data.symbol_loader import load_symbols_database
-from utils.service_discovery import get_available_services,deregister_service
+from data.symbol_loader import current_symbols
+from data.symbol_client import remote_symbol_search
+from data.service_cache import service_cache
+from data.session_payloads import SessionPayloads
+from models.unit_of_work import unit_of_work
+from utils.service_discovery import service_catalog, prefetch_service_urls, deregister_service
+
+# Page modules by service display name, imported the first time they are shown
+PAGES = {
+    "Stock Analysis Service": "pages.stock_analysis",
+    "Portfolio Service": "pages.portfolio_manager",
+    "Market News Service": "pages.market_news",
+    "Earnings Service": "pages.earnings_viewer",
+    "Symbol Service": "pages.symbol_browser",
+}
 
 # Page configuration
 st.set_page_config(
@@ -42,8 +55,9 @@ if 'logged_in' not in st.session_state:
     st.session_state['logged_in'] = False
     st.session_state['username'] = None
 
-# Load symbols database (cached)
-SYMBOLS_DF = load_symbols_database()
+# Latest symbols generation (shared, refreshed in the background); not needed
+# when the symbol service answers suggestions
+SYMBOLS_DF = pd.DataFrame() if remote_symbol_search() else current_symbols()
 
 # Authentication check
 if not check_authentication():
@@ -53,22 +67,37 @@ if not check_authentication():
 # Main application (user is logged in)
 st.sidebar.title(f"👤 Welcome, {st.session_state['username']}")
 
-# Fetch available services from the service registry
-available_services = get_available_services()
-service_names = available_services.keys()  # Assuming the service names are keys in the returned dictionary
+# Fetch available services from the service registry (cached across reruns)
+available_services = service_catalog.get()
+# Refresh every service URL in the background, at most once per TTL
+prefetch_service_urls()
+# Only services with a page are offered
+service_names = [name for name in available_services if name in PAGES]
 
 # Render sidebar dynamically
-page = st.sidebar.selectbox("Choose a Service", list(service_names))
-
-# Route to appropriate page
-if page == "Stock Analysis Service":
-    stock_analysis.render( SYMBOLS_DF)
-elif page == "Portfolio Service":
-    portfolio_manager.render(SYMBOLS_DF)
-elif page == "Market News Service":
-    market_news.render( SYMBOLS_DF)
-elif page == "Earnings Service":
-    earnings_viewer.render(SYMBOLS_DF)
+page = st.sidebar.selectbox("Choose a Service", service_names)
+
+# Service responses are shared by every session; this drops them for everyone
+with st.sidebar.expander("🗄️ Cached Service Data"):
+    cache_stats = service_cache.stats()
+    st.caption(
+        f"{cache_stats['entries']} responses, {cache_stats['bytes'] / 1024:.0f} KB, "
+        f"{cache_stats['hit_ratio']:.0%} hit ratio"
+    )
+    if st.button("Clear Cached Data"):
+        service_cache.clear()
+
+    session_usage = SessionPayloads(st.session_state).usage()
+    st.caption(
+        f"This session holds {session_usage['total'] / 1024:.0f} KB of its "
+        f"{session_usage['budget'] / 1024:.0f} KB budget"
+    )
+
+# Route to appropriate page. User and portfolio writes made during the
+# rerun are flushed once at the end, including when the page calls st.rerun()
+with unit_of_work(rollback_on_error=False):
+    if page in PAGES:
+        importlib.import_module(PAGES[page]).render(SYMBOLS_DF)
 
 # Remove service functionality (for demonstration)
 # st.sidebar.subheader("Service Management")
@@ -13,6 +13,12 @@ from .authentication import (
     logout,
     show_login_page
 )
+from .user_store import (
+    UserStore,
+    PickleUserStore,
+    SQLiteUserStore,
+    get_user_store
+)
 
 __all__ = [
     'hash_password',
@@ -22,5 +28,9 @@ __all__ = [
     'authenticate_user',
     'check_authentication',
     'logout',
-    'show_login_page'
+    'show_login_page',
+    'UserStore',
+    'PickleUserStore',
+    'SQLiteUserStore',
+    'get_user_store'
 ]
\ No newline at end of file
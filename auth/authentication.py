@@ -9,8 +9,7 @@ import pickle
 import os
 from datetime import datetime
 from pathlib import Path
-
-USERS_FILE = "users_data.pkl"
+from auth.user_store import USERS_FILE, get_user_store
 
 
 def hash_password(password: str) -> str:
@@ -37,31 +36,27 @@ def save_users(users_data: dict) -> None:
 
 def create_user(username: str, password: str) -> tuple[bool, str]:
     """Create a new user account."""
-    users = load_users()
-
-    if username in users:
-        return False, "Username already exists"
-
-    users[username] = {
+    created = get_user_store().create(username, {
         'password': hash_password(password),
         'created_at': datetime.now().isoformat(),
         'portfolio': [],
         'watchlist': [],
         'preferences': {}
-    }
+    })
 
-    save_users(users)
+    if not created:
+        return False, "Username already exists"
     return True, "Account created successfully"
 
 
 def authenticate_user(username: str, password: str) -> tuple[bool, str]:
     """Authenticate user credentials."""
-    users = load_users()
+    user = get_user_store().get(username)
 
-    if username not in users:
+    if user is None:
         return False, "Username not found"
 
-    if users[username]['password'] == hash_password(password):
+    if user['password'] == hash_password(password):
         return True, "Login successful"
 
     return False, "Invalid password"
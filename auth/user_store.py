@@ -0,0 +1,308 @@
+"""
+User Store Module
+Per-user record storage backed by SQLite, with the legacy pickle as a fallback
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+USERS_FILE = "users_data.pkl"
+USERS_DB_FILE = "users.db"
+
+# Environment overrides for the backend ("sqlite" or "pickle") and database path
+USER_STORE_ENV = "USER_STORE"
+USER_DB_ENV = "USER_DB_FILE"
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file, or zeros if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0, 0
+    return st.st_mtime_ns, st.st_size
+
+
+class UserStore(ABC):
+    """Interface shared by the user store backends."""
+
+    # Commits made through this store object, bumped by the backends
+    _writes = 0
+
+    @abstractmethod
+    def generation(self) -> Tuple:
+        """
+        Token that changes whenever the stored data may have changed, from
+        this process or any other. Comparing it costs no data reads.
+        """
+
+    def get_version(self, username: str) -> Optional[int]:
+        """Per-user write counter, or None if the backend does not keep one."""
+        return None
+
+    @abstractmethod
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        """Get one user's record, or None if the user does not exist."""
+
+    @abstractmethod
+    def create(self, username: str, data: Dict[str, Any]) -> bool:
+        """Insert a new user. Returns False if the username is taken."""
+
+    @abstractmethod
+    def update(self, username: str, fields: Dict[str, Any]) -> bool:
+        """Merge fields into an existing user's record. Returns False if missing."""
+
+    @abstractmethod
+    def delete(self, username: str) -> bool:
+        """Delete a user. Returns False if missing."""
+
+    @abstractmethod
+    def usernames(self) -> List[str]:
+        """All usernames, sorted."""
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """Group several operations so they commit or roll back together."""
+
+
+class PickleUserStore(UserStore):
+    """
+    The original whole-file pickle. Every operation reads and rewrites the
+    file, so it is only meant for small single-process deployments.
+    """
+
+    def __init__(self, path: str = USERS_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._pending: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._pending is not None:
+            return self._pending
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'rb') as f:
+                    return pickle.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    def _save(self, users: Dict[str, Any]):
+        if self._pending is not None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(users, f)
+        os.replace(tmp_path, self.path)
+        self._writes += 1
+
+    def generation(self) -> Tuple:
+        return self._writes, _file_signature(self.path)
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get(username)
+
+    def create(self, username: str, data: Dict[str, Any]) -> bool:
+        with self._lock:
+            users = self._load()
+            if username in users:
+                return False
+            users[username] = dict(data)
+            self._save(users)
+            return True
+
+    def update(self, username: str, fields: Dict[str, Any]) -> bool:
+        with self._lock:
+            users = self._load()
+            if username not in users:
+                return False
+            users[username].update(fields)
+            self._save(users)
+            return True
+
+    def delete(self, username: str) -> bool:
+        with self._lock:
+            users = self._load()
+            if username not in users:
+                return False
+            del users[username]
+            self._save(users)
+            return True
+
+    def usernames(self) -> List[str]:
+        with self._lock:
+            return sorted(self._load())
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            if self._pending is not None:
+                yield
+                return
+            users = self._load()
+            self._pending = users
+            try:
+                yield
+            except BaseException:
+                self._pending = None
+                raise
+            self._pending = None
+            self._save(users)
+
+
+class SQLiteUserStore(UserStore):
+    """
+    One row per user in an SQLite database in WAL mode.
+
+    Reads and writes touch a single row through the primary key, so their
+    cost does not grow with the number of users. Each thread gets its own
+    connection; writers serialize on SQLite's lock while readers proceed.
+    """
+
+    def __init__(self, path: str = USERS_DB_FILE):
+        self.path = path
+        self._local = threading.local()
+        with self.transaction():
+            conn = self._connection()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "username TEXT PRIMARY KEY, "
+                "data TEXT NOT NULL, "
+                "version INTEGER NOT NULL DEFAULT 1)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly below
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        conn = self._connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+
+        # IMMEDIATE takes the write lock up front so read-modify-write cannot interleave
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+            self._writes += 1
+        finally:
+            self._local.depth = 0
+
+    def generation(self) -> Tuple:
+        # Commits from other processes land in the WAL file, checkpoints in the database
+        return self._writes, _file_signature(f"{self.path}-wal"), _file_signature(self.path)
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT data FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_version(self, username: str) -> Optional[int]:
+        row = self._connection().execute(
+            "SELECT version FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def create(self, username: str, data: Dict[str, Any]) -> bool:
+        with self.transaction():
+            cursor = self._connection().execute(
+                "INSERT OR IGNORE INTO users (username, data) VALUES (?, ?)",
+                (username, json.dumps(data))
+            )
+            return cursor.rowcount == 1
+
+    def update(self, username: str, fields: Dict[str, Any]) -> bool:
+        with self.transaction():
+            data = self.get(username)
+            if data is None:
+                return False
+            data.update(fields)
+            self._connection().execute(
+                "UPDATE users SET data = ?, version = version + 1 WHERE username = ?",
+                (json.dumps(data), username)
+            )
+            return True
+
+    def delete(self, username: str) -> bool:
+        with self.transaction():
+            cursor = self._connection().execute("DELETE FROM users WHERE username = ?", (username,))
+            return cursor.rowcount == 1
+
+    def usernames(self) -> List[str]:
+        rows = self._connection().execute("SELECT username FROM users ORDER BY username")
+        return [row[0] for row in rows]
+
+    def migrate_from_pickle(self, pickle_path: str = USERS_FILE) -> int:
+        """
+        Copy users from the legacy pickle file, once.
+        Users that already exist in the database are left untouched.
+        Returns the number of users imported.
+        """
+        with self.transaction():
+            conn = self._connection()
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'pickle_migrated'").fetchone():
+                return 0
+
+            users = PickleUserStore(pickle_path)._load()
+            imported = 0
+            for username, data in users.items():
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO users (username, data) VALUES (?, ?)",
+                    (username, json.dumps(data, default=str))
+                )
+                imported += cursor.rowcount
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('pickle_migrated', ?)",
+                (str(imported),)
+            )
+            return imported
+
+
+def get_user_store() -> UserStore:
+    """
+    Get the process-wide user store.
+    SQLite by default, migrating the legacy pickle on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if os.getenv(USER_STORE_ENV, "sqlite").lower() == "pickle":
+                    _store = PickleUserStore(USERS_FILE)
+                else:
+                    store = SQLiteUserStore(os.getenv(USER_DB_ENV, USERS_DB_FILE))
+                    store.migrate_from_pickle(USERS_FILE)
+                    _store = store
+    return _store
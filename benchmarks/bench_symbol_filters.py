@@ -0,0 +1,66 @@
+"""
+Symbol Filter Benchmark
+Compares precomputed filter bitmaps with pandas boolean indexing
+
+Run from the repository root:  python -m benchmarks.bench_symbol_filters
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import pandas as pd
+
+from data.symbol_filters import SymbolFilters
+
+# Three predicates, one with two alternatives
+SELECTION = {"exchange": ["Q", "N"], "etf": ["N"], "round_lot": ["100"]}
+
+
+def scan_mask(symbols_df: pd.DataFrame):
+    """The same screen as repeated boolean indexing on the string columns."""
+    return (
+        symbols_df['Listing Exchange'].astype(str).isin(["Q", "N"])
+        & (symbols_df['ETF'].astype(str) == "N")
+        & (symbols_df['Round Lot Size'] == 100.0)
+    ).to_numpy()
+
+
+def time_per_call(call: Callable[[], object], repeat: int) -> float:
+    """Mean microseconds per call."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - started) * 1e6 / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark symbol filters")
+    parser.add_argument("--csv", default="symbols_valid_meta.csv", help="Path to the symbols CSV")
+    parser.add_argument("--repeat", type=int, default=2000, help="Calls per method")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.csv)
+
+    started = time.perf_counter()
+    filters = SymbolFilters(df)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    def uncached():
+        filters._masks.clear()
+        return filters.mask(SELECTION)
+
+    scan_us = time_per_call(lambda: scan_mask(df), max(1, args.repeat // 10))
+    uncached_us = time_per_call(uncached, args.repeat)
+    cached_us = time_per_call(lambda: filters.mask(SELECTION), args.repeat)
+
+    assert (scan_mask(df) == filters.mask(SELECTION)).all()
+    print(f"{len(df)} rows, bitmaps built in {build_ms:.1f} ms, "
+          f"{int(filters.mask(SELECTION).sum())} rows match")
+    print(f"{'method':<16}{'us/call':>10}{'speedup':>10}")
+    for name, us in (("pandas", scan_us), ("bitmaps", uncached_us), ("cached mask", cached_us)):
+        print(f"{name:<16}{us:>10.1f}{scan_us / us:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Symbol Search Benchmark
+Compares the indexed search with the previous full-table scan
+
+Run from the repository root:  python -m benchmarks.bench_symbol_search
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+import pandas as pd
+
+from data.symbol_index import SymbolIndex
+
+QUERIES = [
+    "A", "AA", "AAPL", "MSFT", "GOOG", "T", "TS", "TSLA",
+    "apple", "alphabet", "microsoft", "berkshire", "coca cola",
+    "appel", "amazn", "netflx", "nvdia", "jp morgan", "walmart", "xyzzy",
+]
+
+
+def load_frame(csv_path: str) -> pd.DataFrame:
+    df = pd.read_csv(csv_path)
+    df['SearchText'] = df['Symbol'] + ' - ' + df['Security Name']
+    return df
+
+
+def scan_suggestions(symbols_df: pd.DataFrame, input_text: str, limit: int = 10) -> List[str]:
+    """The previous get_stock_suggestions: two substring scans over every row."""
+    input_text = input_text.upper()
+    suggestions = []
+
+    exact_match = symbols_df[symbols_df['Symbol'] == input_text]
+    for _, row in exact_match.iterrows():
+        suggestions.append(row['SearchText'])
+
+    if len(suggestions) < limit:
+        partial_match = symbols_df[
+            (symbols_df['Symbol'].str.contains(input_text, na=False, case=False, regex=False)) |
+            (symbols_df['SearchText'].str.upper().str.contains(input_text, na=False, regex=False))
+        ]
+        for _, row in partial_match.head(limit - len(suggestions)).iterrows():
+            if row['SearchText'] not in suggestions:
+                suggestions.append(row['SearchText'])
+
+    return suggestions[:limit]
+
+
+def time_per_query(search: Callable[[str], List[str]], repeat: int) -> float:
+    """Mean milliseconds per query over every query in QUERIES."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            search(query)
+    return (time.perf_counter() - started) * 1000 / (repeat * len(QUERIES))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark symbol search")
+    parser.add_argument("--csv", default="symbols_valid_meta.csv", help="Path to the symbols CSV")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the query set")
+    parser.add_argument("--limit", type=int, default=10, help="Results per query")
+    args = parser.parse_args(argv)
+
+    df = load_frame(args.csv)
+
+    started = time.perf_counter()
+    index = SymbolIndex(df)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    scan_ms = time_per_query(lambda q: scan_suggestions(df, q, args.limit), max(1, args.repeat // 10))
+    ranked_ms = time_per_query(lambda q: index.search(q, args.limit), args.repeat)
+
+    print(f"{len(index)} symbols, index built in {build_ms:.1f} ms")
+    print(f"{'method':<16}{'ms/query':>10}{'speedup':>10}")
+    for name, ms in (("scan", scan_ms), ("ranked search", ranked_ms)):
+        print(f"{name:<16}{ms:>10.3f}{scan_ms / ms:>9.0f}x")
+
+    print()
+    for query in ("appel", "alphabet", "coca cola"):
+        print(f"{query!r}: scan={scan_suggestions(df, query, 3)} ranked={index.search(query, 3)}")
+
+
+if __name__ == "__main__":
+    main()
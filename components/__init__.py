@@ -1,22 +1,28 @@
 """
 Components Package
 Reusable UI components
+
+Components are imported on first access, so importing one component module
+does not load the others (or plotly, which only some of them need).
 """
 
-from .stock_input import stock_input_with_suggestions
-from .sidebar import render_sidebar
-from .metrics import (
-    display_sentiment_metrics,
-    display_eps_metrics,
-    display_company_header,
-    display_key_metrics
-)
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'stock_input_with_suggestions': 'stock_input',
+    'render_sidebar': 'sidebar',
+    'render_live_quotes': 'live_quotes',
+    'display_sentiment_metrics': 'metrics',
+    'display_eps_metrics': 'metrics',
+    'display_company_header': 'metrics',
+    'display_key_metrics': 'metrics',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = [
-    'stock_input_with_suggestions',
-    'render_sidebar',
-    'display_sentiment_metrics',
-    'display_eps_metrics',
-    'display_company_header',
-    'display_key_metrics'
-]
\ No newline at end of file
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,157 @@
+"""
+Live Quotes Component
+Streams quote deltas from the portfolio service into a self-refreshing fragment
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import requests
+import streamlit as st
+
+from utils.helpers import format_currency
+from utils.service_discovery import get_service_url, track_service_call
+
+SERVICE_NAME = "Portfolio_Service"
+REFRESH_SECONDS = 2
+
+# A reader nobody has looked at for this long closes its stream
+IDLE_TIMEOUT = 120
+
+
+def iter_sse(lines: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Parse Server-Sent Events into (event, data) pairs, skipping comments."""
+    event, data = "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+
+
+def feed_key(positions: List[Dict[str, Any]], symbols: List[str]) -> Tuple:
+    """What a feed streams; a new key means a new stream."""
+    return (tuple(sorted((p['symbol'], p['shares'], p['purchase_price']) for p in positions)),
+            tuple(sorted(symbols)))
+
+
+class LiveQuoteFeed:
+    """
+    One session's connection to the quote stream.
+
+    A daemon thread reads the stream and keeps the latest row per symbol;
+    the page only reads that state, so a rerun never waits on the network.
+    The thread reconnects on errors and exits once the page stops reading.
+    """
+
+    def __init__(self, positions: List[Dict[str, Any]], symbols: List[str]):
+        self.key = feed_key(positions, symbols)
+        self._payload = {"positions": positions, "symbols": symbols}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.summary: Optional[Dict[str, Any]] = None
+        self.changed: set = set()
+        self.error: Optional[str] = None
+        self._last_read = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="live-quotes", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                service_url = get_service_url(SERVICE_NAME)
+                # Only opening the stream counts towards the instance's latency
+                with track_service_call(SERVICE_NAME, service_url):
+                    res = requests.post(f"{service_url}/portfolio/stream", json=self._payload,
+                                        stream=True, timeout=(5, 60))
+                with res:
+                    res.raise_for_status()
+                    self.error = None
+                    for event, data in iter_sse(self._lines(res)):
+                        with self._lock:
+                            if event == "quote":
+                                self.rows[data['symbol']] = data
+                                self.changed.add(data['symbol'])
+                            elif event == "summary":
+                                self.summary = data
+            except Exception as e:
+                self.error = str(e)
+                self._stop.wait(5)
+
+    def _lines(self, res) -> Iterator[str]:
+        """Stream lines until closed or idle; heartbeats make this check at least every few seconds."""
+        for line in res.iter_lines(decode_unicode=True):
+            if time.monotonic() - self._last_read > IDLE_TIMEOUT:
+                self._stop.set()
+            if self._stop.is_set():
+                return
+            yield line
+
+    def read(self) -> Tuple[Dict[str, Dict[str, Any]], Optional[Dict[str, Any]], set]:
+        """Latest rows, summary, and symbols changed since the previous read."""
+        self._last_read = time.monotonic()
+        with self._lock:
+            changed, self.changed = self.changed, set()
+            return dict(self.rows), self.summary, changed
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def close(self):
+        self._stop.set()
+
+
+def get_live_feed(positions: List[Dict[str, Any]], symbols: List[str]) -> LiveQuoteFeed:
+    """The session's feed, reopened when the positions or symbols change."""
+    feed = st.session_state.get('live_quote_feed')
+    if feed is None or feed.key != feed_key(positions, symbols) or not feed.alive:
+        if feed is not None:
+            feed.close()
+        feed = LiveQuoteFeed(positions, symbols)
+        st.session_state['live_quote_feed'] = feed
+    return feed
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def render_live_quotes(positions: List[Dict[str, Any]], symbols: List[str] = ()):
+    """Rerun just this table every few seconds with the latest streamed rows."""
+    feed = get_live_feed(positions, list(symbols))
+    rows, summary, changed = feed.read()
+
+    if feed.error and not rows:
+        st.caption(f"Live quotes unavailable: {feed.error}")
+        return
+    if not rows:
+        st.caption("Waiting for quotes...")
+        return
+
+    table = pd.DataFrame([
+        {
+            "": "●" if symbol in changed else "",
+            "Symbol": symbol,
+            "Price": format_currency(row['price']),
+            "Day %": f"{row['day_change_percent']:+.2f}%",
+            "Value": format_currency(row['market_value']) if 'market_value' in row else "—",
+            "Gain/Loss": format_currency(row['gain_loss']) if 'gain_loss' in row else "—",
+            "As Of": row['as_of'].replace('T', ' '),
+        }
+        for symbol, row in sorted(rows.items())
+    ])
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    if summary:
+        st.caption(
+            f"Live value {format_currency(summary['total_value'])} "
+            f"({format_currency(summary['total_gain_loss'])} gain/loss)"
+        )
@@ -7,7 +7,8 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from auth.authentication import logout
-from models.user import User
+from models.user import User, user_cache
+from models.portfolio import Portfolio
 from data.symbol_loader import get_stock_suggestions
 
 def render_sidebar(symbols_df: pd.DataFrame) -> str:
@@ -100,7 +101,6 @@ def render_account_info():
     username = st.session_state.get('username')
     if username:
         user = User(username)
-        user_data = user.get_data()
 
         created_date = user.get_created_at()
         if created_date != 'Unknown':
@@ -112,7 +112,7 @@ def render_account_info():
         else:
             created_str = 'Unknown'
 
-        portfolio_count = len(user_data.get('portfolio', []))
+        portfolio_count = Portfolio(username).get_total_positions()
 
         st.sidebar.info(f"""
         **Username:** {username}  
@@ -137,6 +137,12 @@ def render_database_stats(symbols_df: pd.DataFrame):
     else:
         st.sidebar.warning("⚠️ Symbol database not loaded")
 
+    cache_stats = user_cache.stats()
+    st.sidebar.caption(
+        f"User cache: {cache_stats['hit_ratio']:.0%} hit ratio, "
+        f"{cache_stats['reloads_avoided']} reloads avoided"
+    )
+
 def render_footer():
     """Render sidebar footer."""
     st.sidebar.markdown("---")
@@ -190,11 +196,12 @@ def render_account_settings():
                 if new_password and confirm_password:
                     if new_password == confirm_password:
                         if len(new_password) >= 6:
-                            from auth.authentication import hash_password, load_users, save_users
-                            users = load_users()
-                            users[st.session_state['username']]['password'] = hash_password(new_password)
-                            save_users(users)
-                            st.success("Password updated successfully!")
+                            from auth.authentication import hash_password
+                            user = User(st.session_state['username'])
+                            if user.change_password(hash_password(new_password)):
+                                st.success("Password updated successfully!")
+                            else:
+                                st.error("Failed to update password")
                         else:
                             st.error("Password must be at least 6 characters")
                     else:
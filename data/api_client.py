@@ -13,9 +13,11 @@ from pathlib import Path
 class APIClient:
     """Alpha Vantage API client."""
 
-    def __init__(self, config_file: str = "config.json"):
+    def __init__(self, config_file: str = "config.json", rate_limiter=None):
         self.base_url = "https://www.alphavantage.co/query"
         self.api_key = self._load_api_key(config_file)
+        # Optional data.rate_limiter.RateLimiter; every request waits for a token
+        self.rate_limiter = rate_limiter
 
     def _load_api_key(self, config_file: str) -> str:
         """Load API key from config file."""
@@ -35,6 +37,9 @@ class APIClient:
         """Make API request with error handling."""
         params['apikey'] = self.api_key
 
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
         try:
             response = requests.get(self.base_url, params=params, timeout=15)
             response.raise_for_status()
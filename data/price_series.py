@@ -0,0 +1,49 @@
+"""
+Price Series Parsing
+Converts Alpha Vantage daily time series into numeric arrays
+"""
+
+import numpy as np
+from typing import Optional, Dict, Any, Tuple
+
+DAILY_SERIES_KEY = "Time Series (Daily)"
+CLOSE_FIELD = "4. close"
+
+
+def parse_daily_closes(daily: Optional[Dict[str, Any]]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Parse a TIME_SERIES_DAILY payload into (dates, closes) arrays.
+
+    Dates are int64 epoch days sorted ascending, closes are float64.
+    Returns None when the payload holds no usable bars.
+    """
+    if not daily or DAILY_SERIES_KEY not in daily:
+        return None
+
+    series = daily[DAILY_SERIES_KEY]
+    if not series:
+        return None
+
+    dates = sorted(series.keys())
+    try:
+        closes = np.array([float(series[d][CLOSE_FIELD]) for d in dates], dtype=np.float64)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    epoch_days = np.array(dates, dtype="datetime64[D]").astype(np.int64)
+    return epoch_days, closes
+
+
+def compact_daily_closes(daily: Optional[Dict[str, Any]]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Parse a TIME_SERIES_DAILY payload into (dates, closes) arrays for holding in a session.
+
+    Same as parse_daily_closes but with float32 closes, enough for display
+    and half the memory.
+    """
+    parsed = parse_daily_closes(daily)
+    if parsed is None:
+        return None
+    epoch_days, closes = parsed
+    return epoch_days, closes.astype(np.float32)
+
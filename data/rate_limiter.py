@@ -0,0 +1,54 @@
+"""
+Rate Limiter
+Token bucket shared by everything that calls the Alpha Vantage API
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+# Alpha Vantage free tier. The limit is per process, so replicas sharing
+# one API key should each be given their share of it
+DEFAULT_REQUESTS_PER_MINUTE = float(os.environ.get("API_REQUESTS_PER_MINUTE", 5))
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Holds up to `burst` tokens and refills at `requests_per_minute`. Each
+    request takes one token, waiting for a refill when the bucket is empty.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 burst: Optional[int] = None):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1, int(requests_per_minute))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, blocking until one is available.
+        Returns False if that would take longer than `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
@@ -0,0 +1,156 @@
+"""
+Service Response Cache
+Process-wide cache of microservice responses shared by every session
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Seconds a successful response stays fresh, per endpoint
+ENDPOINT_TTLS = {
+    "analysis": 300,
+    "earnings": 3600,
+    "transcript": 86400,
+    "news": 120,
+    "watchlist": 15,
+}
+DEFAULT_TTL = 60
+
+# Total bytes held across all entries, and the most any single entry may take
+MAX_BYTES = int(os.environ.get("SERVICE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+MAX_ENTRY_BYTES = int(os.environ.get("SERVICE_CACHE_MAX_ENTRY_BYTES", 4 * 1024 * 1024))
+
+
+class CachedResponse:
+    """The parts of a `requests.Response` the pages read, replayed from the cache."""
+
+    def __init__(self, content: bytes):
+        self.status_code = 200
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        # Each hit parses its own copy, so no session can mutate another's data
+        return json.loads(self.content)
+
+
+class ServiceResponseCache:
+    """
+    LRU cache of successful service responses, bounded by total bytes.
+
+    Entries expire after their endpoint's TTL. A response larger than
+    `max_entry_bytes` is passed through uncached rather than evicting
+    everything else. Concurrent misses for the same key share one call.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES, max_entry_bytes: int = MAX_ENTRY_BYTES,
+                 ttls: Optional[Dict[str, float]] = None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttls = dict(ENDPOINT_TTLS if ttls is None else ttls)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, Hashable], threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, cache_key: Tuple[str, Hashable]) -> Optional[CachedResponse]:
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, content = entry
+        if time.monotonic() >= expires_at:
+            self._remove(cache_key)
+            return None
+        self._entries.move_to_end(cache_key)
+        return CachedResponse(content)
+
+    def _remove(self, cache_key: Tuple[str, Hashable]):
+        _, content = self._entries.pop(cache_key)
+        self._bytes -= len(content)
+
+    def _store(self, cache_key: Tuple[str, Hashable], content: bytes):
+        size = len(content)
+        if size > self.max_entry_bytes:
+            return
+        if cache_key in self._entries:
+            self._remove(cache_key)
+        while self._entries and self._bytes + size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        ttl = self.ttls.get(cache_key[0], DEFAULT_TTL)
+        self._entries[cache_key] = (time.monotonic() + ttl, content)
+        self._bytes += size
+
+    def fetch(self, endpoint: str, key: Hashable, call: Callable[[], Any]) -> Any:
+        """
+        Return the cached response for (endpoint, key), or make `call`.
+
+        `call` returns a `requests.Response`; only 200 responses are cached,
+        so errors are retried on the next request.
+        """
+        cache_key = (endpoint, key)
+        with self._lock:
+            cached = self._lookup(cache_key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            key_lock = self._inflight.setdefault(cache_key, threading.Lock())
+
+        with key_lock:
+            # Another session may have filled it while we waited
+            with self._lock:
+                cached = self._lookup(cache_key)
+                if cached is not None:
+                    self.hits += 1
+                    return cached
+                self.misses += 1
+
+            try:
+                res = call()
+                if res.status_code == 200:
+                    with self._lock:
+                        self._store(cache_key, res.content)
+                return res
+            finally:
+                with self._lock:
+                    self._inflight.pop(cache_key, None)
+
+    def invalidate(self, endpoint: Optional[str] = None, key: Optional[Hashable] = None):
+        """Drop one entry, every entry for an endpoint, or everything."""
+        with self._lock:
+            for cache_key in list(self._entries):
+                if endpoint is not None and cache_key[0] != endpoint:
+                    continue
+                if key is not None and cache_key[1] != key:
+                    continue
+                self._remove(cache_key)
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+
+# Shared by every session in this Streamlit process
+service_cache = ServiceResponseCache()
@@ -0,0 +1,130 @@
+"""
+Session Payloads
+Per-session storage for large service payloads under a byte budget
+"""
+
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, MutableMapping
+
+import numpy as np
+
+from data.price_series import compact_daily_closes
+
+# Approximate bytes one session may hold across its payloads
+PAYLOAD_BUDGET_BYTES = int(os.environ.get("SESSION_PAYLOAD_BUDGET", 8 * 1024 * 1024))
+
+# Session key holding payload sizes, least recently used first
+SIZES_KEY = "_payload_sizes"
+
+# Article fields the news page renders, and the ticker mentions it shows
+NEWS_FIELDS = ('title', 'url', 'time_published', 'summary', 'source',
+               'overall_sentiment_score', 'overall_sentiment_label')
+NEWS_TICKER_FIELDS = ('ticker', 'ticker_sentiment_label', 'relevance_score')
+NEWS_MAX_TICKERS = 5
+
+
+def compact_analysis(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace the raw daily series with int64 epoch-day and float32 close arrays.
+
+    The page charts nothing but closes, so the series is parsed once here
+    rather than on every rerun. Both are None when there are no usable bars.
+    """
+    compact = {key: value for key, value in data.items() if key != 'daily'}
+    parsed = compact_daily_closes(data.get('daily'))
+    compact['dates'], compact['closes'] = parsed if parsed is not None else (None, None)
+    return compact
+
+
+def compact_news(news: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the article fields the news feed renders."""
+    feed = []
+    for article in news.get('feed') or []:
+        compact = {field: article[field] for field in NEWS_FIELDS if field in article}
+        compact['ticker_sentiment'] = [
+            {field: ticker[field] for field in NEWS_TICKER_FIELDS if field in ticker}
+            for ticker in (article.get('ticker_sentiment') or [])[:NEWS_MAX_TICKERS]
+        ]
+        feed.append(compact)
+    return {**news, 'feed': feed}
+
+
+COMPACTORS: Dict[str, Callable[[Any], Any]] = {
+    'analysis_data': compact_analysis,
+    'news_data': compact_news,
+}
+
+
+def payload_size(value: Any) -> int:
+    """Approximate size of a payload: array buffers plus the encoded JSON length of everything else."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(len(str(key)) + payload_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    return len(json.dumps(value, default=str).encode('utf-8'))
+
+
+class SessionPayloads:
+    """
+    Large payloads in one session's state, held to a byte budget.
+
+    Payloads are stored in their compact form under their usual session key,
+    so pages read them as before. When the session goes over budget the
+    least recently used payloads are dropped; the page that needs one again
+    shows its empty state and the user reloads it.
+    """
+
+    def __init__(self, state: MutableMapping, budget: int = PAYLOAD_BUDGET_BYTES):
+        self.state = state
+        self.budget = budget
+
+    def _sizes(self) -> "OrderedDict[str, int]":
+        sizes = self.state.get(SIZES_KEY)
+        if sizes is None:
+            sizes = OrderedDict()
+            self.state[SIZES_KEY] = sizes
+        return sizes
+
+    def put(self, name: str, value: Any) -> Any:
+        """Store a payload in compact form, evicting older ones over budget; return what was stored."""
+        compactor = COMPACTORS.get(name)
+        if compactor is not None:
+            value = compactor(value)
+
+        sizes = self._sizes()
+        sizes[name] = payload_size(value)
+        sizes.move_to_end(name)
+        self.state[name] = value
+
+        # The payload just stored is always kept, even if it alone is over budget
+        while sum(sizes.values()) > self.budget and len(sizes) > 1:
+            evicted, _ = sizes.popitem(last=False)
+            self.state.pop(evicted, None)
+        return value
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return a payload and mark it recently used."""
+        value = self.state.get(name)
+        if value is None:
+            return default
+        sizes = self._sizes()
+        if name in sizes:
+            sizes.move_to_end(name)
+        return value
+
+    def discard(self, name: str):
+        self._sizes().pop(name, None)
+        self.state.pop(name, None)
+
+    def usage(self) -> Dict[str, Any]:
+        """Bytes held per payload and in total, against the budget."""
+        sizes = self._sizes()
+        return {
+            'payloads': dict(sizes),
+            'total': sum(sizes.values()),
+            'budget': self.budget,
+        }
@@ -0,0 +1,127 @@
+"""
+Symbol Aliases
+Maps every known spelling of a listed symbol to its canonical form
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+SYMBOLS_CSV = os.environ.get("SYMBOLS_CSV", "symbols_valid_meta.csv")
+
+# Columns holding other venues' spellings of the same listing
+ALIAS_COLUMNS = ('CQS Symbol', 'NASDAQ Symbol')
+
+# Share-class separators people and venues use interchangeably: BRK.B, BRK-B, BRK/B, BRK B, AGM$A
+SEPARATORS = re.compile(r"[.\-/ $]")
+SEPARATOR_FORMS = (".", "-", "/", " ", "")
+
+
+def separator_variants(symbol: str):
+    """The symbol written with each separator style, e.g. BRK.B -> BRK-B, BRK/B, BRKB."""
+    parts = [part for part in SEPARATORS.split(symbol) if part]
+    if len(parts) < 2:
+        return {symbol}
+    return {sep.join(parts) for sep in SEPARATOR_FORMS}
+
+
+class SymbolAliases:
+    """
+    Hash index from any known spelling to the canonical symbol.
+
+    Canonical symbols map to themselves and always win; then the CQS and
+    NASDAQ spellings; then separator variants of either. Test issues are
+    left out, so they resolve like junk. Lookups are a single dict probe.
+    """
+
+    def __init__(self, symbols_df: pd.DataFrame):
+        self.aliases: Dict[str, str] = {}
+        self._add(symbols_df)
+
+    def _add(self, symbols_df: pd.DataFrame):
+        if 'Symbol' not in symbols_df.columns:
+            return
+
+        listed = symbols_df
+        if 'Test Issue' in symbols_df.columns:
+            listed = symbols_df[symbols_df['Test Issue'].astype(str) != 'Y']
+
+        rows = []
+        for symbol, *alternates in zip(listed['Symbol'], *(
+                listed[column] for column in ALIAS_COLUMNS if column in listed.columns)):
+            if isinstance(symbol, str) and symbol.strip():
+                canonical = symbol.strip().upper()
+                spellings = [canonical] + [a.strip().upper() for a in alternates if isinstance(a, str) and a.strip()]
+                rows.append((canonical, spellings))
+
+        for canonical, _ in rows:
+            self.aliases[canonical] = canonical
+        for canonical, spellings in rows:
+            for spelling in spellings[1:]:
+                self.aliases.setdefault(spelling, canonical)
+        for canonical, spellings in rows:
+            for spelling in spellings:
+                for variant in separator_variants(spelling):
+                    self.aliases.setdefault(variant, canonical)
+
+    def apply(self, added_df: pd.DataFrame, removed: Iterable[str],
+              renamed: Optional[Dict[str, str]] = None) -> "SymbolAliases":
+        """
+        A copy without the removed symbols' spellings and with the added rows'
+        ones. A renamed symbol's old spellings resolve to its new symbol.
+        """
+        removed = set(removed)
+        updated = SymbolAliases.__new__(SymbolAliases)
+        updated.aliases = {alias: symbol for alias, symbol in self.aliases.items() if symbol not in removed}
+        updated._add(added_df)
+        for old, new in (renamed or {}).items():
+            if new in updated.aliases:
+                for variant in separator_variants(old):
+                    updated.aliases.setdefault(variant, updated.aliases[new])
+        return updated
+
+    def __len__(self) -> int:
+        return len(self.aliases)
+
+    def resolve(self, text: str) -> Optional[str]:
+        """Canonical symbol for any known spelling, or None."""
+        key = text.strip().upper()
+        canonical = self.aliases.get(key)
+        if canonical is None and SEPARATORS.search(key):
+            canonical = self.aliases.get(SEPARATORS.sub(".", key))
+        return canonical
+
+    def resolve_many(self, symbols: Iterable[str]) -> Dict[str, Optional[str]]:
+        return {symbol: self.resolve(symbol) for symbol in symbols}
+
+
+@lru_cache(maxsize=2)
+def _load_aliases(csv_path: str, modified: float) -> Optional[SymbolAliases]:
+    wanted = {'Symbol', 'Test Issue', *ALIAS_COLUMNS}
+    try:
+        return SymbolAliases(pd.read_csv(csv_path, usecols=lambda column: column in wanted))
+    except (OSError, ValueError) as e:
+        print(f"Symbol aliases unavailable: {e}")
+        return None
+
+
+def get_symbol_aliases(csv_path: str = SYMBOLS_CSV) -> Optional[SymbolAliases]:
+    """
+    Process-wide aliases for services, read from the symbols CSV and read
+    again when the file changes. None without a readable CSV, in which case
+    callers should not reject symbols.
+    """
+    try:
+        modified = os.stat(csv_path).st_mtime
+    except OSError:
+        return None
+    return _load_aliases(csv_path, modified)
+
+
+def is_unknown_symbol(symbol: str) -> bool:
+    """True only when a symbol table is loaded and the symbol isn't in it."""
+    aliases = get_symbol_aliases()
+    return aliases is not None and aliases.resolve(symbol) is None
@@ -0,0 +1,114 @@
+"""
+Symbol Database Artifact
+Compiles the symbols CSV into a memory-mapped Arrow file
+
+Build:  python -m data.symbol_artifact [--csv symbols_valid_meta.csv]
+"""
+
+import argparse
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+
+ARTIFACT_SUFFIX = ".arrow"
+
+# Low-cardinality columns stored once per distinct value (dictionary encoded)
+CATEGORICAL_COLUMNS = (
+    'Nasdaq Traded', 'Listing Exchange', 'Market Category', 'ETF',
+    'Test Issue', 'Financial Status', 'NextShares',
+)
+
+
+def artifact_path_for(csv_path) -> Path:
+    """The artifact that belongs next to a symbols CSV."""
+    return Path(csv_path).with_suffix(ARTIFACT_SUFFIX)
+
+
+def is_current(artifact: Path, csv_file: Path) -> bool:
+    """True when the artifact exists and is no older than its CSV."""
+    if not artifact.exists():
+        return False
+    return not csv_file.exists() or artifact.stat().st_mtime >= csv_file.stat().st_mtime
+
+
+def frame_from_csv(csv_path) -> pd.DataFrame:
+    """Parse a symbols CSV with its SearchText column and categorical flag columns."""
+    df = pd.read_csv(csv_path)
+    if 'Symbol' not in df.columns:
+        raise ValueError(f"{csv_path} must contain a 'Symbol' column")
+
+    if 'Security Name' in df.columns:
+        df['SearchText'] = df['Symbol'] + ' - ' + df['Security Name']
+    else:
+        df['SearchText'] = df['Symbol']
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def build_artifact(csv_path, artifact_path: Optional[Path] = None) -> Path:
+    """
+    Compile a symbols CSV into an uncompressed Arrow IPC file.
+
+    SearchText is computed here rather than on every load, and the flag and
+    exchange columns are dictionary encoded. The file is written beside its
+    final path and moved into place, so readers never see a partial file.
+    """
+    artifact = Path(artifact_path) if artifact_path else artifact_path_for(csv_path)
+    df = frame_from_csv(csv_path)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = artifact.with_name(artifact.name + ".tmp")
+    with pa.OSFile(str(tmp), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, artifact)
+    return artifact
+
+
+def _arrow_strings(arrow_type: pa.DataType):
+    # Keep strings in the mapped Arrow buffers instead of building Python objects
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def load_artifact(artifact_path) -> pd.DataFrame:
+    """
+    Memory-map an artifact as a DataFrame.
+
+    String columns stay backed by the read-only mapping, so loading copies
+    no string data and pages of the file are shared between processes.
+    Dictionary columns come back as pandas categoricals.
+    """
+    source = pa.memory_map(str(artifact_path), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(types_mapper=_arrow_strings)
+
+
+def read_symbols(csv_path) -> pd.DataFrame:
+    """The symbols table from its current artifact, else parsed from the CSV."""
+    csv_file = Path(csv_path)
+    artifact = artifact_path_for(csv_file)
+    if is_current(artifact, csv_file):
+        return load_artifact(artifact)
+    return frame_from_csv(csv_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the symbols CSV into a binary artifact")
+    parser.add_argument("--csv", default="symbols_valid_meta.csv", help="Path to the symbols CSV")
+    parser.add_argument("--output", default=None, help="Artifact path; defaults to the CSV path with .arrow")
+    args = parser.parse_args(argv)
+
+    artifact = build_artifact(args.csv, args.output)
+    print(f"Wrote {artifact} ({artifact.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
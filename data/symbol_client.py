@@ -0,0 +1,69 @@
+"""
+Symbol Service Client
+Suggestions and symbol validation from the symbol microservice
+"""
+
+import os
+from typing import Any, Dict, Iterable, List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.service_discovery import get_service_url, track_service_call
+
+SERVICE_NAME = "Symbol_Service"
+
+# "service" sends suggestions to the symbol service instead of a local symbol table
+SYMBOL_SEARCH = os.environ.get("SYMBOL_SEARCH", "local")
+
+# Keep-alive connections shared by every session in the process
+POOL_SIZE = 32
+TIMEOUT = (1.0, 2.0)
+
+
+def remote_symbol_search() -> bool:
+    """True when this frontend gets suggestions from the symbol service."""
+    return SYMBOL_SEARCH == "service"
+
+
+class SymbolServiceClient:
+    """
+    Pooled HTTP client for the symbol service.
+
+    One `requests.Session` keeps connections open across keystrokes and
+    sessions, so a suggestion costs one request on a warm connection. The
+    service URL comes from the shared service URL cache.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        service_url = get_service_url(SERVICE_NAME)
+        with track_service_call(SERVICE_NAME, service_url):
+            res = self.session.request(method, f"{service_url}{path}", timeout=TIMEOUT, **kwargs)
+        res.raise_for_status()
+        return res.json()
+
+    def suggest(self, q: str, limit: int = 10, filters: str = "") -> List[str]:
+        params = {"q": q, "limit": limit}
+        if filters:
+            params["filters"] = filters
+        return self._request("GET", "/suggest", params=params)["suggestions"]
+
+    def browse(self, filters: str = "", q: str = "", limit: int = 100) -> Dict[str, Any]:
+        """{'total': matching symbols, 'symbols': [search texts]} for a screen."""
+        return self._request("GET", "/browse", params={"filters": filters, "q": q, "limit": limit})
+
+    def filter_options(self) -> Dict[str, List[str]]:
+        return self._request("GET", "/filters")
+
+    def resolve(self, symbols: Iterable[str]) -> Dict[str, Any]:
+        """{'resolved': {symbol: search text}, 'unknown': [symbols]} for a batch."""
+        return self._request("POST", "/resolve", json={"symbols": list(symbols)})
+
+
+symbol_client = SymbolServiceClient()
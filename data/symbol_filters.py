@@ -0,0 +1,187 @@
+"""
+Symbol Filters
+Precomputed row masks for screening the symbols table
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Filter names, and the columns they match
+FILTER_COLUMNS = {
+    "exchange": "Listing Exchange",
+    "etf": "ETF",
+    "category": "Market Category",
+    "round_lot": "Round Lot Size",
+    "financial_status": "Financial Status",
+}
+
+FILTER_LABELS = {
+    "exchange": "Exchange",
+    "etf": "ETF",
+    "category": "Market Category",
+    "round_lot": "Round Lot",
+    "financial_status": "Financial Status",
+}
+
+# Readable names for the one-letter codes in the listing file
+VALUE_LABELS = {
+    "exchange": {"A": "NYSE American", "N": "NYSE", "P": "NYSE Arca", "Q": "NASDAQ",
+                 "V": "IEX", "Z": "Cboe BZX"},
+    "etf": {"Y": "ETF", "N": "Not an ETF"},
+    "category": {"Q": "Global Select", "G": "Global Market", "S": "Capital Market"},
+    "financial_status": {"N": "Normal", "D": "Deficient", "E": "Delinquent", "Q": "Bankrupt",
+                         "G": "Deficient and Bankrupt", "H": "Deficient and Delinquent",
+                         "J": "Delinquent and Bankrupt", "K": "Deficient, Delinquent and Bankrupt"},
+}
+
+# Distinct filter combinations whose masks are kept
+MASK_CACHE_SIZE = 256
+
+Selection = Dict[str, Iterable[str]]
+
+
+def value_label(name: str, value: str) -> str:
+    """Display text for a filter value, e.g. ("exchange", "Q") -> "NASDAQ (Q)"."""
+    if not value:
+        return "(none)"
+    label = VALUE_LABELS.get(name, {}).get(value)
+    return f"{label} ({value})" if label else value
+
+
+def _label(value) -> str:
+    if pd.isna(value):
+        return ""
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value).strip().upper()
+
+
+def parse_filters(text: str) -> Dict[str, List[str]]:
+    """
+    Parse "etf:N,exchange:Q|P" into {"etf": ["N"], "exchange": ["Q", "P"]}.
+    Values of one filter are alternatives; different filters must all match.
+    """
+    selection: Dict[str, List[str]] = {}
+    for clause in filter(None, (part.strip() for part in text.split(","))):
+        name, _, values = clause.partition(":")
+        name = name.strip().lower()
+        if name not in FILTER_COLUMNS or not values:
+            raise ValueError(f"Unknown filter '{clause}'; use {', '.join(FILTER_COLUMNS)} as name:value")
+        selection.setdefault(name, []).extend(value.strip().upper() for value in values.split("|"))
+    return selection
+
+
+def format_filters(selection: Selection) -> str:
+    """The inverse of parse_filters, for sending a selection to the symbol service."""
+    return ",".join(f"{name}:{'|'.join(values)}" for name, values in selection.items() if values)
+
+
+class SymbolFilters:
+    """
+    Filter columns of a symbols table as categorical codes and bitmaps.
+
+    Every distinct value of each filter column gets a boolean bitmap over
+    the table's rows when the table loads. A selection is then a handful of
+    in-place ANDs and ORs over those bitmaps, never a string comparison,
+    and the result is kept per distinct selection so repeating one
+    allocates nothing. Masks are read-only because they are shared.
+    """
+
+    def __init__(self, symbols_df: pd.DataFrame):
+        self.rows = len(symbols_df)
+        self.values: Dict[str, List[str]] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+
+        for name, column in FILTER_COLUMNS.items():
+            if column not in symbols_df.columns:
+                continue
+            labels = np.array([_label(value) for value in symbols_df[column].to_numpy(dtype=object)])
+            values, codes = np.unique(labels, return_inverse=True)
+            self.values[name] = values.tolist()
+            self.codes[name] = codes.astype(np.int16)
+        self._build()
+
+    def _build(self):
+        self.bitmaps: Dict[str, Dict[str, np.ndarray]] = {
+            name: {value: self.codes[name] == code for code, value in enumerate(values)}
+            for name, values in self.values.items()
+        }
+        self._empty = np.zeros(self.rows, dtype=bool)
+        self._empty.flags.writeable = False
+        self._scratch = np.empty(self.rows, dtype=bool)
+        self._masks: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def apply(self, symbols_df: pd.DataFrame, keep: np.ndarray, start: int) -> "SymbolFilters":
+        """
+        Filters for the next table: this table's rows where `keep` is set,
+        followed by the new rows of `symbols_df` from `start`. Only the new
+        rows are labelled; surviving rows keep their codes.
+        """
+        updated = SymbolFilters.__new__(SymbolFilters)
+        updated.rows = len(symbols_df)
+        updated.values, updated.codes = {}, {}
+        for name, old_values in self.values.items():
+            added = [_label(value) for value in symbols_df[FILTER_COLUMNS[name]].iloc[start:].to_numpy(dtype=object)]
+            values = sorted(set(old_values).union(added))
+            code_of = {value: code for code, value in enumerate(values)}
+            codes = np.concatenate([
+                np.array([code_of[value] for value in old_values], dtype=np.int16)[self.codes[name][keep]],
+                np.array([code_of[value] for value in added], dtype=np.int16),
+            ])
+            # Drop values no row has any more
+            used = np.bincount(codes, minlength=len(values)) > 0
+            updated.values[name] = [value for value, present in zip(values, used) if present]
+            updated.codes[name] = (np.cumsum(used) - 1).astype(np.int16)[codes]
+        updated._build()
+        return updated
+
+    def options(self) -> Dict[str, List[str]]:
+        """Values of every available filter."""
+        return dict(self.values)
+
+    def _key(self, selection: Selection) -> Tuple:
+        key = []
+        for name, values in selection.items():
+            values = tuple(sorted({_label(value) for value in values}))
+            if not values:
+                continue
+            if name not in FILTER_COLUMNS:
+                raise ValueError(f"Unknown filter '{name}'; use {', '.join(FILTER_COLUMNS)}")
+            if name not in self.bitmaps:
+                raise ValueError(f"Filter '{name}' is not available for this symbols table")
+            key.append((name, values))
+        return tuple(sorted(key))
+
+    def mask(self, selection: Selection) -> Optional[np.ndarray]:
+        """Boolean mask over the table's rows for a selection; None when nothing is selected."""
+        key = self._key(selection)
+        if not key:
+            return None
+
+        with self._lock:
+            cached = self._masks.get(key)
+            if cached is not None:
+                self._masks.move_to_end(key)
+                return cached
+
+            mask = np.ones(self.rows, dtype=bool)
+            for name, values in key:
+                bitmaps = self.bitmaps[name]
+                if len(values) == 1:
+                    np.logical_and(mask, bitmaps.get(values[0], self._empty), out=mask)
+                    continue
+                self._scratch.fill(False)
+                for value in values:
+                    np.logical_or(self._scratch, bitmaps.get(value, self._empty), out=self._scratch)
+                np.logical_and(mask, self._scratch, out=mask)
+
+            mask.flags.writeable = False
+            self._masks[key] = mask
+            if len(self._masks) > MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+        return mask
@@ -0,0 +1,335 @@
+"""
+Symbol Search Index
+Prefix lookups over symbols and security name words
+"""
+
+import copy
+import re
+import threading
+import weakref
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.symbol_aliases import SymbolAliases
+from data.symbol_filters import SymbolFilters
+
+# Sorts after any character a query can contain, closing a prefix range
+PREFIX_END = "￿"
+
+# Prefix ranges remembered so a longer query can narrow its parent's range
+RANGE_CACHE_SIZE = 2048
+
+TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+
+# Words so common in security names that they only dilute name similarity
+NAME_STOPWORDS = frozenset({
+    "THE", "AND", "OF", "INC", "CORP", "CORPORATION", "CO", "COMPANY", "LTD", "PLC",
+    "LLC", "LP", "COMMON", "STOCK", "SHARES", "SHARE", "ORDINARY", "CLASS", "EACH",
+    "REPRESENTING", "DEPOSITARY", "AMERICAN", "ADS", "ADR", "NEW", "W", "I",
+})
+
+# Ranking weights; a row needs MIN_SCORE to be returned
+EXACT_WEIGHT = 4.0
+SYMBOL_PREFIX_WEIGHT = 2.0
+TOKEN_WEIGHT = 1.5
+TRIGRAM_WEIGHT = 1.0
+MIN_SCORE = 0.3
+
+
+def name_words(name: str) -> List[str]:
+    """Upper-cased words of a security name, without filler words."""
+    return [word for word in TOKEN_PATTERN.findall(name.upper()) if word not in NAME_STOPWORDS]
+
+
+def trigrams(words: List[str]) -> Set[str]:
+    """Character trigrams of each word, padded so word starts and ends count."""
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def index_rows(symbols_df: pd.DataFrame, start: int = 0) -> List[Tuple[str, str, str, int]]:
+    """(symbol, search text, security name, frame row) for the table's rows from `start`."""
+    rows = []
+    if 'Symbol' not in symbols_df.columns:
+        return rows
+    table = symbols_df.iloc[start:]
+    search_text = table['SearchText'] if 'SearchText' in table.columns else table['Symbol']
+    names = table['Security Name'] if 'Security Name' in table.columns else [None] * len(table)
+    for i, symbol, text, name in zip(range(start, len(symbols_df)), table['Symbol'], search_text, names):
+        if isinstance(symbol, str):
+            rows.append((symbol.upper(), text, name if isinstance(name, str) else "", i))
+    return rows
+
+
+class SymbolIndex:
+    """
+    Sorted arrays for symbol suggestions, built once per symbols table.
+
+    Symbols are kept sorted so every symbol starting with a prefix lies in
+    one contiguous range found by bisection. Each word of the security name
+    is kept the same way, paired with its row, so name prefixes are found
+    the same way. A lookup costs O(log n + k) and copies no strings.
+
+    For typo-tolerant search, a trigram inverted index maps each three-letter
+    fragment of the security names to the rows containing it, so rows that
+    resemble a misspelled query are scored without scanning every name.
+    """
+
+    def __init__(self, symbols_df: pd.DataFrame):
+        rows = index_rows(symbols_df)
+        rows.sort(key=lambda row: row[0])
+
+        self.symbols: List[str] = [row[0] for row in rows]
+        self.texts: List[str] = [row[1] for row in rows]
+        # Position in the source frame of each sorted row, for row masks
+        self.frame_rows = np.array([row[3] for row in rows], dtype=np.int64)
+
+        tokens = sorted(
+            (token, position)
+            for position, (_, _, name, _) in enumerate(rows)
+            for token in set(TOKEN_PATTERN.findall(name.upper()))
+        )
+        self.tokens: List[str] = [token for token, _ in tokens]
+        self.token_rows = np.array([position for _, position in tokens], dtype=np.int32)
+
+        postings: Dict[str, List[int]] = {}
+        gram_counts = []
+        for position, (_, _, name, _) in enumerate(rows):
+            grams = trigrams(name_words(name))
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self.postings: Dict[str, np.ndarray] = {
+            gram: np.array(positions, dtype=np.int32) for gram, positions in postings.items()
+        }
+        self.gram_counts = np.array(gram_counts, dtype=np.float32)
+
+        # Every known spelling of a listed symbol, for validation before API calls
+        self.aliases = SymbolAliases(symbols_df)
+        # Bitmaps over the source frame's rows, for screening by listing details
+        self.filters = SymbolFilters(symbols_df)
+
+        self._ranges: "OrderedDict[str, Tuple[int, int, int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def apply(self, symbols_df: pd.DataFrame, keep: np.ndarray, start: int,
+              renamed: Optional[Dict[str, str]] = None) -> "SymbolIndex":
+        """
+        The index for the next version of the table, without rebuilding it.
+
+        `symbols_df` is this table's rows where `keep` is set, followed by
+        new rows from `start`. Only the new rows are tokenized and split into
+        trigrams; surviving rows keep theirs, moved to their new sorted
+        positions by vectorized remaps. This index is left untouched, so
+        readers still holding it are unaffected.
+        """
+        added = index_rows(symbols_df, start)
+        added.sort(key=lambda row: row[0])
+        alive = keep[self.frame_rows]
+        survivors = np.flatnonzero(alive)
+        # Old frame row -> row in the new frame
+        moved_rows = np.cumsum(keep) - 1
+
+        # Merge the survivors and the added rows, each already in symbol order
+        order = sorted(
+            [(self.symbols[position], 0, position) for position in survivors.tolist()]
+            + [(row[0], 1, i) for i, row in enumerate(added)]
+        )
+        old_to_new = np.full(len(self.symbols), -1, dtype=np.int64)
+        added_to_new = np.empty(len(added), dtype=np.int64)
+        frame_rows = np.empty(len(order), dtype=np.int64)
+        texts = []
+        for position, (_, source, i) in enumerate(order):
+            if source:
+                added_to_new[i] = position
+                frame_rows[position] = added[i][3]
+                texts.append(added[i][1])
+            else:
+                old_to_new[i] = position
+                frame_rows[position] = moved_rows[self.frame_rows[i]]
+                texts.append(self.texts[i])
+
+        index = copy.copy(self)
+        index.symbols = [symbol for symbol, _, _ in order]
+        index.texts = texts
+        index.frame_rows = frame_rows
+
+        token_rows = old_to_new[self.token_rows]
+        tokens = [(token, row) for token, row in zip(self.tokens, token_rows.tolist()) if row >= 0]
+        tokens.extend(
+            (token, int(added_to_new[i]))
+            for i, (_, _, name, _) in enumerate(added)
+            for token in set(TOKEN_PATTERN.findall(name.upper()))
+        )
+        tokens.sort()
+        index.tokens = [token for token, _ in tokens]
+        index.token_rows = np.array([row for _, row in tokens], dtype=np.int32)
+
+        # Survivors keep their relative order, so remapped postings stay sorted
+        postings: Dict[str, np.ndarray] = {}
+        for gram, positions in self.postings.items():
+            positions = old_to_new[positions]
+            positions = positions[positions >= 0]
+            if len(positions):
+                postings[gram] = positions.astype(np.int32)
+        gram_counts = np.zeros(len(order), dtype=np.float32)
+        gram_counts[old_to_new[survivors]] = self.gram_counts[survivors]
+        added_postings: Dict[str, List[int]] = {}
+        for i, (_, _, name, _) in enumerate(added):
+            grams = trigrams(name_words(name))
+            gram_counts[added_to_new[i]] = len(grams)
+            for gram in grams:
+                added_postings.setdefault(gram, []).append(int(added_to_new[i]))
+        for gram, positions in added_postings.items():
+            merged = np.concatenate([postings.get(gram, np.empty(0, dtype=np.int32)),
+                                     np.array(positions, dtype=np.int32)])
+            merged.sort()
+            postings[gram] = merged
+        index.postings = postings
+        index.gram_counts = gram_counts
+
+        removed = [self.symbols[position] for position in np.flatnonzero(~alive).tolist()]
+        index.aliases = self.aliases.apply(symbols_df.iloc[start:], removed, renamed)
+        index.filters = self.filters.apply(symbols_df, keep, start)
+
+        index._ranges = OrderedDict()
+        index._lock = threading.Lock()
+        return index
+
+    def _prefix_ranges(self, prefix: str) -> Tuple[int, int, int, int]:
+        """Index ranges of symbols and name tokens starting with `prefix`."""
+        with self._lock:
+            cached = self._ranges.get(prefix)
+            if cached is not None:
+                self._ranges.move_to_end(prefix)
+                return cached
+            # Every match for "AAP" is also a match for "AA", so search inside its range
+            parent = self._ranges.get(prefix[:-1]) if len(prefix) > 1 else None
+
+        sym_lo, sym_hi, tok_lo, tok_hi = parent or (0, len(self.symbols), 0, len(self.tokens))
+        end = prefix + PREFIX_END
+        ranges = (
+            bisect_left(self.symbols, prefix, sym_lo, sym_hi),
+            bisect_left(self.symbols, end, sym_lo, sym_hi),
+            bisect_left(self.tokens, prefix, tok_lo, tok_hi),
+            bisect_left(self.tokens, end, tok_lo, tok_hi),
+        )
+
+        with self._lock:
+            self._ranges[prefix] = ranges
+            if len(self._ranges) > RANGE_CACHE_SIZE:
+                self._ranges.popitem(last=False)
+        return ranges
+
+    def lookup(self, symbol: str) -> Optional[int]:
+        """Sorted position of an exact symbol, or None."""
+        symbol = symbol.strip().upper()
+        position = bisect_left(self.symbols, symbol)
+        if position < len(self.symbols) and self.symbols[position] == symbol:
+            return position
+        return None
+
+    def search(self, text: str, limit: int = 10, mask: Optional[np.ndarray] = None) -> List[str]:
+        """
+        Ranked, typo-tolerant search over symbols and security names.
+
+        Each row scores for an exact symbol match, a symbol starting with the
+        query, query words starting a word of its name, and trigram (Jaccard)
+        similarity between the query and its name. Ties keep symbol order.
+        `mask`, a boolean array over the source frame's rows, limits which
+        rows can be returned.
+
+        Scores are kept for every row rather than only for rows in a prefix
+        range or trigram posting: at listing-file sizes one dense pass costs
+        less than sorting the gathered postings to merge them.
+        """
+        query = text.strip().upper()
+        if not query or limit <= 0 or not self.symbols:
+            return []
+
+        scores = np.zeros(len(self.symbols), dtype=np.float32)
+
+        sym_lo, sym_hi, _, _ = self._prefix_ranges(query)
+        scores[sym_lo:sym_hi] += SYMBOL_PREFIX_WEIGHT
+        if sym_lo < sym_hi and self.symbols[sym_lo] == query:
+            scores[sym_lo] += EXACT_WEIGHT
+
+        words = name_words(query) or TOKEN_PATTERN.findall(query)
+        for word in words:
+            _, _, tok_lo, tok_hi = self._prefix_ranges(word)
+            # A row counts once per query word, however many name words match
+            rows = np.unique(self.token_rows[tok_lo:tok_hi])
+            scores[rows] += TOKEN_WEIGHT / len(words)
+
+        grams = trigrams(words)
+        matched = [self.postings[gram] for gram in grams if gram in self.postings]
+        if matched:
+            shared = np.bincount(np.concatenate(matched), minlength=len(self.symbols)).astype(np.float32)
+            union = self.gram_counts + len(grams) - shared
+            scores += TRIGRAM_WEIGHT * np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+
+        if mask is not None:
+            scores[~mask[self.frame_rows]] = 0
+
+        candidates = np.flatnonzero(scores >= MIN_SCORE)
+        if len(candidates) > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [self.texts[position] for position in ranked]
+
+    def browse(self, mask: Optional[np.ndarray] = None, limit: int = 100, offset: int = 0) -> Tuple[int, List[str]]:
+        """
+        Search texts in symbol order, limited to rows in `mask`, a boolean
+        array over the source frame's rows. Returns the number of matching
+        rows and the `limit` texts after `offset`.
+        """
+        if mask is None:
+            total = len(self.symbols)
+            positions = range(min(offset, total), min(offset + limit, total))
+        else:
+            matching = np.flatnonzero(mask[self.frame_rows])
+            total = len(matching)
+            positions = matching[offset:offset + limit]
+        return total, [self.texts[position] for position in positions]
+
+
+_indexes: Dict[int, Tuple["weakref.ref", SymbolIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def register_symbol_index(symbols_df: pd.DataFrame, index: SymbolIndex):
+    """Make `index` the one get_symbol_index returns for `symbols_df`."""
+    key = id(symbols_df)
+    ref = weakref.ref(symbols_df, lambda _, key=key: _indexes.pop(key, None))
+    with _indexes_lock:
+        _indexes[key] = (ref, index)
+
+
+def get_symbol_index(symbols_df: pd.DataFrame) -> Optional[SymbolIndex]:
+    """
+    The index for a symbols table, built on first use and kept for as long
+    as the table itself. None for an empty table.
+    """
+    if symbols_df.empty:
+        return None
+
+    key = id(symbols_df)
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0]() is symbols_df:
+            return entry[1]
+
+    index = SymbolIndex(symbols_df)
+    register_symbol_index(symbols_df, index)
+    return index
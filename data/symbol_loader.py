@@ -6,17 +6,28 @@ Loads and manages stock symbols from CSV
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
+from data.symbol_artifact import artifact_path_for, is_current, load_artifact
+from data.symbol_client import remote_symbol_search, symbol_client
+from data.symbol_filters import format_filters
+from data.symbol_index import get_symbol_index
+from data.symbol_refresh import SymbolStore
 
 
-@st.cache_data
+@st.cache_resource
 def load_symbols_database(csv_path: str = "symbols_valid_meta.csv") -> pd.DataFrame:
     """
-    Load symbols from CSV file.
-    Cached to improve performance.
+    Load symbols from the compiled artifact, or the CSV file without one.
+    Cached as one shared, read-only frame so its search index is built once.
     """
     try:
         csv_file = Path(csv_path)
+
+        # Prefer the compiled artifact (python -m data.symbol_artifact) when it is up to date
+        artifact = artifact_path_for(csv_file)
+        if is_current(artifact, csv_file):
+            return load_artifact(artifact)
+
         if not csv_file.exists():
             st.warning(f"⚠️ {csv_path} not found. Using limited symbol suggestions.")
             return pd.DataFrame()
@@ -41,33 +52,103 @@ def load_symbols_database(csv_path: str = "symbols_valid_meta.csv") -> pd.DataFr
         return pd.DataFrame()
 
 
+@st.cache_resource
+def get_symbol_store(csv_path: str = "symbols_valid_meta.csv") -> SymbolStore:
+    """
+    The process's symbols generations, starting from load_symbols_database.
+    A background watcher applies newer listing files without a restart.
+    """
+    store = SymbolStore(csv_path, load_symbols_database(csv_path))
+    store.start_watcher()
+    return store
+
+
+def current_symbols(csv_path: str = "symbols_valid_meta.csv") -> pd.DataFrame:
+    """The symbols table of the latest generation; each rerun picks up a refresh."""
+    return get_symbol_store(csv_path).frame
+
+
 def get_stock_suggestions(symbols_df: pd.DataFrame,
                           input_text: str,
-                          limit: int = 10) -> List[str]:
-    """Get stock symbol suggestions based on user input."""
-    if not input_text or symbols_df.empty:
+                          limit: int = 10,
+                          filters: Optional[Dict[str, List[str]]] = None) -> List[str]:
+    """
+    Get stock symbol suggestions based on user input, optionally limited
+    to symbols matching filters such as {"exchange": ["Q"], "etf": ["N"]}.
+    """
+    if not input_text:
+        return []
+
+    if remote_symbol_search():
+        try:
+            if filters:
+                return symbol_client.suggest(input_text, limit, format_filters(filters))
+            return symbol_client.suggest(input_text, limit)
+        except Exception as e:
+            # Fall back to the local table, if this process has one
+            print(f"Symbol service unavailable: {e}")
+
+    if symbols_df.empty:
+        return []
+
+    index = get_symbol_index(symbols_df)
+    if index is None:
         return []
+    return index.search(input_text, limit, mask=index.filters.mask(filters or {}))
+
+
+def get_filter_options(symbols_df: pd.DataFrame) -> Dict[str, List[str]]:
+    """Values of every symbol filter, e.g. {"etf": ["N", "Y"], ...}."""
+    if remote_symbol_search():
+        return symbol_client.filter_options()
+    index = get_symbol_index(symbols_df)
+    return index.filters.options() if index is not None else {}
+
+
+def browse_symbols(symbols_df: pd.DataFrame,
+                   filters: Dict[str, List[str]],
+                   input_text: str = "",
+                   limit: int = 100) -> Tuple[int, List[str]]:
+    """
+    Screen the symbol universe: the number of symbols matching `filters`
+    and up to `limit` of them, in symbol order or ranked by `input_text`.
+    """
+    if remote_symbol_search():
+        page = symbol_client.browse(format_filters(filters), input_text, limit)
+        return page["total"], page["symbols"]
+
+    index = get_symbol_index(symbols_df)
+    if index is None:
+        return 0, []
+    mask = index.filters.mask(filters)
+    if input_text.strip():
+        symbols = index.search(input_text, limit, mask=mask)
+        return len(symbols), symbols
+    return index.browse(mask, limit)
+
+
+def resolve_symbols(symbols_df: pd.DataFrame, symbols: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Canonical symbol for each input spelling (BRK.B, brk-b, BRK/B -> BRK.B), or None
+    when it isn't listed. Without a symbol table, symbols pass through uppercased.
+    """
+    symbols = [symbol for symbol in symbols if symbol and symbol.strip()]
+    if not symbols:
+        return {}
+
+    if remote_symbol_search():
+        try:
+            canonical = symbol_client.resolve(symbols)["canonical"]
+            return {symbol: canonical.get(symbol) for symbol in symbols}
+        except Exception as e:
+            print(f"Symbol service unavailable: {e}")
+
+    index = get_symbol_index(symbols_df) if not symbols_df.empty else None
+    if index is None:
+        return {symbol: symbol.strip().upper() for symbol in symbols}
+    return index.aliases.resolve_many(symbols)
+
 
-    input_text = input_text.upper()
-    suggestions = []
-
-    if 'Symbol' in symbols_df.columns:
-        # Exact match first
-        exact_match = symbols_df[symbols_df['Symbol'] == input_text]
-        if not exact_match.empty:
-            for _, row in exact_match.iterrows():
-                suggestions.append(row['SearchText'])
-
-        # Partial matches
-        if len(suggestions) < limit:
-            partial_match = symbols_df[
-                (symbols_df['Symbol'].str.contains(input_text, na=False, case=False)) |
-                (symbols_df['SearchText'].str.upper().str.contains(input_text, na=False))
-                ]
-
-            for _, row in partial_match.head(limit - len(suggestions)).iterrows():
-                search_text = row['SearchText']
-                if search_text not in suggestions:
-                    suggestions.append(search_text)
-
-    return suggestions[:limit]
\ No newline at end of file
+def resolve_symbol(symbols_df: pd.DataFrame, symbol: str) -> Optional[str]:
+    """Canonical form of one symbol, or None if it is unknown."""
+    return resolve_symbols(symbols_df, [symbol]).get(symbol)
@@ -0,0 +1,200 @@
+"""
+Symbol Database Refresh
+Applies a newer listing file to the loaded symbols table and index
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from data.symbol_artifact import CATEGORICAL_COLUMNS, artifact_path_for, read_symbols
+from data.symbol_index import SymbolIndex, register_symbol_index
+
+# Seconds between checks of the listing file for changes; 0 turns the watcher off
+REFRESH_INTERVAL = float(os.environ.get("SYMBOLS_REFRESH_INTERVAL", "300"))
+
+
+class SymbolDiff:
+    """Listing changes between two symbols tables, by upper-cased symbol."""
+
+    def __init__(self, added: List[str], removed: List[str], changed: List[str], renamed: Dict[str, str]):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.renamed = renamed  # old symbol -> new symbol, also counted in removed and added
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+            "renamed": self.renamed,
+        }
+
+
+def _row_hashes(symbols_df: pd.DataFrame, columns: List[str]) -> Dict[str, int]:
+    # Compare values, not dtypes: an artifact's categoricals equal the CSV's strings
+    values = symbols_df[columns].astype(object)
+    values = values.where(values.notna(), None)
+    hashes = pd.util.hash_pandas_object(values, index=False)
+    return dict(zip(symbols_df['Symbol'].str.upper(), hashes.tolist()))
+
+
+def diff_symbols(current: pd.DataFrame, listing: pd.DataFrame) -> SymbolDiff:
+    """
+    What changed from `current` to `listing`: new and delisted symbols,
+    rows whose details changed, and renames, i.e. a delisted and a new
+    symbol with the same security name.
+    """
+    if 'Symbol' not in current.columns:
+        return SymbolDiff(sorted(listing['Symbol'].dropna().str.upper()), [], [], {})
+
+    columns = [column for column in listing.columns if column in current.columns]
+    before = _row_hashes(current.dropna(subset=['Symbol']), columns)
+    after = _row_hashes(listing.dropna(subset=['Symbol']), columns)
+
+    added = sorted(after.keys() - before.keys())
+    removed = sorted(before.keys() - after.keys())
+    changed = sorted(symbol for symbol in before.keys() & after.keys() if before[symbol] != after[symbol])
+
+    renamed = {}
+    if 'Security Name' in columns and added and removed:
+        old_names = current.set_index(current['Symbol'].str.upper())['Security Name']
+        new_names = listing.set_index(listing['Symbol'].str.upper())['Security Name']
+        by_name = {new_names[symbol]: symbol for symbol in added if isinstance(new_names[symbol], str)}
+        for symbol in removed:
+            match = by_name.get(old_names[symbol])
+            if match:
+                renamed[symbol] = match
+
+    return SymbolDiff(added, removed, changed, renamed)
+
+
+def apply_diff(current: pd.DataFrame, index: SymbolIndex, listing: pd.DataFrame, diff: SymbolDiff):
+    """
+    The next table and index: `current` without removed and changed rows,
+    followed by the added and changed rows from `listing`. The index is
+    updated from those rows alone.
+    """
+    if 'Symbol' not in current.columns:
+        return listing, SymbolIndex(listing)
+
+    replaced = set(diff.removed) | set(diff.changed)
+    keep = ~current['Symbol'].str.upper().isin(replaced).to_numpy(dtype=bool)
+    incoming = listing[listing['Symbol'].str.upper().isin(set(diff.added) | set(diff.changed))]
+
+    table = pd.concat([current[keep], incoming], ignore_index=True)
+    for column in CATEGORICAL_COLUMNS:
+        if column in table.columns:
+            table[column] = table[column].astype('category')
+    return table, index.apply(table, keep, int(keep.sum()), diff.renamed)
+
+
+class SymbolGeneration:
+    """One version of the symbols table and its index. Never modified once published."""
+
+    def __init__(self, frame: pd.DataFrame, index: SymbolIndex, number: int = 1,
+                 diff: Optional[SymbolDiff] = None):
+        self.frame = frame
+        self.index = index
+        self.number = number
+        self.diff = diff
+        self.loaded_at = time.time()
+
+
+class SymbolStore:
+    """
+    The current symbols generation, refreshed from newer listing files.
+
+    A refresh diffs the listing file against the current table, applies
+    the changes to a copy of the index and then publishes the new
+    generation with a single assignment. Readers take `current` once and
+    use that generation throughout, so none sees a half-applied update.
+    Refreshes are single-flight: callers arriving while one runs wait for
+    it and share its result instead of loading the file again.
+    """
+
+    def __init__(self, csv_path, frame: Optional[pd.DataFrame] = None,
+                 on_refresh: Optional[Callable[[SymbolGeneration], None]] = None):
+        self.csv_path = Path(csv_path)
+        self.on_refresh = on_refresh
+        self._modified = self._source_modified()
+        frame = read_symbols(self.csv_path) if frame is None else frame
+        index = SymbolIndex(frame)
+        register_symbol_index(frame, index)
+        self.current = SymbolGeneration(frame, index)
+
+        self._refresh_lock = threading.Lock()
+        self._refreshes = 0
+        self._last_diff: Optional[SymbolDiff] = None
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self.current.frame
+
+    @property
+    def index(self) -> SymbolIndex:
+        return self.current.index
+
+    def _source_modified(self) -> Optional[float]:
+        times = [path.stat().st_mtime for path in (self.csv_path, artifact_path_for(self.csv_path)) if path.exists()]
+        return max(times) if times else None
+
+    def refresh(self) -> SymbolDiff:
+        """Apply the listing file's changes as a new generation; returns the diff."""
+        started = self._refreshes
+        with self._refresh_lock:
+            if self._refreshes != started:
+                # Another caller refreshed while this one waited
+                return self._last_diff
+
+            modified = self._source_modified()
+            listing = read_symbols(self.csv_path)
+            generation = self.current
+            diff = diff_symbols(generation.frame, listing)
+            if diff:
+                frame, index = apply_diff(generation.frame, generation.index, listing, diff)
+                register_symbol_index(frame, index)
+                self.current = SymbolGeneration(frame, index, generation.number + 1, diff)
+                if self.on_refresh:
+                    self.on_refresh(self.current)
+
+            self._modified = modified
+            self._last_diff = diff
+            self._refreshes += 1
+            return diff
+
+    def refresh_if_changed(self) -> Optional[SymbolDiff]:
+        """Refresh only when the listing file changed since the last load."""
+        if self._source_modified() == self._modified:
+            return None
+        return self.refresh()
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                diff = self.refresh_if_changed()
+                if diff:
+                    print(f"Symbols refreshed to generation {self.current.number}: {diff.summary()}")
+            except Exception as e:
+                print(f"Symbol refresh failed: {e}")
+
+    def start_watcher(self, interval: float = REFRESH_INTERVAL):
+        """Check the listing file every `interval` seconds in a daemon thread."""
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="symbol-refresh", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
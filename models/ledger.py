@@ -0,0 +1,284 @@
+"""
+Portfolio Ledger
+Append-only portfolio event log with periodic snapshots
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+LEDGER_DIR = "portfolio_ledger"
+SNAPSHOT_INTERVAL = 100
+
+EVENTS_FILE = "events.jsonl"
+SNAPSHOT_DIR = "snapshots"
+
+_user_locks: Dict[str, threading.RLock] = {}
+_user_locks_guard = threading.Lock()
+
+
+def _user_lock(path: Path) -> threading.RLock:
+    """One lock per ledger directory, shared by every session in the process."""
+    with _user_locks_guard:
+        return _user_locks.setdefault(str(path), threading.RLock())
+
+
+def empty_state() -> Dict[str, Any]:
+    """State of a portfolio with no history."""
+    return {'lots': {}, 'realized': []}
+
+
+def apply_event(state: Dict[str, Any], event: Dict[str, Any]):
+    """Apply one event to a portfolio state in place."""
+    lots = state['lots']
+    kind = event['type']
+
+    if kind == 'lot_added':
+        lot = dict(event['lot'])
+        lots[lot['lot_id']] = lot
+    elif kind == 'lot_updated':
+        lot = lots.get(event['lot_id'])
+        if lot is not None:
+            lot.update(event['fields'])
+    elif kind == 'symbol_removed':
+        for lot_id in event['lot_ids']:
+            lots.pop(lot_id, None)
+    elif kind == 'lot_sold':
+        for match in event['matches']:
+            lot = lots.get(match['lot_id'])
+            if lot is None:
+                continue
+            lot['shares'] -= match['shares']
+            if lot['shares'] <= 1e-9:
+                del lots[match['lot_id']]
+        state['realized'].extend(event['realized'])
+    elif kind == 'cleared':
+        lots.clear()
+    else:
+        raise ValueError(f"Unknown portfolio event type: {kind}")
+
+
+def _as_timestamp(when: Union[str, datetime]) -> str:
+    """Normalize a date or datetime to the ledger's timestamp format."""
+    if isinstance(when, datetime):
+        return when.isoformat(timespec='microseconds')
+    if len(when) == 10:
+        # A bare date means the end of that day
+        return f"{when}T23:59:59.999999"
+    return datetime.fromisoformat(when).isoformat(timespec='microseconds')
+
+
+def _replay(events_file: Path, state: Dict[str, Any], offset: int,
+            until: Optional[str] = None) -> Tuple[int, int, int]:
+    """
+    Apply the events stored after `offset` to `state`, optionally stopping
+    at the first event later than `until`.
+    Returns (new offset, last seq applied or 0, events applied).
+    """
+    if not events_file.exists():
+        return offset, 0, 0
+    seq = 0
+    count = 0
+    with open(events_file, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                # Partially written line from a concurrent append
+                break
+            event = json.loads(line)
+            if until is not None and event['ts'] > until:
+                break
+            apply_event(state, event)
+            seq = event['seq']
+            offset += len(line)
+            count += 1
+    return offset, seq, count
+
+
+class PortfolioLedger:
+    """
+    Event log for one user's portfolio.
+
+    Events are appended as JSON lines. Every `snapshot_interval` events the
+    full state is written to a snapshot that records the log offset it
+    covers, so loading reads one snapshot plus at most that many events.
+
+    Events applied to `state` but not yet written (held for a unit of work,
+    or being appended) always come after the events of other instances, as
+    they will in the log: when the log has grown, the state is rebuilt from
+    disk and those events are applied again on top.
+    """
+
+    def __init__(self, username: str, root: Optional[str] = None,
+                 snapshot_interval: int = SNAPSHOT_INTERVAL):
+        self.path = Path(root or LEDGER_DIR) / quote(username, safe='')
+        self.events_file = self.path / EVENTS_FILE
+        self.snapshot_dir = self.path / SNAPSHOT_DIR
+        self.snapshot_interval = snapshot_interval
+        self.lock = _user_lock(self.path)
+        self._since_snapshot = 0
+        # Applied to state, waiting for flush()
+        self.unflushed: List[Dict[str, Any]] = []
+        # Times the state was rebuilt under unwritten events
+        self.reloads = 0
+
+        with self.lock:
+            self.state, self.seq, self._offset = self._load()
+            # Events replayed on load, bounded by the snapshot interval
+            self.replayed = self._catch_up()
+
+    @property
+    def is_empty(self) -> bool:
+        """True if nothing has ever been recorded."""
+        return self.seq == 0 and not self.events_file.exists() and not self.snapshot_dir.exists()
+
+    def _snapshots(self) -> List[Tuple[int, str, Path]]:
+        """(seq, timestamp, path) of every snapshot, oldest first."""
+        if not self.snapshot_dir.exists():
+            return []
+        snapshots = []
+        for entry in self.snapshot_dir.iterdir():
+            if entry.suffix != '.json':
+                continue
+            seq, _, stamp = entry.stem.partition('_')
+            ts = datetime.strptime(stamp, '%Y%m%dT%H%M%S%f').isoformat(timespec='microseconds')
+            snapshots.append((int(seq), ts, entry))
+        return sorted(snapshots)
+
+    @staticmethod
+    def _read_snapshot(snapshot_path: Path) -> Dict[str, Any]:
+        with open(snapshot_path, 'r') as f:
+            return json.load(f)
+
+    def _load(self) -> Tuple[Dict[str, Any], int, int]:
+        """(state, seq, offset) of the latest snapshot, or of an empty ledger."""
+        snapshots = self._snapshots()
+        if not snapshots:
+            return empty_state(), 0, 0
+        snapshot = self._read_snapshot(snapshots[-1][2])
+        return snapshot['state'], snapshot['seq'], snapshot['offset']
+
+    def _behind(self) -> bool:
+        return self.events_file.exists() and self.events_file.stat().st_size != self._offset
+
+    def _catch_up(self, unwritten: List[Dict[str, Any]] = ()) -> int:
+        """
+        Replay events past the current offset into the live state.
+        `unwritten` are events already in the state but not in the log.
+        """
+        if not unwritten or not self._behind():
+            self._offset, seq, count = _replay(self.events_file, self.state, self._offset)
+            if count:
+                self.seq = seq
+                self._since_snapshot += count
+            return count
+
+        # Rebuild from disk so the unwritten events apply after the others,
+        # keeping the state's containers for code that holds on to them
+        state, self.seq, offset = self._load()
+        self._offset, seq, count = _replay(self.events_file, state, offset)
+        if count:
+            self.seq = seq
+        self._since_snapshot = count
+        for event in unwritten:
+            apply_event(state, event)
+        self.state['lots'].clear()
+        self.state['lots'].update(state['lots'])
+        self.state['realized'][:] = state['realized']
+        self.reloads += 1
+        return count
+
+    def refresh(self) -> bool:
+        """
+        Pick up events appended by other ledger instances.
+        Returns True if the state changed.
+        """
+        with self.lock:
+            if not self._behind():
+                return False
+            return self._catch_up(self.unflushed) > 0
+
+    def hold(self, event: Dict[str, Any]):
+        """Keep an event the caller has already applied to `state` until flush()."""
+        with self.lock:
+            self.unflushed.append(event)
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Append the held events with a single write."""
+        with self.lock:
+            if not self.unflushed:
+                return []
+            events, self.unflushed = self.unflushed, []
+            return self.append_many(events)
+
+    def discard(self):
+        """Forget held events; the state still has them, so drop this ledger."""
+        with self.lock:
+            self.unflushed = []
+
+    def append(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record an event the caller has already applied to `state`.
+        Writes a snapshot when the interval is reached.
+        """
+        return self.append_many([event])[-1]
+
+    def append_many(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Record several already-applied events with a single write."""
+        with self.lock:
+            # Apply anything other instances appended first, so the offset stays
+            # exact and the state matches the order events land in the log
+            self._catch_up(self.unflushed + events)
+            ts = datetime.now().isoformat(timespec='microseconds')
+            recorded = []
+            for event in events:
+                self.seq += 1
+                recorded.append({'seq': self.seq, 'ts': ts, **event})
+
+            data = ''.join(json.dumps(event) + '\n' for event in recorded).encode()
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.events_file, 'ab') as f:
+                f.write(data)
+            self._offset += len(data)
+            self._since_snapshot += len(recorded)
+
+            if self._since_snapshot >= self.snapshot_interval:
+                self.snapshot()
+            return recorded
+
+    def snapshot(self):
+        """Write the current state as a snapshot."""
+        with self.lock:
+            if self.unflushed:
+                # A snapshot must not cover events the log doesn't have
+                self.flush()
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            now = datetime.now()
+            stem = f"{self.seq:012d}_{now.strftime('%Y%m%dT%H%M%S%f')}"
+            body = {'seq': self.seq, 'offset': self._offset, 'state': self.state}
+            tmp_path = self.snapshot_dir / f"{stem}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(body, f)
+            os.replace(tmp_path, self.snapshot_dir / f"{stem}.json")
+            self._since_snapshot = 0
+
+    def state_at(self, when: Union[str, datetime]) -> Dict[str, Any]:
+        """
+        Reconstruct the portfolio state as of a date or datetime.
+        Starts from the last snapshot taken by then and replays forward.
+        """
+        until = _as_timestamp(when)
+        state = empty_state()
+        offset = 0
+        with self.lock:
+            for _, ts, snapshot_path in reversed(self._snapshots()):
+                if ts <= until:
+                    snapshot = self._read_snapshot(snapshot_path)
+                    state, offset = snapshot['state'], snapshot['offset']
+                    break
+            _replay(self.events_file, state, offset, until)
+        return state
@@ -0,0 +1,122 @@
+"""
+Tax Lot Queues
+Per-symbol open lots with FIFO, LIFO and highest-cost-first matching
+"""
+
+import bisect
+import heapq
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LOT_METHODS = ('FIFO', 'LIFO', 'HIFO')
+
+# Share counts below this are treated as a fully consumed lot
+SHARE_EPSILON = 1e-9
+
+
+class LotQueue:
+    """
+    Open lots of a single symbol.
+
+    Lots are kept in a list sorted by purchase date for FIFO/LIFO and in a
+    max-heap on purchase price for HIFO. Closed lots are dropped from the
+    lot map right away and skipped lazily in the other two structures, so a
+    sale touches only the lots it consumes.
+    """
+
+    def __init__(self):
+        self._lots: Dict[str, Dict[str, Any]] = {}
+        self._order: List[Tuple[str, int, str]] = []
+        self._head = 0
+        self._heap: List[Tuple[float, str, int, str]] = []
+        self._seq = 0
+        self._stale = 0
+        self.total_shares = 0
+
+    def __len__(self) -> int:
+        return len(self._lots)
+
+    def add(self, lot: Dict[str, Any]):
+        """Add an open lot. The lot dict is shared, not copied."""
+        lot_id = lot['lot_id']
+        date = lot.get('date_added') or ''
+        self._seq += 1
+        self._lots[lot_id] = lot
+        # Everything before the head is closed, so never insert ahead of it
+        bisect.insort(self._order, (date, self._seq, lot_id), lo=self._head)
+        heapq.heappush(self._heap, (-float(lot['purchase_price']), date, self._seq, lot_id))
+        self.total_shares += lot['shares']
+
+    def discard(self, lot_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a lot, returning it if it was open."""
+        lot = self._lots.pop(lot_id, None)
+        if lot is not None:
+            self.total_shares -= lot['shares']
+            self._stale += 1
+            if self._stale > 2 * len(self._lots) + 32:
+                self._compact()
+        return lot
+
+    def first(self) -> Optional[Dict[str, Any]]:
+        """Oldest open lot."""
+        lot_id = self._peek('FIFO')
+        return self._lots[lot_id] if lot_id else None
+
+    def lots(self) -> Iterator[Dict[str, Any]]:
+        """Open lots, oldest first."""
+        for _, _, lot_id in self._order[self._head:]:
+            lot = self._lots.get(lot_id)
+            if lot is not None:
+                yield lot
+
+    def match(self, shares: float, method: str) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Consume `shares` from the open lots in `method` order.
+
+        Returns (lot, shares_taken) pairs. Lots are reduced in place and
+        fully consumed lots are removed. Raises ValueError if there are not
+        enough shares.
+        """
+        if method not in LOT_METHODS:
+            raise ValueError(f"method must be one of {', '.join(LOT_METHODS)}")
+        if shares > self.total_shares + SHARE_EPSILON:
+            raise ValueError(f"Only {self.total_shares:g} shares available")
+
+        matches = []
+        remaining = shares
+        while remaining > SHARE_EPSILON:
+            lot_id = self._peek(method)
+            lot = self._lots[lot_id]
+            taken = min(lot['shares'], remaining)
+            matches.append((lot, taken))
+            remaining -= taken
+            if lot['shares'] - taken <= SHARE_EPSILON:
+                self.discard(lot_id)
+                lot['shares'] = 0
+            else:
+                lot['shares'] -= taken
+                self.total_shares -= taken
+        return matches
+
+    def _peek(self, method: str) -> Optional[str]:
+        """Id of the next open lot for the method, dropping closed entries on the way."""
+        if method == 'HIFO':
+            while self._heap and self._heap[0][3] not in self._lots:
+                heapq.heappop(self._heap)
+            return self._heap[0][3] if self._heap else None
+
+        if method == 'LIFO':
+            while len(self._order) > self._head and self._order[-1][2] not in self._lots:
+                self._order.pop()
+            return self._order[-1][2] if len(self._order) > self._head else None
+
+        while self._head < len(self._order) and self._order[self._head][2] not in self._lots:
+            self._head += 1
+        return self._order[self._head][2] if self._head < len(self._order) else None
+
+    def _compact(self):
+        """Rebuild the order list and heap without closed lots."""
+        self._order = [e for e in self._order[self._head:] if e[2] in self._lots]
+        self._head = 0
+        self._heap = [e for e in self._heap if e[3] in self._lots]
+        heapq.heapify(self._heap)
+        self._stale = 0
@@ -3,33 +3,100 @@ Portfolio Data Model
 Handles portfolio operations
 """
 
-from typing import List, Dict, Any, Optional
+import hashlib
+import json
+import uuid
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
+from auth.user_store import UserStore
 from models.user import User
+from models.ledger import PortfolioLedger
+from models.lots import LotQueue, LOT_METHODS
+from models.unit_of_work import current_unit_of_work
 
 
 class Portfolio:
     """Portfolio data model and operations."""
 
-    def __init__(self, username: str):
+    def __init__(self, username: str, store: Optional[UserStore] = None):
         self.username = username
-        self.user = User(username)
-        self._portfolio = self._load_portfolio()
+        self.user = User(username, store)
+        unit = current_unit_of_work()
+        # Share a ledger that still has unflushed events, so they are visible here
+        self.ledger = (unit and unit.pending_ledger(username)) or PortfolioLedger(username)
+        if self.ledger.is_empty:
+            self._migrate_legacy()
+        self._rebuild_index()
 
-    def _load_portfolio(self) -> List[Dict[str, Any]]:
-        """Load portfolio from user data."""
+    def _migrate_legacy(self):
+        """Seed an empty ledger from positions stored in the user record."""
         user_data = self.user.get_data()
-        return user_data.get('portfolio', [])
+        positions = user_data.get('portfolio', [])
+        realized = user_data.get('realized_gains', [])
+        if not positions and not realized:
+            return
+        for position in positions:
+            position = dict(position)
+            if not position.get('lot_id'):
+                position['lot_id'] = uuid.uuid4().hex[:12]
+            self.ledger.state['lots'][position['lot_id']] = position
+        self.ledger.state['realized'].extend(realized)
+        self.ledger.snapshot()
+
+    def _rebuild_index(self):
+        """Point the lot map at the ledger state and rebuild the symbol queues."""
+        # Every open lot by id, in insertion order, plus a lot queue per symbol
+        self._lots: Dict[str, Dict[str, Any]] = self.ledger.state['lots']
+        self._realized: List[Dict[str, Any]] = self.ledger.state['realized']
+        self._index: Dict[str, LotQueue] = {}
+        for position in self._lots.values():
+            self._index.setdefault(position['symbol'], LotQueue()).add(position)
+        self._reloads = self.ledger.reloads
+
+    def _sync(self):
+        """Apply changes other sessions recorded since this portfolio was loaded."""
+        if self.ledger.refresh() or self.ledger.reloads != self._reloads:
+            self._rebuild_index()
+
+    def _record(self, event: Dict[str, Any]) -> bool:
+        """Append an already-applied change to the ledger, or queue it in the unit of work."""
+        unit = current_unit_of_work()
+        if unit is not None:
+            unit.register_event(self.username, self.ledger, event)
+            return True
+        try:
+            self.ledger.append(event)
+            return True
+        except OSError:
+            return False
+
+    def _index_lot(self, position: Dict[str, Any]):
+        """Register a lot in the id map and its symbol queue."""
+        if not position.get('lot_id'):
+            position['lot_id'] = uuid.uuid4().hex[:12]
+        self._lots[position['lot_id']] = position
+        self._index.setdefault(position['symbol'], LotQueue()).add(position)
+
+    def _drop_lot(self, position: Dict[str, Any]):
+        """Remove a lot from the id map and its symbol queue."""
+        self._lots.pop(position['lot_id'], None)
+        queue = self._index.get(position['symbol'])
+        if queue is not None:
+            queue.discard(position['lot_id'])
+            if not len(queue):
+                del self._index[position['symbol']]
 
     def save(self) -> bool:
-        """Save portfolio to user data."""
-        user_data = self.user.get_data()
-        user_data['portfolio'] = self._portfolio
-        return self.user.update_data(user_data)
+        """Checkpoint the portfolio as a ledger snapshot."""
+        try:
+            self.ledger.snapshot()
+            return True
+        except OSError:
+            return False
 
     def get_all(self) -> List[Dict[str, Any]]:
         """Get all portfolio positions."""
-        return self._portfolio
+        return list(self._lots.values())
 
     def add_position(self, symbol: str, shares: int, purchase_price: float,
                      purchase_date: Optional[str] = None) -> bool:
@@ -44,42 +111,155 @@ class Portfolio:
             'date_added': purchase_date
         }
 
-        self._portfolio.append(position)
-        return self.save()
+        with self.ledger.lock:
+            self._sync()
+            self._index_lot(position)
+            return self._record({'type': 'lot_added', 'lot': position})
 
     def remove_position(self, symbol: str) -> bool:
         """Remove a position from portfolio."""
-        self._portfolio = [p for p in self._portfolio if p['symbol'] != symbol.upper()]
-        return self.save()
+        with self.ledger.lock:
+            self._sync()
+            symbol = symbol.upper()
+            queue = self._index.pop(symbol, None)
+            if queue is None:
+                return True
+            lot_ids = [lot['lot_id'] for lot in queue.lots()]
+            for lot_id in lot_ids:
+                del self._lots[lot_id]
+            return self._record({'type': 'symbol_removed', 'symbol': symbol, 'lot_ids': lot_ids})
 
     def get_position(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get a specific position."""
-        for position in self._portfolio:
-            if position['symbol'] == symbol.upper():
-                return position
-        return None
+        queue = self._index.get(symbol.upper())
+        return queue.first() if queue else None
+
+    def get_lots(self, symbol: str) -> List[Dict[str, Any]]:
+        """Get open lots for a symbol, oldest first."""
+        queue = self._index.get(symbol.upper())
+        return list(queue.lots()) if queue else []
 
     def update_position(self, symbol: str, **kwargs) -> bool:
         """Update a position."""
-        for position in self._portfolio:
-            if position['symbol'] == symbol.upper():
-                position.update(kwargs)
-                return self.save()
-        return False
+        with self.ledger.lock:
+            self._sync()
+            position = self.get_position(symbol)
+            if position is None:
+                return False
+
+            # Re-index so date and price changes reach the lot ordering
+            self._drop_lot(position)
+            position.update(kwargs)
+            position['symbol'] = position['symbol'].upper()
+            self._index_lot(position)
+            fields = {key: position[key] for key in kwargs}
+            fields['symbol'] = position['symbol']
+            return self._record({'type': 'lot_updated', 'lot_id': position['lot_id'], 'fields': fields})
+
+    def sell(self, symbol: str, shares: float, sale_price: float,
+             sale_date: Optional[str] = None, method: str = 'FIFO') -> bool:
+        """
+        Sell shares of a symbol, matching lots by FIFO, LIFO or HIFO.
+
+        Records one realized gain entry per lot consumed. Returns False if
+        the portfolio holds fewer shares than requested.
+        """
+        method = method.upper()
+        if method not in LOT_METHODS:
+            raise ValueError(f"method must be one of {', '.join(LOT_METHODS)}")
+
+        symbol = symbol.upper()
+        if sale_date is None:
+            sale_date = datetime.now().strftime('%Y-%m-%d')
+
+        with self.ledger.lock:
+            self._sync()
+            queue = self._index.get(symbol)
+            if queue is None or shares <= 0 or shares > queue.total_shares:
+                return False
+
+            matches = []
+            realized = []
+            for lot, taken in queue.match(shares, method):
+                cost_basis = taken * lot['purchase_price']
+                proceeds = taken * sale_price
+                matches.append({'lot_id': lot['lot_id'], 'shares': taken})
+                realized.append({
+                    'symbol': symbol,
+                    'lot_id': lot['lot_id'],
+                    'shares': taken,
+                    'purchase_price': lot['purchase_price'],
+                    'purchase_date': lot.get('date_added'),
+                    'sale_price': sale_price,
+                    'sale_date': sale_date,
+                    'cost_basis': cost_basis,
+                    'proceeds': proceeds,
+                    'gain_loss': proceeds - cost_basis,
+                    'method': method
+                })
+                if lot['shares'] == 0:
+                    del self._lots[lot['lot_id']]
+
+            self._realized.extend(realized)
+            if not len(queue):
+                del self._index[symbol]
+            return self._record({'type': 'lot_sold', 'symbol': symbol,
+                                 'matches': matches, 'realized': realized})
+
+    def get_realized_gains(self) -> List[Dict[str, Any]]:
+        """Get realized gain entries, one per lot sold."""
+        return self._realized
+
+    def get_unrealized_gains(self, prices: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+        """Get unrealized gain per symbol at the given prices."""
+        gains = {}
+        for symbol, queue in self._index.items():
+            if symbol not in prices:
+                continue
+            cost_basis = sum(lot['shares'] * lot['purchase_price'] for lot in queue.lots())
+            market_value = queue.total_shares * prices[symbol]
+            gains[symbol] = {
+                'shares': queue.total_shares,
+                'cost_basis': cost_basis,
+                'market_value': market_value,
+                'gain_loss': market_value - cost_basis
+            }
+        return gains
+
+    def get_gain_report(self, prices: Dict[str, float]) -> Dict[str, float]:
+        """Get total realized and unrealized gains."""
+        unrealized = self.get_unrealized_gains(prices)
+        return {
+            'realized': sum(r['gain_loss'] for r in self._realized),
+            'unrealized': sum(g['gain_loss'] for g in unrealized.values())
+        }
 
     def clear(self) -> bool:
         """Clear all positions."""
-        self._portfolio = []
-        return self.save()
+        with self.ledger.lock:
+            self._sync()
+            self._lots.clear()
+            self._index = {}
+            return self._record({'type': 'cleared'})
+
+    def get_positions_at(self, when: Union[str, datetime]) -> List[Dict[str, Any]]:
+        """Get the open lots as of a date (YYYY-MM-DD) or datetime."""
+        return list(self.ledger.state_at(when)['lots'].values())
 
     def get_symbols(self) -> List[str]:
         """Get list of all symbols in portfolio."""
-        return [p['symbol'] for p in self._portfolio]
+        return [p['symbol'] for p in self._lots.values()]
 
     def get_total_positions(self) -> int:
         """Get total number of positions."""
-        return len(self._portfolio)
+        return len(self._lots)
+
+    def get_signature(self) -> str:
+        """Fingerprint of the open lots, for telling whether a stored valuation is current."""
+        lots = sorted((lot['lot_id'], lot['symbol'], lot['shares'], lot['purchase_price'])
+                      for lot in self._lots.values())
+        return hashlib.sha1(json.dumps(lots).encode()).hexdigest()
 
     def get_total_shares(self) -> int:
         """Get total number of shares across all positions."""
-        return sum(p['shares'] for p in self._portfolio)
\ No newline at end of file
+        return sum(queue.total_shares for queue in self._index.values())
@@ -0,0 +1,112 @@
+"""
+Unit of Work
+Batches User and Portfolio writes into one flush per rerun or bulk operation
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from auth.user_store import get_user_store
+from models.ledger import PortfolioLedger
+
+_local = threading.local()
+
+
+class UnitOfWork:
+    """
+    Pending writes for the current thread.
+
+    User field changes are merged per user and written in a single store
+    transaction; portfolio events are appended to each ledger with a single
+    write. Objects that were edited keep their in-memory changes after a
+    rollback, so they should be discarded.
+    """
+
+    def __init__(self):
+        self._user_fields: Dict[str, Dict[str, Any]] = {}
+        self._ledgers: Dict[str, PortfolioLedger] = {}
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self._user_fields or any(ledger.unflushed for ledger in self._ledgers.values()))
+
+    def register_user_fields(self, username: str, fields: Dict[str, Any]):
+        """Mark fields of a user record as changed."""
+        self._user_fields.setdefault(username, {}).update(fields)
+
+    def register_event(self, username: str, ledger: PortfolioLedger, event: Dict[str, Any]):
+        """Queue an event for a portfolio ledger."""
+        self._ledgers[username] = ledger
+        ledger.hold(event)
+
+    def pending_fields(self, username: str) -> Dict[str, Any]:
+        """Unflushed field changes for a user."""
+        return self._user_fields.get(username, {})
+
+    def pending_ledger(self, username: str) -> Optional[PortfolioLedger]:
+        """The ledger with unflushed events for a user, its state already updated."""
+        return self._ledgers.get(username)
+
+    def flush(self) -> bool:
+        """
+        Write all pending changes.
+        Returns False if a user record no longer exists.
+        """
+        from models.user import user_cache
+
+        saved = True
+        user_fields, self._user_fields = self._user_fields, {}
+        if user_fields:
+            store = get_user_store()
+            with store.transaction():
+                for username, fields in user_fields.items():
+                    saved = store.update(username, fields) and saved
+            for username in user_fields:
+                user_cache.invalidate(username)
+
+        ledgers, self._ledgers = self._ledgers, {}
+        for ledger in ledgers.values():
+            ledger.flush()
+        return saved
+
+    def rollback(self):
+        """Discard pending changes."""
+        self._user_fields.clear()
+        for ledger in self._ledgers.values():
+            ledger.discard()
+        self._ledgers.clear()
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    """The unit of work open on this thread, if any."""
+    return getattr(_local, 'unit', None)
+
+
+@contextmanager
+def unit_of_work(rollback_on_error: bool = True) -> Iterator[UnitOfWork]:
+    """
+    Collect writes made inside the block and flush them once on exit.
+
+    Nested blocks join the outer unit. With rollback_on_error=False pending
+    writes are still flushed when the block raises, which suits control-flow
+    exceptions such as Streamlit's rerun and stop.
+    """
+    outer = current_unit_of_work()
+    if outer is not None:
+        yield outer
+        return
+
+    unit = UnitOfWork()
+    _local.unit = unit
+    try:
+        yield unit
+    except BaseException:
+        _local.unit = None
+        if rollback_on_error:
+            unit.rollback()
+        else:
+            unit.flush()
+        raise
+    _local.unit = None
+    unit.flush()
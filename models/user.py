@@ -3,30 +3,127 @@ User Data Model
 Handles user data operations
 """
 
-from auth.authentication import load_users, save_users
-from typing import Optional, Dict, List, Any
+import copy
+import threading
+from auth.user_store import UserStore, get_user_store
+from models.unit_of_work import current_unit_of_work
+from typing import Optional, Dict, List, Any, Tuple
+
+
+class UserRecordCache:
+    """
+    Parsed user records shared by every session in the process.
+
+    Each entry remembers the store generation and row version it was read
+    at. While the generation is unchanged a read is served from memory with
+    no I/O. After any write the generation moves, and an entry whose row
+    version is still current is kept instead of being reparsed. Callers get
+    deep copies, so edits to a User never leak into the cache.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Any, Optional[int], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads_avoided = 0
+
+    def get(self, username: str) -> Dict[str, Any]:
+        """Get a copy of a user's record, reading the store only if it changed."""
+        store = get_user_store()
+        generation = store.generation()
+
+        with self._lock:
+            entry = self._entries.get(username)
+        if entry is not None:
+            cached_generation, version, data = entry
+            if cached_generation == generation:
+                self.hits += 1
+                return copy.deepcopy(data)
+            if version is not None and store.get_version(username) == version:
+                with self._lock:
+                    self._entries[username] = (generation, version, data)
+                self.hits += 1
+                self.reloads_avoided += 1
+                return copy.deepcopy(data)
+
+        self.misses += 1
+        # Read the version first so a concurrent write can only make the entry look older
+        version = store.get_version(username)
+        data = store.get(username) or {}
+        with self._lock:
+            self._entries[username] = (generation, version, data)
+        return copy.deepcopy(data)
+
+    def invalidate(self, username: Optional[str] = None):
+        """Drop one user's entry, or every entry."""
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(username, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counts, hit ratio and reloads avoided."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'reloads_avoided': self.reloads_avoided
+        }
+
+
+user_cache = UserRecordCache()
 
 
 class User:
-    """User data model and operations."""
+    """
+    User data model and operations.
 
-    def __init__(self, username: str):
+    Reads and writes go to the configured store unless `store` is given.
+    A User bound to its own store bypasses the process record cache and
+    writes straight to that store, even inside a unit of work.
+    """
+
+    def __init__(self, username: str, store: Optional[UserStore] = None):
         self.username = username
+        self.store = store
+        self._dirty = set()
         self._data = self._load_data()
 
     def _load_data(self) -> Dict[str, Any]:
         """Load user data from storage."""
-        users = load_users()
-        return users.get(self.username, {})
+        if self.store is not None:
+            return self.store.get(self.username) or {}
+        data = user_cache.get(self.username)
+        unit = current_unit_of_work()
+        if unit is not None:
+            # Read your own unflushed writes
+            data.update(copy.deepcopy(unit.pending_fields(self.username)))
+        return data
 
     def save(self) -> bool:
-        """Save user data to storage."""
-        users = load_users()
-        if self.username in users:
-            users[self.username].update(self._data)
-            save_users(users)
+        """
+        Save changed fields to storage, or all fields if none were marked.
+        Inside a unit of work the write is deferred until it flushes.
+        """
+        keys = self._dirty or self._data.keys()
+        fields = {key: self._data[key] for key in keys}
+        self._dirty = set()
+
+        if self.store is not None:
+            return self.store.update(self.username, fields)
+
+        unit = current_unit_of_work()
+        if unit is not None:
+            unit.register_user_fields(self.username, fields)
             return True
-        return False
+
+        saved = get_user_store().update(self.username, fields)
+        user_cache.invalidate(self.username)
+        return saved
 
     def get_data(self) -> Dict[str, Any]:
         """Get all user data."""
@@ -35,6 +132,7 @@ class User:
     def update_data(self, data: Dict[str, Any]) -> bool:
         """Update user data."""
         self._data.update(data)
+        self._dirty.update(data)
         return self.save()
 
     def get_created_at(self) -> str:
@@ -48,19 +146,42 @@ class User:
     def update_preferences(self, preferences: Dict[str, Any]) -> bool:
         """Update user preferences."""
         self._data['preferences'] = preferences
+        self._dirty.add('preferences')
+        return self.save()
+
+    def get_watchlist(self) -> List[str]:
+        """Get watchlist symbols."""
+        return self._data.get('watchlist', [])
+
+    def add_to_watchlist(self, symbol: str) -> bool:
+        """Add a symbol to the watchlist. Returns False if it is already there."""
+        symbol = symbol.strip().upper()
+        watchlist = self.get_watchlist()
+        if not symbol or symbol in watchlist:
+            return False
+        self._data['watchlist'] = watchlist + [symbol]
+        self._dirty.add('watchlist')
+        return self.save()
+
+    def remove_from_watchlist(self, symbol: str) -> bool:
+        """Remove a symbol from the watchlist. Returns False if it was not there."""
+        symbol = symbol.strip().upper()
+        watchlist = self.get_watchlist()
+        if symbol not in watchlist:
+            return False
+        self._data['watchlist'] = [s for s in watchlist if s != symbol]
+        self._dirty.add('watchlist')
         return self.save()
 
     def change_password(self, new_password_hash: str) -> bool:
         """Change user password."""
         self._data['password'] = new_password_hash
+        self._dirty.add('password')
         return self.save()
 
     @staticmethod
     def delete_user(username: str) -> bool:
         """Delete a user account."""
-        users = load_users()
-        if username in users:
-            del users[username]
-            save_users(users)
-            return True
-        return False
\ No newline at end of file
+        deleted = get_user_store().delete(username)
+        user_cache.invalidate(username)
+        return deleted
\ No newline at end of file
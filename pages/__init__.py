@@ -1,16 +1,23 @@
 """
 Pages Package
 Application pages/views
+
+Page modules are imported on first access, so starting the app only loads
+the page being shown.
 """
 
-from . import stock_analysis
-from . import portfolio_manager
-from . import market_news
-from . import earnings_viewer
+import importlib
 
 __all__ = [
     'stock_analysis',
     'portfolio_manager',
     'market_news',
-    'earnings_viewer'
-]
\ No newline at end of file
+    'earnings_viewer',
+    'symbol_browser'
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,7 +12,10 @@ from components.stock_input import stock_input_with_suggestions
 from components.metrics import display_sentiment_metrics, display_eps_metrics
 from utils.text_processing import clean_text, split_into_paragraphs, highlight_search_term, extract_longest_sentence
 from utils.helpers import infer_quarter, get_sentiment_color, get_sentiment_emoji
-from utils.service_discovery import get_service_url
+from data.service_cache import service_cache
+from data.session_payloads import SessionPayloads
+from data.symbol_loader import resolve_symbol
+from utils.service_discovery import get_service_url, tracked_call
 
 
 SERVICE_NAME = "Earnings_Service"
@@ -44,10 +47,19 @@ def render_earnings_selector(symbols_df: pd.DataFrame):
 
     # Load available quarters
     if symbol and st.button("📅 Load Available Quarters", use_container_width=True):
+        listed = resolve_symbol(symbols_df, symbol)
+        if listed is None:
+            # Rejected here rather than spending an API call on it
+            st.error(f"Unknown symbol: {symbol}")
+            return
+        symbol = listed
         with st.spinner(f"Loading earnings data for {symbol}..."):
             try:
                 service_url = get_service_url(SERVICE_NAME)
-                res = requests.get(f"{service_url}/earnings/{symbol}")
+                res = service_cache.fetch(
+                    "earnings", symbol,
+                    tracked_call(SERVICE_NAME, service_url, lambda: requests.get(f"{service_url}/earnings/{symbol}"))
+                )
                 if res.status_code == 200:
                     payload = res.json()
                     earnings_data = payload["earnings"]
@@ -67,8 +79,11 @@ def render_earnings_selector(symbols_df: pd.DataFrame):
 
     # Fetch transcript
     if st.button("🔄 Fetch Transcript", use_container_width=True):
-        if symbol and selected_quarter:
-            fetch_transcript( symbol, selected_quarter)
+        listed = resolve_symbol(symbols_df, symbol) if symbol else None
+        if symbol and listed is None:
+            st.error(f"Unknown symbol: {symbol}")
+        elif symbol and selected_quarter:
+            fetch_transcript( listed, selected_quarter)
         else:
             st.warning("Please select a stock symbol and quarter first.")
 
@@ -166,9 +181,12 @@ def fetch_transcript(symbol: str, quarter: str):
         try:
             # Call the earnings microservice instead of api_client directly
             service_url = get_service_url(SERVICE_NAME)
-            res = requests.get(
-                f"{service_url}/earnings/{symbol}/transcript",
-                params={"quarter": quarter},
+            res = service_cache.fetch(
+                "transcript", (symbol, quarter),
+                tracked_call(SERVICE_NAME, service_url, lambda: requests.get(
+                    f"{service_url}/earnings/{symbol}/transcript",
+                    params={"quarter": quarter},
+                ))
             )
 
             if res.status_code == 200:
@@ -179,7 +197,7 @@ def fetch_transcript(symbol: str, quarter: str):
                 if not data or "transcript" not in data or not data["transcript"]:
                     st.error("⚠️ No transcript data found for this quarter.")
                 else:
-                    st.session_state["transcript_data"] = data
+                    SessionPayloads(st.session_state).put("transcript_data", data)
                     st.success(
                         f"✅ Loaded transcript for {data.get('symbol')} – {data.get('quarter')}"
                     )
@@ -196,14 +214,15 @@ def fetch_transcript(symbol: str, quarter: str):
             st.error(f"🌐 Error contacting earnings service: {e}")
 
 
+@st.fragment
 def render_transcript_display():
-    """Render transcript display with filters and search."""
-    if "transcript_data" not in st.session_state:
+    """Render transcript display with filters and search; filter changes rerun only this section."""
+    data = SessionPayloads(st.session_state).get("transcript_data")
+    if data is None:
         st.info("Enter a stock symbol and load available quarters to get started.")
         render_help_section()
         return
 
-    data = st.session_state["transcript_data"]
     transcript = data.get("transcript", [])
 
     if not transcript:
@@ -10,7 +10,10 @@ import os
 import requests  # NEW – to call the microservice
 from components.stock_input import stock_input_with_suggestions
 from utils.helpers import get_sentiment_color
-from utils.service_discovery import get_service_url
+from data.service_cache import service_cache
+from data.session_payloads import SessionPayloads
+from data.symbol_loader import resolve_symbol
+from utils.service_discovery import get_service_url, tracked_call
 
 SERVICE_NAME = "Market_News_Service"
 
@@ -70,21 +73,30 @@ def render_news_settings(symbols_df: pd.DataFrame):
                     st.warning("Please enter a stock symbol")
                     return
 
+                listed = resolve_symbol(symbols_df, ticker_symbol)
+                if listed is None:
+                    # Rejected here rather than spending an API call on it
+                    st.error(f"Unknown symbol: {ticker_symbol}")
+                    return
+
                 params = {
                     "mode": "ticker",
-                    "ticker": ticker_symbol,
+                    "ticker": listed,
                     "sort": sort_by,
                     "limit": limit,
                 }
 
             try:
                 service_url = get_service_url(SERVICE_NAME)
-                res = requests.get(f"{service_url}/news", params=params)
+                res = service_cache.fetch(
+                    "news", tuple(sorted(params.items())),
+                    tracked_call(SERVICE_NAME, service_url, lambda: requests.get(f"{service_url}/news", params=params))
+                )
 
                 if res.status_code == 200:
                     payload = res.json()
                     # 'news' field contains the raw Alpha Vantage-style response
-                    st.session_state['news_data'] = payload['news']
+                    SessionPayloads(st.session_state).put('news_data', payload['news'])
                     st.success("✅ News loaded successfully")
                 elif res.status_code == 404:
                     st.warning("No news articles found for this query.")
@@ -95,13 +107,14 @@ def render_news_settings(symbols_df: pd.DataFrame):
                 st.error(f"Error contacting news service: {e}")
 
 
+@st.fragment
 def render_news_feed():
-    """Render news articles feed."""
-    if 'news_data' not in st.session_state:
+    """Render news articles feed; the sentiment filter reruns only this section."""
+    news_data = SessionPayloads(st.session_state).get('news_data')
+    if news_data is None:
         st.info("Configure settings and click 'Fetch News' to get started.")
         return
 
-    news_data = st.session_state['news_data']
 
     if 'feed' not in news_data or not news_data['feed']:
         st.warning("No news articles found.")
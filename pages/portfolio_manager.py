@@ -9,11 +9,16 @@ import plotly.graph_objects as go
 from datetime import datetime
 import json
 import os
+import time
 import requests  # NEW
 from models.portfolio import Portfolio
+from models.unit_of_work import unit_of_work
 from components.stock_input import stock_input_with_suggestions
+from components.live_quotes import render_live_quotes
 from utils.helpers import format_currency, format_percentage
-from utils.service_discovery import get_service_url
+from data.service_cache import service_cache
+from data.symbol_loader import resolve_symbol, resolve_symbols
+from utils.service_discovery import get_service_url, track_service_call, tracked_call
 
 # # Load the configuration from config.json
 # config_path = '/app/config.json'
@@ -24,6 +29,9 @@ from utils.service_discovery import get_service_url
 
 SERVICE_NAME = "Portfolio_Service"
 
+# Seconds a session reuses its last valuation of unchanged positions
+VALUATION_TTL = 60
+
 
 def render(symbols_df: pd.DataFrame):
     """Render Portfolio Manager page."""
@@ -40,9 +48,12 @@ def render(symbols_df: pd.DataFrame):
 
     with col1:
         render_add_position(portfolio, symbols_df)
+        render_sell_position(portfolio)
+        render_import_positions(portfolio, symbols_df)
+        render_watchlist_panel(portfolio.user, symbols_df)
 
     with col2:
-        render_portfolio_display( portfolio)
+        render_portfolio_display(portfolio, symbols_df)
 
 
 def render_add_position(portfolio: Portfolio, symbols_df: pd.DataFrame):
@@ -65,7 +76,11 @@ def render_add_position(portfolio: Portfolio, symbols_df: pd.DataFrame):
     purchase_date = st.date_input("Purchase Date", value=datetime.now())
 
     if st.button("➕ Add to Portfolio", use_container_width=True):
-        if new_symbol:
+        listed = resolve_symbol(symbols_df, new_symbol) if new_symbol else None
+        if new_symbol and listed is None:
+            st.error(f"Unknown symbol: {new_symbol}")
+        elif new_symbol:
+            new_symbol = listed
             if portfolio.add_position(
                     new_symbol,
                     shares,
@@ -99,7 +114,184 @@ def render_add_position(portfolio: Portfolio, symbols_df: pd.DataFrame):
             st.success("Portfolio cleared")
             st.rerun()
 
-def render_portfolio_display(portfolio: Portfolio):
+def render_sell_position(portfolio: Portfolio):
+    """Render the sell form with tax-lot matching."""
+    symbols = sorted(set(portfolio.get_symbols()))
+    if not symbols:
+        return
+
+    st.markdown("---")
+    st.subheader("Sell Shares")
+
+    sell_symbol = st.selectbox("Symbol", symbols, key="sell_symbol")
+    lots = portfolio.get_lots(sell_symbol)
+    held = sum(lot['shares'] for lot in lots)
+    st.caption(f"{held:g} shares held across {len(lots)} lot(s)")
+
+    sell_shares = st.number_input("Shares to Sell", min_value=1, max_value=max(int(held), 1), value=1)
+    sale_price = st.number_input("Sale Price ($)", min_value=0.01, value=100.0, format="%.2f")
+    sale_date = st.date_input("Sale Date", value=datetime.now(), key="sale_date")
+    method = st.selectbox(
+        "Lot Matching",
+        ["FIFO", "LIFO", "HIFO"],
+        help="FIFO sells the oldest lots first, LIFO the newest, HIFO the highest cost"
+    )
+
+    if st.button("💸 Sell", use_container_width=True):
+        if portfolio.sell(sell_symbol, sell_shares, sale_price, sale_date.strftime('%Y-%m-%d'), method):
+            st.session_state['portfolio'] = portfolio.get_all()
+            st.success(f"✅ Sold {sell_shares} shares of {sell_symbol} ({method})")
+            st.rerun()
+        else:
+            st.error(f"Not enough shares of {sell_symbol} to sell")
+
+
+def parse_positions_csv(file) -> tuple[list, int]:
+    """
+    Parse positions from a CSV with symbol, shares and purchase_price columns
+    and an optional date_added (or purchase_date) column.
+    Returns the valid rows and the number of rows skipped.
+    """
+    df = pd.read_csv(file)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if 'purchase_date' in df.columns and 'date_added' not in df.columns:
+        df = df.rename(columns={'purchase_date': 'date_added'})
+
+    missing = {'symbol', 'shares', 'purchase_price'} - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(sorted(missing))}")
+
+    positions = []
+    for row in df.to_dict('records'):
+        try:
+            symbol = str(row['symbol']).strip().upper()
+            shares = float(row['shares'])
+            purchase_price = float(row['purchase_price'])
+        except (TypeError, ValueError):
+            continue
+        if not symbol or symbol == 'NAN' or not shares > 0 or not purchase_price > 0:
+            continue
+        date_added = row.get('date_added')
+        if pd.isna(date_added):
+            date_added = None
+        else:
+            parsed = pd.to_datetime(date_added, errors='coerce')
+            if pd.isna(parsed):
+                continue
+            date_added = parsed.strftime('%Y-%m-%d')
+        positions.append({
+            'symbol': symbol,
+            'shares': shares,
+            'purchase_price': purchase_price,
+            'date_added': date_added
+        })
+    return positions, len(df) - len(positions)
+
+
+def render_import_positions(portfolio: Portfolio, symbols_df: pd.DataFrame):
+    """Render the CSV import form."""
+    st.markdown("---")
+    st.subheader("Import from CSV")
+
+    uploaded = st.file_uploader(
+        "Positions CSV",
+        type=["csv"],
+        help="Columns: symbol, shares, purchase_price and optionally date_added",
+        key="portfolio_csv"
+    )
+    if uploaded is None or not st.button("📤 Import Positions", use_container_width=True):
+        return
+
+    try:
+        positions, skipped = parse_positions_csv(uploaded)
+    except (ValueError, pd.errors.ParserError) as e:
+        st.error(f"Could not read CSV: {e}")
+        return
+
+    # Unknown symbols are skipped like any other invalid row
+    listed = resolve_symbols(symbols_df, {position['symbol'] for position in positions})
+    valid = []
+    for position in positions:
+        if listed.get(position['symbol']):
+            valid.append({**position, 'symbol': listed[position['symbol']]})
+    skipped += len(positions) - len(valid)
+    positions = valid
+
+    # Every row lands in the ledger with a single write
+    with unit_of_work():
+        for position in positions:
+            portfolio.add_position(
+                position['symbol'],
+                position['shares'],
+                position['purchase_price'],
+                position['date_added']
+            )
+
+    st.session_state['portfolio'] = portfolio.get_all()
+    message = f"✅ Imported {len(positions)} position(s)"
+    if skipped:
+        message += f", skipped {skipped} invalid row(s)"
+    st.success(message)
+    st.rerun()
+
+
+def render_watchlist_panel(user, symbols_df: pd.DataFrame):
+    """Render the watchlist with quotes from the shared quote board."""
+    st.markdown("---")
+    st.subheader("👀 Watchlist")
+
+    new_symbol = st.text_input("Add Symbol", key="watchlist_symbol").strip().upper()
+    if st.button("➕ Add to Watchlist", use_container_width=True) and new_symbol:
+        listed = resolve_symbol(symbols_df, new_symbol)
+        if listed is None:
+            st.error(f"Unknown symbol: {new_symbol}")
+        elif user.add_to_watchlist(listed):
+            st.rerun()
+        else:
+            st.info(f"{listed} is already on your watchlist")
+
+    watchlist = user.get_watchlist()
+    if not watchlist:
+        st.caption("Your watchlist is empty.")
+        return
+
+    quotes = {}
+    try:
+        service_url = get_service_url(SERVICE_NAME)
+        res = service_cache.fetch(
+            "watchlist", tuple(sorted(watchlist)),
+            tracked_call(SERVICE_NAME, service_url, lambda: requests.post(
+                f"{service_url}/watchlist/quotes", json={"symbols": watchlist}
+            ))
+        )
+        if res.status_code == 200:
+            quotes = res.json()['quotes']
+        else:
+            st.error(f"Error from portfolio service: {res.status_code} - {res.text}")
+    except Exception as e:
+        st.error(f"Error contacting portfolio service: {e}")
+
+    for symbol in watchlist:
+        col_a, col_b, col_c = st.columns([2, 3, 1])
+        quote = quotes.get(symbol)
+        with col_a:
+            st.write(f"**{symbol}**")
+        with col_b:
+            if quote:
+                st.write(f"{format_currency(quote['price'])} ({quote['day_change_percent']:+.2f}%)")
+            else:
+                st.write("—")
+        with col_c:
+            if st.button("✖", key=f"unwatch_{symbol}", help=f"Remove {symbol}"):
+                user.remove_from_watchlist(symbol)
+                st.rerun()
+
+    as_of = [q['as_of'] for q in quotes.values()]
+    if as_of:
+        st.caption(f"Quotes as of {min(as_of).replace('T', ' ')}")
+
+
+def render_portfolio_display(portfolio: Portfolio, symbols_df: pd.DataFrame):
     """Render the portfolio display with current values."""
     positions = st.session_state.get('portfolio', [])
 
@@ -109,13 +301,7 @@ def render_portfolio_display(portfolio: Portfolio):
         return
 
     st.subheader(f"Your Portfolio ({len(positions)} positions)")
-
-    # Send positions to the portfolio microservice
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    status_text.text("Calculating portfolio metrics...")
-    progress_bar.progress(0.2)
+    render_valuation_snapshot(portfolio)
 
     # Build payload for service
     payload_positions = []
@@ -129,35 +315,66 @@ def render_portfolio_display(portfolio: Portfolio):
             }
         )
 
-    try:
-        service_url = get_service_url(SERVICE_NAME)
+    # Each section below is a fragment: a widget inside one reruns only that
+    # section, so tuning risk or projection inputs never revalues the table.
+    render_holdings(portfolio, payload_positions)
+
+    # Streamed quote and valuation deltas
+    render_live_panel(payload_positions, portfolio.user.get_watchlist())
+
+    # Risk analytics
+    render_risk_panel(payload_positions, symbols_df)
+
+    # Monte Carlo projection
+    render_projection_panel(payload_positions)
+
+    # Efficient frontier and rebalancing
+    render_optimizer_panel(payload_positions, symbols_df)
+
+
+def fetch_valuation(payload_positions: list, refresh: bool = False) -> dict:
+    """
+    Value positions through the portfolio service, reusing the session's last
+    result while the positions are unchanged and it is under VALUATION_TTL old.
+    """
+    key = json.dumps(payload_positions, sort_keys=True)
+    cached = st.session_state.get('portfolio_valuation')
+    if (not refresh and cached and cached['key'] == key
+            and time.time() - cached['fetched_at'] < VALUATION_TTL):
+        return cached['data']
+
+    service_url = get_service_url(SERVICE_NAME)
+    with track_service_call(SERVICE_NAME, service_url):
         res = requests.post(
             f"{service_url}/portfolio/calculate",
             json=payload_positions,
         )
-        progress_bar.progress(0.7)
+    if res.status_code != 200:
+        raise RuntimeError(f"Error from portfolio service: {res.status_code} - {res.text}")
 
-        if res.status_code == 200:
-            data = res.json()
-            enriched_positions = data["positions"]
-            summary = data["summary"]
-        else:
-            progress_bar.empty()
-            status_text.empty()
-            st.error(
-                f"Error from portfolio service: {res.status_code} - {res.text}"
-            )
+    data = res.json()
+    st.session_state['portfolio_valuation'] = {'key': key, 'fetched_at': time.time(), 'data': data}
+    return data
+
+
+@st.fragment
+def render_holdings(portfolio: Portfolio, payload_positions: list):
+    """Render the valued positions table, summary and gains; reruns on its own refresh."""
+    positions = st.session_state.get('portfolio', [])
+    refresh = st.button("🔄 Refresh Prices")
+
+    with st.spinner("Calculating portfolio metrics..."):
+        try:
+            data = fetch_valuation(payload_positions, refresh=refresh)
+        except RuntimeError as e:
+            st.error(str(e))
+            return
+        except Exception as e:
+            st.error(f"Error contacting portfolio service: {e}")
             return
-    except Exception as e:
-        progress_bar.empty()
-        status_text.empty()
-        st.error(f"Error contacting portfolio service: {e}")
-        return
 
-    progress_bar.progress(1.0)
-    status_text.text("✅ Portfolio updated")
-    progress_bar.empty()
-    status_text.empty()
+    enriched_positions = data["positions"]
+    summary = data["summary"]
 
     # Build table data (with formatted values) for display
     portfolio_data = []
@@ -189,7 +406,7 @@ def render_portfolio_display(portfolio: Portfolio):
         df = pd.DataFrame(portfolio_data)
         st.dataframe(df, use_container_width=True)
 
-        # Remove stock functionality (unchanged)
+        # Remove stock functionality; removing reruns the whole page
         with st.expander("🗑️ Remove Stocks from Portfolio"):
             remove_symbol = st.selectbox(
                 "Select stock to remove:",
@@ -204,6 +421,36 @@ def render_portfolio_display(portfolio: Portfolio):
         # Portfolio summary
         render_portfolio_summary(portfolio_data, total_value, total_cost)
 
+        # Realized versus unrealized gains
+        prices = {pos['symbol']: pos['current_price'] for pos in enriched_positions}
+        render_gain_report(portfolio, prices)
+
+
+def render_valuation_snapshot(portfolio: Portfolio):
+    """Render the last valuation stored by the batch revaluation job."""
+    snapshot = portfolio.user.get_data().get('valuation')
+    if not snapshot:
+        return
+
+    summary = snapshot['summary']
+    valued_at = datetime.fromisoformat(snapshot['valued_at']).strftime('%Y-%m-%d %H:%M')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Last Valuation", format_currency(summary['total_value']))
+    with col2:
+        st.metric(
+            "Gain/Loss",
+            format_currency(summary['total_gain_loss']),
+            format_percentage(summary['total_gain_loss_percent'])
+        )
+    with col3:
+        st.metric("Valued At", valued_at)
+
+    if snapshot.get('signature') != portfolio.get_signature():
+        st.caption("Positions have changed since this valuation; live values are below.")
+    if snapshot.get('missing_symbols'):
+        st.caption(f"No quote for: {', '.join(snapshot['missing_symbols'])}")
+
 
 def render_portfolio_summary(portfolio_data: list, total_value: float, total_cost: float):
     """Render portfolio summary metrics and charts."""
@@ -262,4 +509,265 @@ def render_portfolio_summary(portfolio_data: list, total_value: float, total_cos
                 data=json.dumps(export_data, indent=2),
                 file_name=f"portfolio_{st.session_state.get('username')}_{datetime.now().strftime('%Y%m%d')}.json",
                 mime="application/json"
-            )
\ No newline at end of file
+            )
+
+def render_gain_report(portfolio: Portfolio, prices: dict):
+    """Render realized and unrealized gains with the realized lot history."""
+    report = portfolio.get_gain_report(prices)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Realized Gain/Loss", format_currency(report['realized']))
+    with col2:
+        st.metric("Unrealized Gain/Loss", format_currency(report['unrealized']))
+
+    realized = portfolio.get_realized_gains()
+    if realized:
+        with st.expander(f"🧾 Realized Gains ({len(realized)} lot sales)"):
+            st.dataframe(pd.DataFrame([
+                {
+                    'Symbol': r['symbol'],
+                    'Shares': r['shares'],
+                    'Purchase Date': r.get('purchase_date') or '-',
+                    'Sale Date': r['sale_date'],
+                    'Cost Basis': format_currency(r['cost_basis']),
+                    'Proceeds': format_currency(r['proceeds']),
+                    'Gain/Loss': format_currency(r['gain_loss']),
+                    'Method': r['method'],
+                }
+                for r in realized
+            ]), use_container_width=True)
+
+
+def render_live_panel(payload_positions: list, watchlist: list):
+    """Render the live quote table, fed by the portfolio service's event stream."""
+    st.markdown("---")
+    st.subheader("⚡ Live Quotes")
+
+    if st.toggle("Stream live quotes", key="live_quotes_on"):
+        render_live_quotes(payload_positions, watchlist)
+    else:
+        feed = st.session_state.pop('live_quote_feed', None)
+        if feed is not None:
+            feed.close()
+
+
+@st.fragment
+def render_risk_panel(payload_positions: list, symbols_df: pd.DataFrame):
+    """Render portfolio risk analytics from the portfolio microservice."""
+    st.markdown("---")
+    st.subheader("📉 Risk Analytics")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        benchmark = st.text_input("Benchmark", value="SPY", key="risk_benchmark").upper()
+    with col2:
+        confidence = st.select_slider("VaR Confidence", options=[0.90, 0.95, 0.99], value=0.95)
+    with col3:
+        window = st.slider("Lookback (days)", 20, 99, 60)
+
+    if st.button("📐 Compute Risk", use_container_width=True):
+        listed = resolve_symbol(symbols_df, benchmark) if benchmark else None
+        if listed is None:
+            st.error(f"Unknown symbol: {benchmark}")
+            return
+        benchmark = listed
+        with st.spinner("Computing risk metrics..."):
+            try:
+                service_url = get_service_url(SERVICE_NAME)
+                with track_service_call(SERVICE_NAME, service_url):
+                    res = requests.post(
+                        f"{service_url}/portfolio/risk",
+                        json={
+                            "positions": payload_positions,
+                            "benchmark": benchmark,
+                            "confidence": confidence,
+                            "window": window,
+                        },
+                    )
+                if res.status_code == 200:
+                    st.session_state['portfolio_risk'] = res.json()
+                else:
+                    st.error(f"Error from portfolio service: {res.status_code} - {res.text}")
+            except Exception as e:
+                st.error(f"Error contacting portfolio service: {e}")
+
+    risk = st.session_state.get('portfolio_risk')
+    if not risk:
+        return
+
+    confidence_label = f"{risk['confidence'] * 100:.0f}%"
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Annualized Volatility", format_percentage(risk['annualized_volatility'] * 100))
+        st.metric(f"Beta vs {risk['benchmark']}", f"{risk['beta']:.2f}")
+    with col2:
+        st.metric(f"1-Day VaR ({confidence_label}, historical)", format_percentage(risk['historical_var'] * 100))
+        st.metric(f"1-Day CVaR ({confidence_label}, historical)", format_percentage(risk['historical_cvar'] * 100))
+    with col3:
+        st.metric(f"1-Day VaR ({confidence_label}, parametric)", format_percentage(risk['parametric_var'] * 100))
+        st.metric("Max Drawdown", format_percentage(risk['max_drawdown'] * 100))
+
+    st.caption(
+        f"Based on {risk['observations']} daily returns. "
+        f"1-day VaR on {format_currency(risk['total_value'])}: "
+        f"{format_currency(risk['historical_var'] * risk['total_value'])}"
+    )
+
+
+@st.fragment
+def render_projection_panel(payload_positions: list):
+    """Render Monte Carlo projection with streamed progress."""
+    st.markdown("---")
+    st.subheader("🎲 Monte Carlo Projection")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        horizon = st.selectbox("Horizon", [63, 126, 252, 504], index=2,
+                               format_func=lambda d: f"{d} trading days")
+    with col2:
+        paths = st.selectbox("Paths", [10_000, 50_000, 200_000], format_func=lambda n: f"{n:,}")
+    with col3:
+        method = st.selectbox("Returns", ["bootstrap", "normal"])
+    with col4:
+        seed = st.number_input("Seed", min_value=0, value=42, step=1)
+
+    if st.button("▶️ Run Projection", use_container_width=True):
+        progress_bar = st.progress(0.0)
+        status_text = st.empty()
+        try:
+            service_url = get_service_url(SERVICE_NAME)
+            with track_service_call(SERVICE_NAME, service_url):
+                res = requests.post(
+                    f"{service_url}/portfolio/projection/stream",
+                    json={
+                        "positions": payload_positions,
+                        "horizon_days": horizon,
+                        "paths": paths,
+                        "method": method,
+                        "seed": int(seed),
+                    },
+                    stream=True,
+                )
+            if res.status_code != 200:
+                st.error(f"Error from portfolio service: {res.status_code} - {res.text}")
+                return
+
+            # Each line is a running result; the last one covers every path
+            for line in res.iter_lines():
+                if not line:
+                    continue
+                update = json.loads(line)
+                progress_bar.progress(update['completed_paths'] / update['total_paths'])
+                status_text.text(
+                    f"{update['completed_paths']:,} / {update['total_paths']:,} paths - "
+                    f"median {format_currency(update['percentiles']['50'])}"
+                )
+                st.session_state['portfolio_projection'] = update
+        except Exception as e:
+            st.error(f"Error contacting portfolio service: {e}")
+        finally:
+            progress_bar.empty()
+            status_text.empty()
+
+    projection = st.session_state.get('portfolio_projection')
+    if not projection:
+        return
+
+    initial_value = projection['initial_value']
+    bands = projection['percentiles']
+    cols = st.columns(len(bands))
+    for col, (pct, value) in zip(cols, bands.items()):
+        with col:
+            st.metric(
+                f"{pct}th percentile",
+                format_currency(value),
+                format_percentage((value / initial_value - 1) * 100)
+            )
+    st.caption(
+        f"{projection['completed_paths']:,} {projection['method']} paths over "
+        f"{projection['horizon_days']} trading days from {format_currency(initial_value)} "
+        f"(seed {projection['seed']})"
+    )
+
+
+@st.fragment
+def render_optimizer_panel(payload_positions: list, symbols_df: pd.DataFrame):
+    """Render efficient frontier and suggested rebalancing trades."""
+    st.markdown("---")
+    st.subheader("🧮 Efficient Frontier & Rebalancing")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        candidates = st.text_input(
+            "Additional symbols to consider",
+            key="optimizer_candidates",
+            placeholder="e.g. MSFT, JNJ"
+        )
+    with col2:
+        max_weight = st.slider("Max weight per symbol", 0.05, 1.0, 0.4, 0.05)
+
+    if st.button("🎯 Optimize", use_container_width=True):
+        resolved = resolve_symbols(symbols_df, [c.strip() for c in candidates.split(',')])
+        unknown = [symbol for symbol, listed in resolved.items() if listed is None]
+        if unknown:
+            st.error(f"Unknown symbol: {', '.join(unknown)}")
+            return
+        with st.spinner("Optimizing portfolio..."):
+            try:
+                service_url = get_service_url(SERVICE_NAME)
+                with track_service_call(SERVICE_NAME, service_url):
+                    res = requests.post(
+                        f"{service_url}/portfolio/optimize",
+                        json={
+                            "positions": payload_positions,
+                            "candidates": list(dict.fromkeys(resolved.values())),
+                            "max_weight": max_weight,
+                        },
+                    )
+                if res.status_code == 200:
+                    st.session_state['portfolio_optimization'] = res.json()
+                else:
+                    st.error(f"Error from portfolio service: {res.status_code} - {res.text}")
+            except Exception as e:
+                st.error(f"Error contacting portfolio service: {e}")
+
+    result = st.session_state.get('portfolio_optimization')
+    if not result:
+        return
+
+    frontier = result['frontier']
+    target = result['target']
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[p['volatility'] * 100 for p in frontier],
+        y=[p['expected_return'] * 100 for p in frontier],
+        mode='lines+markers',
+        name='Efficient Frontier'
+    ))
+    fig.add_trace(go.Scatter(
+        x=[target['volatility'] * 100],
+        y=[target['expected_return'] * 100],
+        mode='markers',
+        marker=dict(size=14, symbol='star'),
+        name='Max Sharpe'
+    ))
+    fig.update_layout(
+        title="Efficient Frontier (annualized)",
+        xaxis_title="Volatility (%)",
+        yaxis_title="Expected Return (%)",
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    rebalance = [
+        {
+            'Symbol': symbol,
+            'Current Weight': format_percentage(result['current_weights'][symbol] * 100),
+            'Target Weight': format_percentage(weight * 100),
+            'Shares to Trade': result['trades'][symbol],
+        }
+        for symbol, weight in target['weights'].items()
+    ]
+    st.dataframe(pd.DataFrame(rebalance), use_container_width=True)
@@ -11,12 +11,18 @@ import json
 import os
 from components.stock_input import stock_input_with_suggestions
 from components.metrics import display_company_header, display_key_metrics
-from utils.service_discovery import get_service_url  # Importing the service discovery utility
+from data.service_cache import service_cache
+from data.session_payloads import SessionPayloads
+from data.symbol_loader import resolve_symbol
+from utils.service_discovery import get_service_url, tracked_call  # Importing the service discovery utility
 
 
 
 SERVICE_NAME = "Stock_Analysis_Service"
 
+# Trading days shown for each chart range
+CHART_RANGES = {"1M": 21, "3M": 63, "6M": 126, "1Y": 252, "All": None}
+
 def render(symbols_df: pd.DataFrame):
     """Render Stock Analysis Report page."""
     st.title("📊 Stock Analysis Report")
@@ -32,18 +38,26 @@ def render(symbols_df: pd.DataFrame):
         )
 
         if st.button("🔍 Analyze Stock", use_container_width=True):
-            if symbol:
+            listed = resolve_symbol(symbols_df, symbol) if symbol else None
+            if symbol and listed is None:
+                # Rejected here rather than spending an API call on it
+                st.error(f"Unknown symbol: {symbol}")
+            elif symbol:
+                symbol = listed
                 with st.spinner(f"Analyzing {symbol}..."):
                     try:
                         service_url = get_service_url(SERVICE_NAME)
-                        res = requests.get(f"{service_url}/analysis/{symbol}")
+                        res = service_cache.fetch(
+                            "analysis", symbol,
+                            tracked_call(SERVICE_NAME, service_url, lambda: requests.get(f"{service_url}/analysis/{symbol}"))
+                        )
                         if res.status_code == 200:
                             data = res.json()
-                            st.session_state['analysis_data'] = {
+                            SessionPayloads(st.session_state).put('analysis_data', {
                                 'overview': data['overview'],
                                 'daily': data['daily'],
                                 'symbol': data['symbol'],
-                            }
+                            })
                             st.success(f"✅ Analysis complete for {symbol}")
                         else:
                             st.error(f"Failed to analyze {symbol}: {res.text}")
@@ -53,10 +67,9 @@ def render(symbols_df: pd.DataFrame):
                 st.warning("Please enter a stock symbol.")
 
     with col2:
-        if 'analysis_data' in st.session_state:
-            data = st.session_state['analysis_data']
+        data = SessionPayloads(st.session_state).get('analysis_data')
+        if data is not None:
             overview = data['overview']
-            daily = data['daily']
 
             # Display company info
             display_company_header(overview)
@@ -64,51 +77,57 @@ def render(symbols_df: pd.DataFrame):
             # Display key metrics
             display_key_metrics(overview)
 
-            # Price chart
-            if 'Time Series (Daily)' in daily:
-                df = pd.DataFrame(daily['Time Series (Daily)']).T
-                df.index = pd.to_datetime(df.index)
-                df = df.astype(float)
-                df = df.sort_index()
-                df = df.tail(50)  # Last 50 days
-
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=df.index,
-                    y=df['4. close'],
-                    mode='lines',
-                    name='Close Price',
-                    line=dict(color='blue', width=2)
-                ))
-
-                fig.update_layout(
-                    title=f"{data['symbol']} Stock Price (Last 50 Days)",
-                    xaxis_title="Date",
-                    yaxis_title="Price ($)",
-                    height=400
-                )
-
-                st.plotly_chart(fig, use_container_width=True)
-
-                # Additional metrics
-                latest_price = df.iloc[-1]['4. close']
-                price_change = df.iloc[-1]['4. close'] - df.iloc[0]['4. close']
-                price_change_pct = (price_change / df.iloc[0]['4. close']) * 100
-
-                col3, col4, col5 = st.columns(3)
-                with col3:
-                    st.metric("Latest Price", f"${latest_price:.2f}")
-                with col4:
-                    st.metric("50-Day Change", f"${price_change:.2f}", f"{price_change_pct:.2f}%")
-                with col5:
-                    high_52w = overview.get('52WeekHigh', 'N/A')
-                    low_52w = overview.get('52WeekLow', 'N/A')
-                    st.metric("52W High", high_52w)
-                    st.metric("52W Low", low_52w)
-            else:
-                st.info("No daily price data available.")
+            # Price chart reruns on its own when the range changes
+            render_price_chart(data)
         else:
             st.info("Enter a stock symbol and click 'Analyze Stock' to begin.")
 
 
-
+@st.fragment
+def render_price_chart(data: dict):
+    """Render the price chart and range metrics; the range selector reruns only this."""
+    overview = data['overview']
+    dates, closes = data.get('dates'), data.get('closes')
+
+    if closes is None or not len(closes):
+        st.info("No daily price data available.")
+        return
+
+    range_label = st.radio("Range", list(CHART_RANGES), index=0, horizontal=True, key="chart_range")
+    days = CHART_RANGES[range_label]
+    if days:
+        dates, closes = dates[-days:], closes[-days:]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=dates.astype('datetime64[D]'),
+        y=closes,
+        mode='lines',
+        name='Close Price',
+        line=dict(color='blue', width=2)
+    ))
+
+    fig.update_layout(
+        title=f"{data['symbol']} Stock Price ({range_label})",
+        xaxis_title="Date",
+        yaxis_title="Price ($)",
+        height=400
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Additional metrics
+    latest_price = float(closes[-1])
+    price_change = latest_price - float(closes[0])
+    price_change_pct = (price_change / float(closes[0])) * 100
+
+    col3, col4, col5 = st.columns(3)
+    with col3:
+        st.metric("Latest Price", f"${latest_price:.2f}")
+    with col4:
+        st.metric(f"{range_label} Change", f"${price_change:.2f}", f"{price_change_pct:.2f}%")
+    with col5:
+        high_52w = overview.get('52WeekHigh', 'N/A')
+        low_52w = overview.get('52WeekLow', 'N/A')
+        st.metric("52W High", high_52w)
+        st.metric("52W Low", low_52w)
@@ -0,0 +1,77 @@
+"""
+Symbol Browser Page
+Screen the symbol universe by exchange, ETF flag and listing details
+"""
+
+import streamlit as st
+import pandas as pd
+from data.symbol_filters import FILTER_LABELS, value_label
+from data.symbol_loader import browse_symbols, get_filter_options
+
+# Rows shown per screen
+BROWSE_LIMIT = 200
+
+
+def render(symbols_df: pd.DataFrame):
+    """Render Symbol Browser page."""
+    st.title("🔎 Symbol Browser")
+
+    try:
+        options = get_filter_options(symbols_df)
+    except Exception as e:
+        st.error(f"Error contacting symbol service: {e}")
+        return
+
+    if not options:
+        st.info("The symbols database is not available.")
+        return
+
+    col1, col2 = st.columns([1, 3])
+
+    with col1:
+        st.subheader("Filters")
+        filters = {}
+        for name, values in options.items():
+            chosen = st.multiselect(
+                FILTER_LABELS.get(name, name),
+                values,
+                format_func=lambda value, name=name: value_label(name, value),
+                key=f"browse_{name}"
+            )
+            if chosen:
+                filters[name] = chosen
+
+    with col2:
+        query = st.text_input(
+            "Search",
+            key="browse_query",
+            placeholder="Type symbol or company name..."
+        )
+        render_symbol_table(symbols_df, filters, query)
+
+
+def render_symbol_table(symbols_df: pd.DataFrame, filters: dict, query: str):
+    """Render the symbols matching the filters."""
+    try:
+        total, symbols = browse_symbols(symbols_df, filters, query, BROWSE_LIMIT)
+    except Exception as e:
+        st.error(f"Error contacting symbol service: {e}")
+        return
+
+    if not symbols:
+        st.info("No symbols match these filters.")
+        return
+
+    if query.strip():
+        st.caption(f"Top {len(symbols)} matches for '{query.strip()}'")
+    elif total > len(symbols):
+        st.caption(f"{total:,} symbols match; showing the first {len(symbols)}")
+    else:
+        st.caption(f"{total:,} symbols match")
+
+    rows = [text.split(' - ', 1) for text in symbols]
+    table = pd.DataFrame(
+        [(row[0], row[1] if len(row) > 1 else '') for row in rows],
+        columns=['Symbol', 'Security Name']
+    )
+    st.dataframe(table, hide_index=True, use_container_width=True)
@@ -1,8 +1,11 @@
+import os
+import socket
 from typing import Optional
 import requests
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
 from data.api_client import APIClient
+from data.symbol_aliases import is_unknown_symbol
 
 app = FastAPI(title="Earnings Service")
 api_client = APIClient()
@@ -10,8 +13,9 @@ api_client = APIClient()
 SERVICE_REGISTRY_URL = "http://service_registry:8010"
 # Service details
 SERVICE_NAME = "Earnings_Service"
-SERVICE_HOST = "earnings_service"  # Service container name
+SERVICE_HOST = os.environ.get("SERVICE_HOST", socket.gethostname())  # This replica's container hostname
 SERVICE_PORT = 8001
+SERVICE_ID = f"{SERVICE_NAME}-{SERVICE_HOST}"  # One registration per replica
 
 
 
@@ -28,6 +32,9 @@ class TranscriptResponse(BaseModel):
 
 @app.get("/earnings/{symbol}", response_model=EarningsResponse)
 def get_earnings(symbol: str):
+    # Unlisted symbols never reach the API quota
+    if is_unknown_symbol(symbol):
+        raise HTTPException(status_code=404, detail=f"Unknown symbol {symbol}")
 
     try:
         earnings_data = api_client.get_earnings(symbol)
@@ -45,6 +52,8 @@ def get_transcript(
     symbol: str,
     quarter: str = Query(..., description="Quarter identifier, e.g. '2024-Q2'")
 ):
+    if is_unknown_symbol(symbol):
+        raise HTTPException(status_code=404, detail=f"Unknown symbol {symbol}")
 
     try:
         transcript_data = api_client.get_earnings_transcript(symbol, quarter)
@@ -63,7 +72,8 @@ def get_transcript(
 def register_service_with_registry():
     payload = {
         "service_name": SERVICE_NAME,
-        "service_url": SERVICE_HOST,  # Service URL (container name)
+        "service_id": SERVICE_ID,
+        "service_url": SERVICE_HOST,  # Service URL (container hostname)
         "port": SERVICE_PORT,
     }
     try:
@@ -78,7 +88,7 @@ def register_service_with_registry():
 # Deregister the service from the Service Registry
 def deregister_service_from_registry():
     try:
-        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_NAME}")
+        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_ID}")
         if response.status_code == 200:
             print(f"Service {SERVICE_NAME} deregistered from Service Registry.")
         else:
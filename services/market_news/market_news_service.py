@@ -1,8 +1,11 @@
+import os
+import socket
 import requests
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
 from data.api_client import APIClient
+from data.symbol_aliases import is_unknown_symbol
 
 app = FastAPI(title="Market News Service")
 api_client = APIClient()
@@ -11,8 +14,9 @@ api_client = APIClient()
 SERVICE_REGISTRY_URL = "http://service_registry:8010"
 # Service details
 SERVICE_NAME = "Market_News_Service"
-SERVICE_HOST = "market_news_service"  # Service container name
+SERVICE_HOST = os.environ.get("SERVICE_HOST", socket.gethostname())  # This replica's container hostname
 SERVICE_PORT = 8002
+SERVICE_ID = f"{SERVICE_NAME}-{SERVICE_HOST}"  # One registration per replica
 
 class NewsResponse(BaseModel):
     mode: str
@@ -52,6 +56,9 @@ def get_news(
     elif mode == "ticker":
         if not ticker:
             raise HTTPException(400, "ticker is required when mode='ticker'")
+        # Unlisted symbols never reach the API quota
+        if is_unknown_symbol(ticker):
+            raise HTTPException(404, f"Unknown symbol {ticker}")
 
         # From your real code:
         news_data = api_client.get_news_sentiment(
@@ -82,7 +89,8 @@ def get_news(
 def register_service_with_registry():
     payload = {
         "service_name": SERVICE_NAME,
-        "service_url": SERVICE_HOST,  # Service URL (container name)
+        "service_id": SERVICE_ID,
+        "service_url": SERVICE_HOST,  # Service URL (container hostname)
         "port": SERVICE_PORT,
     }
     try:
@@ -97,7 +105,7 @@ def register_service_with_registry():
 # Deregister the service from the Service Registry
 def deregister_service_from_registry():
     try:
-        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_NAME}")
+        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_ID}")
         if response.status_code == 200:
             print(f"Service {SERVICE_NAME} deregistered from Service Registry.")
         else:
@@ -1,21 +1,47 @@
 # services/portfolio/portfolio_service.py
 
-from typing import List, Optional
+import json
+import os
+import socket
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+import numpy as np
 import requests
 from pydantic import BaseModel
 from data.api_client import APIClient
+from data.rate_limiter import DEFAULT_REQUESTS_PER_MINUTE, RateLimiter
+from data.symbol_aliases import is_unknown_symbol
+from services.portfolio.price_history import PriceHistoryCache, ReturnMatrix, ReturnMatrixCache
+from services.portfolio.optimizer import efficient_frontier
+from services.portfolio.projection import METHODS, iter_projection
+from services.portfolio.risk import compute_risk_metrics
+from services.portfolio.quote_board import QuoteBoard
+from services.portfolio.valuation import fetch_quotes, value_positions
 
 app = FastAPI(title="Portfolio Service")
-api_client = APIClient()
+# One request budget for every endpoint and the quote board sweeps
+api_client = APIClient(rate_limiter=RateLimiter(DEFAULT_REQUESTS_PER_MINUTE))
+
+# Daily bars and covariance matrices shared by every analytics endpoint
+price_history = PriceHistoryCache(api_client)
+return_matrices = ReturnMatrixCache(price_history)
+
+# Latest quotes for every watched symbol, refreshed in one sweep per interval.
+# A sweep (one a minute) takes at most 60% of the request budget; the rest is left for interactive calls
+QUOTE_SWEEP_BUDGET = max(1, int(DEFAULT_REQUESTS_PER_MINUTE * 0.6))
+quote_board = QuoteBoard(lambda symbols: fetch_quotes(api_client, symbols), max_per_sweep=QUOTE_SWEEP_BUDGET)
 
 # URL of our the Service Registry
 SERVICE_REGISTRY_URL = "http://service_registry:8010"
 # Service details
 SERVICE_NAME = "Portfolio_Service"
-SERVICE_HOST = "portfolio_service"  # Service container name
+SERVICE_HOST = os.environ.get("SERVICE_HOST", socket.gethostname())  # This replica's container hostname
 SERVICE_PORT = 8003
+SERVICE_ID = f"{SERVICE_NAME}-{SERVICE_HOST}"  # One registration per replica
+
+MAX_PROJECTION_PATHS = 1_000_000
 
 
 class Position(BaseModel):
@@ -46,6 +72,100 @@ class PortfolioResponse(BaseModel):
     summary: PortfolioSummary
 
 
+class RiskRequest(BaseModel):
+    positions: List[Position]
+    benchmark: str = "SPY"
+    confidence: float = 0.95
+    window: int = 60
+
+
+class RiskResponse(BaseModel):
+    benchmark: str
+    confidence: float
+    observations: int
+    total_value: float
+    weights: Dict[str, float]
+    annualized_volatility: float
+    beta: float
+    historical_var: float
+    historical_cvar: float
+    parametric_var: float
+    parametric_cvar: float
+    max_drawdown: float
+
+
+class ProjectionRequest(BaseModel):
+    positions: List[Position]
+    horizon_days: int = 252
+    paths: int = 10_000
+    method: str = "bootstrap"
+    seed: Optional[int] = None
+    window: int = 99
+
+
+class ProjectionResponse(BaseModel):
+    initial_value: float
+    horizon_days: int
+    method: str
+    seed: int
+    completed_paths: int
+    total_paths: int
+    percentiles: Dict[str, float]
+
+
+class OptimizeRequest(BaseModel):
+    positions: List[Position]
+    candidates: List[str] = []
+    window: int = 99
+    max_weight: float = 0.4
+    points: int = 20
+    risk_free_rate: float = 0.0
+
+
+class FrontierPoint(BaseModel):
+    expected_return: float
+    volatility: float
+    sharpe: float
+    weights: Dict[str, float]
+
+
+class WatchlistRequest(BaseModel):
+    symbols: List[str]
+
+
+class WatchlistQuote(BaseModel):
+    price: float
+    day_change_percent: float
+    as_of: str
+
+
+class WatchlistResponse(BaseModel):
+    quotes: Dict[str, WatchlistQuote]
+    updated_at: Optional[str]
+    pending: List[str]
+    unknown: List[str] = []
+
+
+class QuoteStreamRequest(BaseModel):
+    symbols: List[str] = []
+    positions: List[Position] = []
+    heartbeat: float = 15.0
+
+
+class OptimizeResponse(BaseModel):
+    frontier: List[FrontierPoint]
+    target: FrontierPoint
+    current_weights: Dict[str, float]
+    trades: Dict[str, float]
+
+
+def reject_unknown_symbols(symbols: Iterable[str]):
+    """404 for unlisted symbols, before any of them reaches the API quota."""
+    unknown = sorted({s.upper() for s in symbols if is_unknown_symbol(s)})
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown symbol(s) {', '.join(unknown)}")
+
+
 @app.post("/portfolio/calculate", response_model=PortfolioResponse)
 def calculate_portfolio(positions: List[Position]):
     """
@@ -54,78 +174,252 @@ def calculate_portfolio(positions: List[Position]):
     """
     if not positions:
         raise HTTPException(status_code=400, detail="No positions provided")
+    reject_unknown_symbols(pos.symbol for pos in positions)
 
-    enriched_positions: List[EnrichedPosition] = []
-    total_value = 0.0
-    total_cost = 0.0
+    # One quote per distinct symbol, however many lots share it
+    quotes = fetch_quotes(api_client, [pos.symbol for pos in positions])
+    enriched, summary = value_positions([pos.dict() for pos in positions], quotes)
 
-    for pos in positions:
-        try:
-            # Fetch the quote for the current symbol
-            quote_data = api_client.get_quote(pos.symbol)
-
-            if not quote_data or "Global Quote" not in quote_data or not quote_data["Global Quote"]:
-                # Log the failure for the symbol and skip the current position
-                print(f"Skipping {pos.symbol}: No valid quote data available.")
-                continue  # Skip to the next position
-
-            # Extract quote data
-            quote = quote_data["Global Quote"]
-            current_price = float(quote["05. price"])
-            # "10. change percent" is like "1.23%"
-            change_percent_str = quote.get("10. change percent", "0%").replace("%", "")
-            day_change_percent = float(change_percent_str)
-
-            # Calculate the values for the position
-            current_value = current_price * pos.shares
-            cost_basis = pos.purchase_price * pos.shares
-            gain_loss = current_value - cost_basis
-            gain_loss_percent = (gain_loss / cost_basis * 100) if cost_basis != 0 else 0.0
-
-            # Add to the totals
-            total_value += current_value
-            total_cost += cost_basis
-
-            # Append the enriched position to the list
-            enriched_positions.append(
-                EnrichedPosition(
-                    symbol=pos.symbol,
-                    shares=pos.shares,
-                    purchase_price=pos.purchase_price,
-                    date_added=pos.date_added,
-                    current_price=current_price,
-                    current_value=current_value,
-                    cost_basis=cost_basis,
-                    gain_loss=gain_loss,
-                    gain_loss_percent=gain_loss_percent,
-                    day_change_percent=day_change_percent,
-                )
-            )
-        except Exception as e:
-            # Log the exception and continue with the next position
-            print(f"Error processing {pos.symbol}: {e}")
-            continue
-
-    total_gain_loss = total_value - total_cost
-    total_gain_loss_percent = (
-        total_gain_loss / total_cost * 100 if total_cost != 0 else 0.0
+    return PortfolioResponse(
+        positions=[EnrichedPosition(**position) for position in enriched],
+        summary=PortfolioSummary(**summary),
     )
 
-    summary = PortfolioSummary(
+
+def aggregate_shares(positions: List[Position]) -> Dict[str, float]:
+    """Total shares per symbol, sorted by symbol."""
+    shares: Dict[str, float] = {}
+    for pos in positions:
+        symbol = pos.symbol.upper()
+        shares[symbol] = shares.get(symbol, 0.0) + pos.shares
+    return dict(sorted(shares.items()))
+
+
+def load_holdings(positions: List[Position], window: int,
+                  extra_symbols: Tuple[str, ...] = ()) -> Tuple[ReturnMatrix, List[str], np.ndarray]:
+    """
+    Cached return matrix and latest market values for the holdings.
+    Holdings come first in the matrix, followed by any extra symbols.
+    """
+    if not positions:
+        raise HTTPException(status_code=400, detail="No positions provided")
+    if window < 5:
+        raise HTTPException(status_code=400, detail="window must be at least 5 days")
+    reject_unknown_symbols([pos.symbol for pos in positions] + list(extra_symbols))
+
+    shares = aggregate_shares(positions)
+    symbols = list(shares)
+    matrix_symbols = symbols + [s for s in extra_symbols if s not in shares]
+
+    try:
+        matrix = return_matrices.get(matrix_symbols, window)
+    except LookupError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    values = np.array([shares[s] * price_history.get(s).last_close for s in symbols])
+    if values.sum() <= 0:
+        raise HTTPException(status_code=400, detail="Portfolio has no market value")
+    return matrix, symbols, values
+
+
+@app.post("/portfolio/risk", response_model=RiskResponse)
+def portfolio_risk(request: RiskRequest):
+    """
+    Risk metrics for the holdings, weighted by their latest close.
+    The return covariance matrix is cached, so reruns with new share counts
+    only recompute the weighted metrics.
+    """
+    if not 0.5 <= request.confidence < 1.0:
+        raise HTTPException(status_code=400, detail="confidence must be in [0.5, 1)")
+
+    benchmark = request.benchmark.upper()
+    matrix, symbols, values = load_holdings(request.positions, request.window, (benchmark,))
+    total_value = float(values.sum())
+    weights = values / total_value
+
+    metrics = compute_risk_metrics(matrix, weights, matrix.index_of(benchmark), request.confidence)
+
+    return RiskResponse(
+        benchmark=benchmark,
+        confidence=request.confidence,
+        observations=matrix.observations,
         total_value=total_value,
-        total_cost=total_cost,
-        total_gain_loss=total_gain_loss,
-        total_gain_loss_percent=total_gain_loss_percent,
+        weights={s: float(w) for s, w in zip(symbols, weights)},
+        **metrics,
+    )
+
+
+def run_projection(request: ProjectionRequest):
+    """Validate a projection request and return its progress iterator."""
+    if request.method not in METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of {', '.join(METHODS)}")
+    if not 1 <= request.paths <= MAX_PROJECTION_PATHS:
+        raise HTTPException(status_code=400, detail=f"paths must be between 1 and {MAX_PROJECTION_PATHS}")
+    if not 1 <= request.horizon_days <= 2520:
+        raise HTTPException(status_code=400, detail="horizon_days must be between 1 and 2520")
+
+    matrix, symbols, values = load_holdings(request.positions, request.window)
+    return iter_projection(
+        matrix.returns,
+        values,
+        horizon=request.horizon_days,
+        n_paths=request.paths,
+        method=request.method,
+        seed=request.seed,
+    ), float(values.sum())
+
+
+@app.post("/portfolio/projection", response_model=ProjectionResponse)
+def portfolio_projection(request: ProjectionRequest):
+    """Monte Carlo percentile bands of terminal portfolio value."""
+    progress, initial_value = run_projection(request)
+    for update in progress:
+        pass
+
+    return ProjectionResponse(
+        initial_value=initial_value,
+        horizon_days=request.horizon_days,
+        method=request.method,
+        **update,
+    )
+
+
+@app.post("/portfolio/projection/stream")
+def portfolio_projection_stream(request: ProjectionRequest):
+    """
+    Same simulation as /portfolio/projection, streamed as newline-delimited
+    JSON so the UI can show running percentiles while blocks complete.
+    """
+    progress, initial_value = run_projection(request)
+
+    def events():
+        for update in progress:
+            yield json.dumps(ProjectionResponse(
+                initial_value=initial_value,
+                horizon_days=request.horizon_days,
+                method=request.method,
+                **update,
+            ).dict()) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.post("/portfolio/optimize", response_model=OptimizeResponse)
+def optimize_portfolio(request: OptimizeRequest):
+    """
+    Long-only efficient frontier over the holdings plus any candidate symbols.
+    The target is the maximum-Sharpe frontier point; trades are the share
+    changes needed to reach it at the latest close.
+    """
+    if not 2 <= request.points <= 100:
+        raise HTTPException(status_code=400, detail="points must be between 2 and 100")
+
+    candidates = tuple(s.upper() for s in request.candidates)
+    matrix, holdings, values = load_holdings(request.positions, request.window, candidates)
+    symbols = list(matrix.symbols)
+    if request.max_weight <= 0 or request.max_weight * len(symbols) < 1.0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"max_weight must allow full investment across {len(symbols)} symbols",
+        )
+
+    frontier = efficient_frontier(
+        matrix.cov,
+        matrix.mean,
+        min(request.max_weight, 1.0),
+        request.points,
+        matrix.max_eigenvalue,
+        request.risk_free_rate,
     )
+    points = [
+        FrontierPoint(
+            expected_return=p['expected_return'],
+            volatility=p['volatility'],
+            sharpe=p['sharpe'],
+            weights={s: float(w) for s, w in zip(symbols, p['weights'])},
+        )
+        for p in frontier
+    ]
+    target = max(points, key=lambda p: p.sharpe)
+
+    total_value = float(values.sum())
+    current_values = dict(zip(holdings, values))
+    trades = {}
+    for symbol in symbols:
+        price = price_history.get(symbol).last_close
+        delta = (target.weights[symbol] * total_value - current_values.get(symbol, 0.0)) / price
+        trades[symbol] = round(delta, 4)
+
+    return OptimizeResponse(
+        frontier=points,
+        target=target,
+        current_weights={s: current_values.get(s, 0.0) / total_value for s in symbols},
+        trades=trades,
+    )
+
+
+@app.post("/watchlist/quotes", response_model=WatchlistResponse)
+def watchlist_quotes(request: WatchlistRequest):
+    """
+    Latest quotes for a watchlist, served from the shared quote board.
+    Symbols no session has watched before are fetched on the spot; unlisted
+    ones are returned as unknown and never polled.
+    """
+    symbols = sorted({s.strip().upper() for s in request.symbols if s.strip()})
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+    unknown = [s for s in symbols if is_unknown_symbol(s)]
+    symbols = [s for s in symbols if s not in unknown]
+
+    quote_board.watch(symbols)
+    quote_board.ensure(symbols)
+    return WatchlistResponse(**quote_board.snapshot(symbols), unknown=unknown)
+
+
+@app.post("/portfolio/stream")
+def portfolio_quote_stream(request: QuoteStreamRequest):
+    """
+    Server-Sent Events with quote and valuation deltas.
+
+    Sends a `quote` event per symbol whose price changed and, when positions
+    are given, a `summary` event with the new totals. Comment lines keep the
+    connection alive between sweeps.
+    """
+    holdings: Dict[str, Dict[str, float]] = {}
+    for pos in request.positions:
+        holding = holdings.setdefault(pos.symbol.upper(), {'shares': 0.0, 'cost': 0.0})
+        holding['shares'] += pos.shares
+        holding['cost'] += pos.shares * pos.purchase_price
+
+    symbols = sorted({s.strip().upper() for s in request.symbols if s.strip()} | set(holdings))
+    symbols = [s for s in symbols if not is_unknown_symbol(s)]
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+    heartbeat = min(max(request.heartbeat, 1.0), 60.0)
+
+    quote_board.watch(symbols)
+    quote_board.ensure(symbols)
+
+    # Async, so an open stream waits on the event loop instead of holding a threadpool worker
+    async def events():
+        async for kind, payload in quote_board.aiter_updates(symbols, holdings, heartbeat):
+            if kind == 'heartbeat':
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {kind}\ndata: {json.dumps(payload)}\n\n"
 
-    return PortfolioResponse(positions=enriched_positions, summary=summary)
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
 
 # Register the service with the Service Registry
 def register_service_with_registry():
     payload = {
         "service_name": SERVICE_NAME,
-        "service_url": SERVICE_HOST,  # Service URL (container name)
+        "service_id": SERVICE_ID,
+        "service_url": SERVICE_HOST,  # Service URL (container hostname)
         "port": SERVICE_PORT,
     }
     try:
@@ -140,7 +434,7 @@ def register_service_with_registry():
 # Deregister the service from the Service Registry
 def deregister_service_from_registry():
     try:
-        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_NAME}")
+        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_ID}")
         if response.status_code == 200:
             print(f"Service {SERVICE_NAME} deregistered from Service Registry.")
         else:
@@ -153,11 +447,13 @@ def deregister_service_from_registry():
 async def startup_event():
     # Register the service with the Service Registry during startup
     register_service_with_registry()
+    quote_board.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     # Deregister the service from the Service Registry during shutdown
     deregister_service_from_registry()
+    quote_board.stop()
 
 @app.get("/")
 def read_root():
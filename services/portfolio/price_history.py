@@ -0,0 +1,175 @@
+"""
+Price History Cache
+Shared daily close history and return covariance matrices for the portfolio service
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from data.price_series import parse_daily_closes
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class PriceHistory:
+    """Daily closes for one symbol, dates as int64 epoch days."""
+
+    def __init__(self, symbol: str, dates: np.ndarray, closes: np.ndarray):
+        self.symbol = symbol
+        self.dates = dates
+        self.closes = closes
+
+    @property
+    def last_bar(self) -> int:
+        """Epoch day of the most recent bar."""
+        return int(self.dates[-1])
+
+    @property
+    def last_close(self) -> float:
+        """Most recent closing price."""
+        return float(self.closes[-1])
+
+
+class PriceHistoryCache:
+    """
+    Per-symbol daily history, refetched at most once per TTL.
+
+    A refetch that brings no new bar keeps the previous PriceHistory object,
+    so matrices built from it stay valid.
+    """
+
+    def __init__(self, api_client, ttl_seconds: float = 900.0):
+        self.api_client = api_client
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, PriceHistory]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> Optional[PriceHistory]:
+        """Get the cached history for a symbol, fetching it when stale."""
+        symbol = symbol.upper()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry and now - entry[0] < self.ttl_seconds:
+            return entry[1]
+
+        parsed = parse_daily_closes(self.api_client.get_daily_prices(symbol))
+        if parsed is None:
+            # Keep serving the old bars if the refresh failed
+            return entry[1] if entry else None
+
+        history = PriceHistory(symbol, *parsed)
+        if entry and entry[1].last_bar == history.last_bar:
+            history = entry[1]
+
+        with self._lock:
+            self._entries[symbol] = (now, history)
+        return history
+
+    def clear(self):
+        """Drop all cached histories."""
+        with self._lock:
+            self._entries.clear()
+
+
+class ReturnMatrix:
+    """Aligned daily returns with their mean vector and covariance matrix."""
+
+    def __init__(self, symbols: Tuple[str, ...], returns: np.ndarray, signature: Tuple[int, ...]):
+        self.symbols = symbols
+        self.returns = returns
+        self.signature = signature
+        self.mean = returns.mean(axis=0)
+        self.cov = np.atleast_2d(np.cov(returns, rowvar=False))
+        self._positions = {s: i for i, s in enumerate(symbols)}
+        self._max_eigenvalue: Optional[float] = None
+
+    @property
+    def observations(self) -> int:
+        """Number of aligned return observations."""
+        return self.returns.shape[0]
+
+    @property
+    def max_eigenvalue(self) -> float:
+        """Largest covariance eigenvalue, computed once per matrix."""
+        if self._max_eigenvalue is None:
+            self._max_eigenvalue = max(float(np.linalg.eigvalsh(self.cov)[-1]), 1e-12)
+        return self._max_eigenvalue
+
+    def index_of(self, symbol: str) -> int:
+        """Column index of a symbol."""
+        return self._positions[symbol]
+
+
+class ReturnMatrixCache:
+    """
+    Return matrices keyed by (symbols, window).
+
+    A cached matrix is reused until one of its symbols gets a new bar, so
+    callers that only change weights never pay for the covariance again.
+    """
+
+    def __init__(self, history_cache: PriceHistoryCache, max_entries: int = 64):
+        self.history_cache = history_cache
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[Tuple[str, ...], int], ReturnMatrix] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, symbols: Sequence[str], window: int) -> ReturnMatrix:
+        """
+        Get the return matrix for the symbols over the last `window` returns.
+
+        Raises LookupError when a symbol has no price history and ValueError
+        when the aligned history is too short.
+        """
+        key_symbols = tuple(s.upper() for s in symbols)
+        histories: List[PriceHistory] = []
+        missing = []
+        for symbol in key_symbols:
+            history = self.history_cache.get(symbol)
+            if history is None:
+                missing.append(symbol)
+            else:
+                histories.append(history)
+        if missing:
+            raise LookupError(f"No price history for {', '.join(missing)}")
+
+        signature = tuple(h.last_bar for h in histories)
+        key = (key_symbols, window)
+
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        matrix = ReturnMatrix(key_symbols, align_returns(histories, window), signature)
+
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so this drops the oldest build
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = matrix
+            self.builds += 1
+        return matrix
+
+
+def align_returns(histories: Sequence[PriceHistory], window: int) -> np.ndarray:
+    """Simple daily returns over the dates shared by every history."""
+    common = histories[0].dates
+    for history in histories[1:]:
+        common = np.intersect1d(common, history.dates, assume_unique=True)
+    common = common[-(window + 1):]
+
+    if len(common) < 3:
+        raise ValueError("Not enough overlapping price history")
+
+    prices = np.column_stack([
+        h.closes[np.searchsorted(h.dates, common)] for h in histories
+    ])
+    return prices[1:] / prices[:-1] - 1.0
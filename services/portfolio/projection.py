@@ -0,0 +1,140 @@
+"""
+Monte Carlo Portfolio Projection
+Simulates terminal portfolio values from cached return history
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+BLOCK_SIZE = 5_000
+# Partial percentiles are streamed at most this many times per run
+MAX_PROGRESS_UPDATES = 20
+# Below this many paths the pool start-up and pickling cost more than they save
+PROCESS_POOL_MIN_PATHS = 50_000
+
+METHODS = ('bootstrap', 'normal')
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Shared process pool, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def cholesky_factor(cov: np.ndarray) -> np.ndarray:
+    """Cholesky factor of a covariance matrix, jittered if it is not positive definite."""
+    jitter = 0.0
+    scale = float(np.mean(np.diag(cov))) or 1.0
+    for _ in range(6):
+        try:
+            return np.linalg.cholesky(cov + jitter * np.eye(len(cov)))
+        except np.linalg.LinAlgError:
+            jitter = scale * 1e-10 if jitter == 0.0 else jitter * 100
+    # Fall back to the eigen-decomposition with negative eigenvalues clipped
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    return eigvecs * np.sqrt(np.clip(eigvals, 0.0, None))
+
+
+def simulate_block(returns: np.ndarray, mean: np.ndarray, factor: Optional[np.ndarray],
+                   values: np.ndarray, horizon: int, size: int,
+                   seed: np.random.SeedSequence, method: str) -> np.ndarray:
+    """
+    Simulate `size` buy-and-hold paths and return their terminal values.
+
+    Each step draws one return vector per path, either a bootstrapped
+    historical day (keeping cross-asset correlation) or a multivariate
+    normal draw.
+    """
+    rng = np.random.default_rng(seed)
+    growth = np.ones((size, len(values)))
+    for _ in range(horizon):
+        if method == 'bootstrap':
+            step = returns[rng.integers(0, len(returns), size=size)]
+        else:
+            step = mean + rng.standard_normal((size, len(values))) @ factor.T
+        growth *= 1.0 + step
+    return growth @ values
+
+
+def iter_projection(returns: np.ndarray, values: np.ndarray, horizon: int, n_paths: int,
+                    method: str = 'bootstrap', seed: Optional[int] = None,
+                    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                    block_size: int = BLOCK_SIZE,
+                    executor: Optional[ProcessPoolExecutor] = None) -> Iterator[Dict]:
+    """
+    Run the simulation block by block, yielding running percentiles.
+
+    Every block gets its own child of the seed sequence, so the final result
+    depends only on the seed, not on how blocks are spread over workers.
+    Large runs go to the shared process pool unless an executor is given.
+    At most MAX_PROGRESS_UPDATES updates are yielded; the last covers every path.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}")
+
+    seed_sequence = np.random.SeedSequence(seed)
+    block_sizes = [block_size] * (n_paths // block_size)
+    if n_paths % block_size:
+        block_sizes.append(n_paths % block_size)
+    block_seeds = seed_sequence.spawn(len(block_sizes))
+
+    mean = returns.mean(axis=0)
+    factor = cholesky_factor(np.atleast_2d(np.cov(returns, rowvar=False))) if method == 'normal' else None
+    args = [(returns, mean, factor, values, horizon, size, block_seed, method)
+            for size, block_seed in zip(block_sizes, block_seeds)]
+
+    if executor is None and n_paths >= PROCESS_POOL_MIN_PATHS:
+        executor = get_executor()
+
+    futures = []
+    if executor is not None:
+        futures = [executor.submit(simulate_block, *a) for a in args]
+        blocks = (f.result() for f in futures)
+    else:
+        blocks = (simulate_block(*a) for a in args)
+
+    try:
+        yield from _collect_percentiles(blocks, len(args), n_paths, seed_sequence, percentiles)
+    finally:
+        # Stop queued blocks if the consumer went away early
+        for future in futures:
+            future.cancel()
+
+
+def _collect_percentiles(blocks, n_blocks: int, n_paths: int,
+                         seed_sequence: np.random.SeedSequence,
+                         percentiles: Sequence[float]) -> Iterator[Dict]:
+    """Accumulate terminal values and report percentiles as blocks finish."""
+
+    report_every = max(1, n_blocks // MAX_PROGRESS_UPDATES)
+    terminal = np.empty(n_paths)
+    completed = 0
+    for i, block in enumerate(blocks, start=1):
+        terminal[completed:completed + len(block)] = block
+        completed += len(block)
+        if i % report_every and i != n_blocks:
+            continue
+        yield {
+            'completed_paths': completed,
+            'total_paths': n_paths,
+            'seed': seed_sequence.entropy,
+            'percentiles': dict(zip(
+                (str(p) for p in percentiles),
+                (float(v) for v in np.percentile(terminal[:completed], percentiles)),
+            )),
+        }
@@ -0,0 +1,226 @@
+"""
+Quote Board
+Shared latest quotes for every symbol on any watchlist
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+DEFAULT_INTERVAL = 60.0
+
+# A symbol nobody has asked about for this many sweeps stops being refreshed
+IDLE_SWEEPS = 5
+
+
+class QuoteBoard:
+    """
+    Latest quote per watched symbol, shared by every session.
+
+    Sessions register the symbols they watch; a background thread refreshes
+    the union of those symbols once per interval, so each symbol costs one
+    fetch per interval no matter how many watchlists contain it. Symbols
+    seen for the first time are fetched immediately; those that return no
+    quote are left to the sweeps.
+
+    Each symbol is fetched by one caller at a time, and nobody waits on
+    another caller's fetch: a symbol already being fetched is simply still
+    pending. With `max_per_sweep` a sweep refreshes only that many symbols,
+    least recently fetched first, so a rate-limited fetch leaves requests
+    over for interactive calls and every symbol still takes its turn.
+    """
+
+    def __init__(self, fetch: Callable[[List[str]], Dict[str, Dict[str, float]]],
+                 interval: float = DEFAULT_INTERVAL, idle_sweeps: int = IDLE_SWEEPS,
+                 max_per_sweep: Optional[int] = None):
+        self._fetch = fetch
+        self.interval = interval
+        self.idle_sweeps = idle_sweeps
+        self.max_per_sweep = max_per_sweep
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._watched: Dict[str, float] = {}
+        # Fetched without a quote; left to the sweeps
+        self._unquoted: Set[str] = set()
+        # Being fetched right now, and when each symbol was last fetched
+        self._inflight: Set[str] = set()
+        self._attempted: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Counts stores of quotes
+        self.version = 0
+        # Async streams waiting for a store, woken on their own event loops
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.updated_at: Optional[str] = None
+        self.sweeps = 0
+
+    def watch(self, symbols: Iterable[str]):
+        """Mark symbols as wanted by a session."""
+        now = time.monotonic()
+        with self._lock:
+            for symbol in symbols:
+                self._watched[symbol] = now
+
+    def _store(self, quotes: Dict[str, Dict[str, float]]):
+        as_of = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            for symbol, quote in quotes.items():
+                self._quotes[symbol] = {**quote, 'as_of': as_of}
+            self.version += 1
+            waiters = list(self._waiters)
+        for loop, changed in waiters:
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                # The stream's loop has closed
+                pass
+
+    def _fetch_claimed(self, symbols: List[str]):
+        """Fetch symbols this caller marked in flight, store the quotes and release them."""
+        quotes: Dict[str, Dict[str, float]] = {}
+        try:
+            quotes = self._fetch(symbols)
+            if quotes:
+                self._store(quotes)
+        finally:
+            now = time.monotonic()
+            with self._lock:
+                for symbol in symbols:
+                    self._inflight.discard(symbol)
+                    self._attempted[symbol] = now
+                    if symbol in self._quotes:
+                        self._unquoted.discard(symbol)
+                    else:
+                        self._unquoted.add(symbol)
+
+    def ensure(self, symbols: Iterable[str]):
+        """Fetch any of the symbols that have never been quoted and nobody is fetching."""
+        with self._lock:
+            missing = [s for s in symbols
+                       if s not in self._quotes and s not in self._unquoted and s not in self._inflight]
+            self._inflight.update(missing)
+        if missing:
+            self._fetch_claimed(missing)
+
+    def sweep(self):
+        """Refresh recently watched symbols with one fetch each, up to `max_per_sweep`."""
+        cutoff = time.monotonic() - self.idle_sweeps * self.interval
+        with self._lock:
+            for symbol in [s for s, seen in self._watched.items() if seen < cutoff]:
+                del self._watched[symbol]
+                self._quotes.pop(symbol, None)
+                self._unquoted.discard(symbol)
+                self._attempted.pop(symbol, None)
+            symbols = sorted((s for s in self._watched if s not in self._inflight),
+                             key=lambda s: (self._attempted.get(s, 0.0), s))
+            if self.max_per_sweep is not None:
+                symbols = symbols[:self.max_per_sweep]
+            self._inflight.update(symbols)
+
+        if symbols:
+            # Symbols that fail keep their last good quote
+            self._fetch_claimed(symbols)
+        self.updated_at = datetime.now().isoformat(timespec='seconds')
+        self.sweeps += 1
+
+    def snapshot(self, symbols: Iterable[str]) -> Dict[str, Any]:
+        """Current quotes for the symbols, plus the ones still without a quote."""
+        with self._lock:
+            quotes = {s: dict(self._quotes[s]) for s in symbols if s in self._quotes}
+        return {
+            'quotes': quotes,
+            'updated_at': self.updated_at,
+            'pending': [s for s in symbols if s not in quotes],
+        }
+
+    def _deltas(self, symbols: List[str], holdings: Dict[str, Dict[str, float]],
+                sent: Dict[str, Tuple[float, float]], rows: Dict[str, Dict[str, Any]]
+                ) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Quote rows that moved since `sent`, and the holdings summary if any of them is held."""
+        quotes = self.snapshot(symbols)['quotes']
+        holdings_changed = False
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            if quote is None or sent.get(symbol) == (quote['price'], quote['day_change_percent']):
+                continue
+            sent[symbol] = (quote['price'], quote['day_change_percent'])
+            row = {'symbol': symbol, **quote}
+            holding = holdings.get(symbol)
+            if holding:
+                row['market_value'] = quote['price'] * holding['shares']
+                row['gain_loss'] = row['market_value'] - holding['cost']
+                holdings_changed = True
+            rows[symbol] = row
+            yield 'quote', row
+
+        if holdings_changed:
+            valued = [rows[s] for s in holdings if s in rows]
+            total_value = sum(r['market_value'] for r in valued)
+            total_cost = sum(holdings[r['symbol']]['cost'] for r in valued)
+            yield 'summary', {
+                'total_value': total_value,
+                'total_cost': total_cost,
+                'total_gain_loss': total_value - total_cost,
+                'missing': [s for s in holdings if s not in rows],
+            }
+
+    async def aiter_updates(self, symbols: List[str], holdings: Optional[Dict[str, Dict[str, float]]] = None,
+                            heartbeat: float = 15.0) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Yield changes for a set of symbols as they reach the board.
+
+        Produces ('quote', row) for each symbol whose price moved since the
+        last row sent, then ('summary', totals) if any of those symbols is in
+        `holdings`, which maps symbols to shares and cost. Yields ('heartbeat', None) when nothing changed
+        within `heartbeat` seconds. Every stream reads the same shared
+        quotes, so viewers add no upstream calls. Waits on an asyncio.Event
+        set by each store, so an open stream holds no worker thread.
+        """
+        holdings = holdings or {}
+        sent: Dict[str, Tuple[float, float]] = {}
+        rows: Dict[str, Dict[str, Any]] = {}
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        changed = waiter[1]
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            version = -1
+            while True:
+                # Keep the symbols in the sweep for as long as someone is streaming them
+                self.watch(symbols)
+                if self.version == version:
+                    try:
+                        await asyncio.wait_for(changed.wait(), heartbeat)
+                    except asyncio.TimeoutError:
+                        yield 'heartbeat', None
+                        continue
+                changed.clear()
+                version = self.version
+                for update in self._deltas(symbols, holdings, sent, rows):
+                    yield update
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Quote sweep failed: {e}")
+
+    def start(self):
+        """Start the background sweep thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="quote-board", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background sweep thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,78 @@
+"""
+Portfolio Revaluation Job
+Values every user's portfolio from one shared quote table
+
+Run once:       python -m services.portfolio.revaluation_job
+Run intraday:   python -m services.portfolio.revaluation_job --interval 30
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from auth.user_store import UserStore, get_user_store
+from data.api_client import APIClient
+from data.rate_limiter import DEFAULT_REQUESTS_PER_MINUTE, RateLimiter
+from models.portfolio import Portfolio
+from services.portfolio.valuation import fetch_quotes, value_positions
+
+
+def revalue_all(api_client: APIClient, store: Optional[UserStore] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Revalue every user's portfolio and store a valuation snapshot per user.
+
+    Quotes are fetched once for the union of symbols across all users, so
+    the API cost is one call per distinct symbol rather than per position.
+    Returns the snapshots by username.
+    """
+    store = store or get_user_store()
+    portfolios = {}
+    for username in store.usernames():
+        portfolio = Portfolio(username, store)
+        if portfolio.get_total_positions():
+            portfolios[username] = portfolio
+
+    symbols = {symbol for portfolio in portfolios.values() for symbol in portfolio.get_symbols()}
+    quotes = fetch_quotes(api_client, symbols)
+    valued_at = datetime.now().isoformat()
+
+    snapshots = {}
+    for username, portfolio in portfolios.items():
+        enriched, summary = value_positions(portfolio.get_all(), quotes)
+        snapshots[username] = {
+            'valued_at': valued_at,
+            'signature': portfolio.get_signature(),
+            'positions': enriched,
+            'summary': summary,
+            'missing_symbols': sorted(set(portfolio.get_symbols()) - set(quotes)),
+        }
+
+    with store.transaction():
+        for username, snapshot in snapshots.items():
+            store.update(username, {'valuation': snapshot})
+
+    print(f"Revalued {len(snapshots)} portfolio(s) from {len(quotes)}/{len(symbols)} quote(s)")
+    return snapshots
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Revalue every user's portfolio")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Minutes between runs; run once if 0")
+    parser.add_argument("--requests-per-minute", type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help="Alpha Vantage request budget")
+    parser.add_argument("--config", default="config.json", help="Path to config.json")
+    args = parser.parse_args(argv)
+
+    api_client = APIClient(args.config, rate_limiter=RateLimiter(args.requests_per_minute))
+    while True:
+        started = time.monotonic()
+        revalue_all(api_client)
+        if args.interval <= 0:
+            break
+        time.sleep(max(0.0, args.interval * 60 - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Portfolio Risk Metrics
+Volatility, beta, VaR/CVaR and drawdown from a cached return matrix
+"""
+
+from statistics import NormalDist
+from typing import Dict, Tuple
+
+import numpy as np
+
+from services.portfolio.price_history import ReturnMatrix, TRADING_DAYS_PER_YEAR
+
+
+def annualized_volatility(cov: np.ndarray, weights: np.ndarray) -> float:
+    """Annualized volatility from the quadratic form w'Σw."""
+    return float(np.sqrt(max(weights @ cov @ weights, 0.0) * TRADING_DAYS_PER_YEAR))
+
+
+def portfolio_beta(cov: np.ndarray, weights: np.ndarray, benchmark_index: int) -> float:
+    """Beta of the weighted assets against the benchmark column."""
+    benchmark_var = cov[benchmark_index, benchmark_index]
+    if benchmark_var <= 0:
+        return 0.0
+    return float(cov[:len(weights), benchmark_index] @ weights / benchmark_var)
+
+
+def historical_var_cvar(returns: np.ndarray, confidence: float) -> Tuple[float, float]:
+    """One-day historical VaR and CVaR, reported as positive loss fractions."""
+    cutoff = np.quantile(returns, 1.0 - confidence)
+    tail = returns[returns <= cutoff]
+    cvar = tail.mean() if tail.size else cutoff
+    return float(-cutoff), float(-cvar)
+
+
+def parametric_var_cvar(mean: float, std: float, confidence: float) -> Tuple[float, float]:
+    """One-day Gaussian VaR and CVaR, reported as positive loss fractions."""
+    normal = NormalDist()
+    z = normal.inv_cdf(1.0 - confidence)
+    var = -(mean + z * std)
+    cvar = -(mean - std * normal.pdf(z) / (1.0 - confidence))
+    return float(var), float(cvar)
+
+
+def max_drawdown(returns: np.ndarray) -> float:
+    """Largest peak-to-trough decline of the compounded return path."""
+    wealth = np.cumprod(1.0 + returns)
+    peaks = np.maximum.accumulate(np.concatenate(([1.0], wealth)))[1:]
+    return float(-(wealth / peaks - 1.0).min())
+
+
+def compute_risk_metrics(matrix: ReturnMatrix, weights: np.ndarray,
+                         benchmark_index: int, confidence: float) -> Dict[str, float]:
+    """
+    Compute all risk metrics for the given asset weights.
+
+    The weights cover the first len(weights) columns of the matrix; the
+    benchmark may be one of them or an extra trailing column.
+    """
+    n = len(weights)
+    cov = matrix.cov[:n, :n]
+    daily_returns = matrix.returns[:, :n] @ weights
+    daily_mean = float(matrix.mean[:n] @ weights)
+    daily_std = float(np.sqrt(max(weights @ cov @ weights, 0.0)))
+
+    historical_var, historical_cvar = historical_var_cvar(daily_returns, confidence)
+    parametric_var, parametric_cvar = parametric_var_cvar(daily_mean, daily_std, confidence)
+
+    return {
+        'annualized_volatility': annualized_volatility(cov, weights),
+        'beta': portfolio_beta(matrix.cov, weights, benchmark_index),
+        'historical_var': historical_var,
+        'historical_cvar': historical_cvar,
+        'parametric_var': parametric_var,
+        'parametric_cvar': parametric_cvar,
+        'max_drawdown': max_drawdown(daily_returns),
+    }
@@ -0,0 +1,83 @@
+"""
+Portfolio Valuation
+Quote tables and position valuation shared by the endpoint and the batch job
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def parse_quote(quote_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+    """Extract price and day change from a GLOBAL_QUOTE payload."""
+    if not quote_data or not quote_data.get("Global Quote"):
+        return None
+    quote = quote_data["Global Quote"]
+    try:
+        # "10. change percent" is like "1.23%"
+        return {
+            'price': float(quote["05. price"]),
+            'day_change_percent': float(quote.get("10. change percent", "0%").replace("%", "")),
+        }
+    except (KeyError, ValueError):
+        return None
+
+
+def fetch_quotes(api_client, symbols: Iterable[str]) -> Dict[str, Dict[str, float]]:
+    """
+    Fetch each distinct symbol once.
+    Symbols without a usable quote are left out of the table.
+    """
+    quotes = {}
+    for symbol in sorted(set(symbols)):
+        try:
+            quote = parse_quote(api_client.get_quote(symbol))
+        except Exception as e:
+            print(f"Error fetching quote for {symbol}: {e}")
+            continue
+        if quote is None:
+            print(f"Skipping {symbol}: No valid quote data available.")
+            continue
+        quotes[symbol] = quote
+    return quotes
+
+
+def value_positions(positions: List[Dict[str, Any]],
+                    quotes: Dict[str, Dict[str, float]]) -> Tuple[List[Dict[str, Any]], Dict[str, float]]:
+    """
+    Value positions against a quote table.
+    Returns the enriched positions and the portfolio summary; positions
+    without a quote are skipped.
+    """
+    enriched = []
+    total_value = 0.0
+    total_cost = 0.0
+
+    for pos in positions:
+        quote = quotes.get(pos['symbol'])
+        if quote is None:
+            continue
+        current_value = quote['price'] * pos['shares']
+        cost_basis = pos['purchase_price'] * pos['shares']
+        gain_loss = current_value - cost_basis
+        total_value += current_value
+        total_cost += cost_basis
+        enriched.append({
+            'symbol': pos['symbol'],
+            'shares': pos['shares'],
+            'purchase_price': pos['purchase_price'],
+            'date_added': pos.get('date_added'),
+            'current_price': quote['price'],
+            'current_value': current_value,
+            'cost_basis': cost_basis,
+            'gain_loss': gain_loss,
+            'gain_loss_percent': (gain_loss / cost_basis * 100) if cost_basis != 0 else 0.0,
+            'day_change_percent': quote['day_change_percent'],
+        })
+
+    total_gain_loss = total_value - total_cost
+    summary = {
+        'total_value': total_value,
+        'total_cost': total_cost,
+        'total_gain_loss': total_gain_loss,
+        'total_gain_loss_percent': total_gain_loss / total_cost * 100 if total_cost != 0 else 0.0,
+    }
+    return enriched, summary
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import requests
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -9,6 +11,10 @@ CONSUL_URL = "http://consul:8500/v1/agent/service/register" # For registering se
 CONSUL_SERVICES_URL = "http://consul:8500/v1/catalog/services"  # For discovering services
 CONSUL_SPECIFIC_SERVICE_URL = "http://consul:8500/v1/catalog/service" # For specific services details
 CONSUL_DEREGISTER_URL = "http://consul:8500/v1/agent/service/deregister"  # URL for deregistering services
+CONSUL_AGENT_SERVICES_URL = "http://consul:8500/v1/agent/services"  # Every instance registered with the agent
+CONSUL_HEALTH_URL = "http://consul:8500/v1/health/service"  # A service's instances with their health checks
+CONSUL_PASSING_CHECKS_URL = "http://consul:8500/v1/health/state/passing"  # Every passing check
+CONSUL_TIMEOUT = 3
 
 
 
@@ -17,12 +23,13 @@ class Service(BaseModel):
     service_name: str
     service_url: str
     port: int
+    service_id: Optional[str] = None  # Unique per replica; defaults to the service name
 
 @app.post("/register")
 def register_service(service: Service):
     """Register a service with Consul."""
     payload = {
-        "ID": service.service_name,
+        "ID": service.service_id or service.service_name,
         "Name": service.service_name,
         "Address": service.service_url,
         "Port": service.port,
@@ -39,34 +46,73 @@ def register_service(service: Service):
         raise HTTPException(status_code=response.status_code, detail="Failed to register service with Consul")
 
 
+def instance_url(address: str, port: int) -> str:
+    return f"http://{address}:{port}"
+
+
+# Declared before /services/{service_name} so "resolve" is not taken for a service name
+@app.get("/services/resolve")
+def resolve_services():
+    """Every service's passing instance URLs in one call, for clients to cache."""
+    try:
+        response = requests.get(CONSUL_AGENT_SERVICES_URL, timeout=CONSUL_TIMEOUT)
+        checks = requests.get(CONSUL_PASSING_CHECKS_URL, timeout=CONSUL_TIMEOUT)
+    except requests.RequestException as e:
+        raise HTTPException(status_code=500, detail=f"Error contacting Consul: {e}")
+    if response.status_code != 200 or checks.status_code != 200:
+        raise HTTPException(status_code=500, detail="Failed to retrieve services from Consul")
+
+    passing = {check["ServiceID"] for check in checks.json() if check.get("ServiceID")}
+    resolved = {}
+    for service_id, instance in response.json().items():
+        service_name = instance["Service"]
+        if 'consul' in service_name.lower() or service_id not in passing:
+            continue
+        resolved.setdefault(service_name, []).append(
+            {"service_url": instance_url(instance['Address'], instance['Port'])}
+        )
+    return resolved
+
+
 @app.get("/services/{service_name}")
 def get_service_url(service_name: str):
+    """Every instance of a service whose health checks pass."""
     try:
-        # Query Consul for the service details
-        response = requests.get(f"{CONSUL_SPECIFIC_SERVICE_URL}/{service_name}")
-        if response.status_code == 200:
-            services = response.json()
-            if services:
-                # Take the first service instance
-                service_address = services[0]["ServiceAddress"]
-                service_port = services[0]["ServicePort"]
-                service_url = f"http://{service_address}:{service_port}"
-                return {"service_url": service_url}
-            else:
-                raise HTTPException(status_code=404, detail=f"Service {service_name} not found")
-        else:
-            raise HTTPException(status_code=500, detail="Failed to fetch from Consul")
-    except Exception as e:
+        # Query Consul for the healthy instances only
+        response = requests.get(f"{CONSUL_HEALTH_URL}/{service_name}", params={"passing": "true"},
+                                timeout=CONSUL_TIMEOUT)
+    except requests.RequestException as e:
         raise HTTPException(status_code=500, detail=f"Error contacting Consul: {str(e)}")
+    if response.status_code != 200:
+        raise HTTPException(status_code=500, detail="Failed to fetch from Consul")
+
+    instances = [
+        instance_url(entry["Service"]["Address"] or entry["Node"]["Address"], entry["Service"]["Port"])
+        for entry in response.json()
+    ]
+    if not instances:
+        raise HTTPException(status_code=404, detail=f"Service {service_name} not found")
+    # service_url is kept for clients that use a single instance
+    return {"service_url": instances[0], "instances": instances}
 
-@app.delete("/deregister/{service_name}")
-def deregister_service(service_name: str):
+@app.delete("/deregister/{service_id}")
+def deregister_service(service_id: str):
+    """Deregister one instance by its ID, or every instance of a service by its name."""
     try:
-        response = requests.put(f"{CONSUL_DEREGISTER_URL}/{service_name}")
-        if response.status_code == 200:
-            return {"message": f"Service {service_name} deregistered successfully from Consul."}
+        registered = requests.get(CONSUL_AGENT_SERVICES_URL, timeout=CONSUL_TIMEOUT).json()
+        if service_id in registered:
+            service_ids = [service_id]
         else:
-            raise HTTPException(status_code=response.status_code, detail=f"Failed to deregister {service_name} from Consul")
+            service_ids = [key for key, instance in registered.items() if instance["Service"] == service_id]
+        if not service_ids:
+            raise HTTPException(status_code=404, detail=f"Service {service_id} not found")
+        for instance_id in service_ids:
+            response = requests.put(f"{CONSUL_DEREGISTER_URL}/{instance_id}", timeout=CONSUL_TIMEOUT)
+            if response.status_code != 200:
+                raise HTTPException(status_code=response.status_code, detail=f"Failed to deregister {instance_id} from Consul")
+        return {"message": f"Service {service_id} deregistered successfully from Consul."}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deregistering service from Consul: {str(e)}")
 
@@ -1,8 +1,11 @@
 # stock_analysis_service.py
 
+import os
+import socket
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from data.api_client import APIClient  # same APIClient you already use in your app
+from data.symbol_aliases import is_unknown_symbol
 import requests
 
 
@@ -14,8 +17,9 @@ api_client = APIClient()
 SERVICE_REGISTRY_URL = "http://service_registry:8010"
 # Service details
 SERVICE_NAME = "Stock_Analysis_Service"
-SERVICE_HOST = "stock_analysis_service"  # Service container name
+SERVICE_HOST = os.environ.get("SERVICE_HOST", socket.gethostname())  # This replica's container hostname
 SERVICE_PORT = 8004
+SERVICE_ID = f"{SERVICE_NAME}-{SERVICE_HOST}"  # One registration per replica
 
 
 
@@ -30,6 +34,10 @@ def get_analysis(symbol: str):
     Microservice endpoint for stock analysis.
     It uses APIClient internally and returns overview + daily data as JSON.
     """
+    # Unlisted symbols never reach the API quota
+    if is_unknown_symbol(symbol):
+        raise HTTPException(status_code=404, detail=f"Unknown symbol {symbol}")
+
     try:
         overview = api_client.get_company_overview(symbol)
         daily = api_client.get_daily_prices(symbol)
@@ -48,7 +56,8 @@ def get_analysis(symbol: str):
 def register_service_with_registry():
     payload = {
         "service_name": SERVICE_NAME,
-        "service_url": SERVICE_HOST,  # Service URL (container name)
+        "service_id": SERVICE_ID,
+        "service_url": SERVICE_HOST,  # Service URL (container hostname)
         "port": SERVICE_PORT,
     }
     try:
@@ -63,7 +72,7 @@ def register_service_with_registry():
 # Deregister the service from the Service Registry
 def deregister_service_from_registry():
     try:
-        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_NAME}")
+        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_ID}")
         if response.status_code == 200:
             print(f"Service {SERVICE_NAME} deregistered from Service Registry.")
         else:
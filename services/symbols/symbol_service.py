@@ -0,0 +1,243 @@
+import os
+import socket
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel
+
+from data.symbol_filters import parse_filters
+from data.symbol_index import SymbolIndex
+from data.symbol_refresh import SymbolGeneration, SymbolStore
+
+app = FastAPI(title="Symbol Service")
+
+SERVICE_REGISTRY_URL = "http://service_registry:8010"
+# Service details
+SERVICE_NAME = "Symbol_Service"
+SERVICE_HOST = os.environ.get("SERVICE_HOST", socket.gethostname())  # This replica's container hostname
+SERVICE_PORT = 8005
+SERVICE_ID = f"{SERVICE_NAME}-{SERVICE_HOST}"  # One registration per replica
+
+SYMBOLS_CSV = os.environ.get("SYMBOLS_CSV", "symbols_valid_meta.csv")
+
+# Distinct (query, limit, filters) results kept for hot prefixes
+SUGGEST_CACHE_SIZE = 4096
+MAX_LIMIT = 50
+MAX_BROWSE_LIMIT = 500
+
+
+class SymbolCatalog:
+    """
+    The symbols table, its search index and an LRU of recent suggestions.
+
+    Built once per process; suggestions for the same query, limit and
+    filters are served from the LRU without touching the index.
+    """
+
+    def __init__(self, symbols_df, index: Optional[SymbolIndex] = None):
+        self.symbols_df = symbols_df
+        self.index = index if index is not None else SymbolIndex(symbols_df)
+        self._suggestions: "OrderedDict[Tuple[str, int, str], List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def mask(self, filters: str) -> Optional[np.ndarray]:
+        """Boolean row mask for filters like "etf:N,exchange:Q|P"; None when unfiltered."""
+        return self.index.filters.mask(parse_filters(filters))
+
+    def suggest(self, q: str, limit: int, filters: str = "") -> List[str]:
+        key = (q.strip().upper(), limit, filters)
+        with self._lock:
+            cached = self._suggestions.get(key)
+            if cached is not None:
+                self._suggestions.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        suggestions = self.index.search(q, limit, mask=self.mask(filters))
+        with self._lock:
+            self._suggestions[key] = suggestions
+            if len(self._suggestions) > SUGGEST_CACHE_SIZE:
+                self._suggestions.popitem(last=False)
+        return suggestions
+
+
+catalog: Optional[SymbolCatalog] = None
+catalog_lock = threading.Lock()
+store: Optional[SymbolStore] = None
+
+
+def serve_generation(generation: SymbolGeneration):
+    """Swap in a catalog for a new symbols generation; requests in flight finish on the old one."""
+    global catalog
+    catalog = SymbolCatalog(generation.frame, generation.index)
+
+
+def get_catalog() -> SymbolCatalog:
+    """The process's catalog, loaded from the symbols artifact on first use."""
+    global catalog, store
+    if catalog is None:
+        with catalog_lock:
+            if catalog is None:
+                store = SymbolStore(SYMBOLS_CSV, on_refresh=serve_generation)
+                serve_generation(store.current)
+    return catalog
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    suggestions: List[str]
+
+
+class BrowseResponse(BaseModel):
+    total: int
+    symbols: List[str]
+
+
+class ResolveRequest(BaseModel):
+    symbols: List[str]
+
+
+class ResolveResponse(BaseModel):
+    resolved: Dict[str, str]  # symbol -> "SYMBOL - Security Name"
+    canonical: Dict[str, str]  # requested spelling -> symbol
+    unknown: List[str]
+
+
+@app.get("/suggest", response_model=SuggestResponse)
+def suggest(
+    q: str = Query(..., description="Symbol or company name, possibly partial or misspelled"),
+    limit: int = Query(10, ge=1, le=MAX_LIMIT),
+    filters: str = Query("", description="Comma-separated name:value pairs, e.g. 'etf:N,exchange:Q'")
+):
+    try:
+        suggestions = get_catalog().suggest(q, limit, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SuggestResponse(query=q, suggestions=suggestions)
+
+
+@app.get("/filters")
+def filters():
+    """Values available for each filter."""
+    return get_catalog().index.filters.options()
+
+
+@app.get("/browse", response_model=BrowseResponse)
+def browse(
+    filters: str = Query("", description="Comma-separated name:value pairs, e.g. 'etf:N,exchange:Q|P'"),
+    q: str = Query("", description="Optional symbol or company name to rank by"),
+    limit: int = Query(100, ge=1, le=MAX_BROWSE_LIMIT),
+    offset: int = Query(0, ge=0)
+):
+    """Screen the symbol universe, in symbol order or ranked by a query."""
+    current = get_catalog()
+    try:
+        mask = current.mask(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if q.strip():
+        symbols = current.index.search(q, limit, mask=mask)
+        return BrowseResponse(total=len(symbols), symbols=symbols)
+    total, symbols = current.index.browse(mask, limit, offset)
+    return BrowseResponse(total=total, symbols=symbols)
+
+
+@app.post("/resolve", response_model=ResolveResponse)
+def resolve(request: ResolveRequest):
+    """Resolve a batch of symbols, in any known spelling, to listed symbols."""
+    index = get_catalog().index
+    resolved, canonical, unknown = {}, {}, []
+    for symbol in request.symbols:
+        listed = index.aliases.resolve(symbol)
+        position = index.lookup(listed) if listed else None
+        if position is None:
+            unknown.append(symbol)
+        else:
+            resolved[listed] = index.texts[position]
+            canonical[symbol] = listed
+    return ResolveResponse(resolved=resolved, canonical=canonical, unknown=unknown)
+
+
+@app.post("/refresh")
+def refresh():
+    """Apply changes in the symbols file without a restart."""
+    get_catalog()
+    if store is None:
+        raise HTTPException(status_code=409, detail="Symbols were not loaded from a file")
+    try:
+        diff = store.refresh()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"Error reading symbols: {e}")
+    return {"generation": store.current.number, **diff.summary()}
+
+
+@app.get("/stats")
+def stats():
+    current = get_catalog()
+    lookups = current.hits + current.misses
+    return {
+        "generation": store.current.number if store else None,
+        "symbols": len(current.index),
+        "cached_queries": len(current._suggestions),
+        "hit_ratio": current.hits / lookups if lookups else 0.0,
+    }
+
+
+# Register the service with the Service Registry
+def register_service_with_registry():
+    payload = {
+        "service_name": SERVICE_NAME,
+        "service_id": SERVICE_ID,
+        "service_url": SERVICE_HOST,  # Service URL (container hostname)
+        "port": SERVICE_PORT,
+    }
+    try:
+        response = requests.post(f"{SERVICE_REGISTRY_URL}/register", json=payload)
+        if response.status_code == 200:
+            print(f"Service {SERVICE_NAME} registered with Service Registry.")
+        else:
+            print(f"Failed to register {SERVICE_NAME} with Service Registry.")
+    except Exception as e:
+        print(f"Error registering service with Service Registry: {e}")
+
+# Deregister the service from the Service Registry
+def deregister_service_from_registry():
+    try:
+        response = requests.delete(f"{SERVICE_REGISTRY_URL}/deregister/{SERVICE_ID}")
+        if response.status_code == 200:
+            print(f"Service {SERVICE_NAME} deregistered from Service Registry.")
+        else:
+            print(f"Failed to deregister {SERVICE_NAME} from Service Registry.")
+    except Exception as e:
+        print(f"Error deregistering service from Service Registry: {e}")
+
+
+@app.on_event("startup")
+async def startup_event():
+    # Build the index before taking traffic, then register
+    get_catalog()
+    store.start_watcher()
+    register_service_with_registry()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if store is not None:
+        store.stop_watcher()
+    # Deregister the service from the Service Registry during shutdown
+    deregister_service_from_registry()
+
+
+@app.get("/")
+def read_root():
+    return {"message": "Symbol Service Running"}
+
+@app.get("/health")
+def health_check():
+    return {"status": "healthy"}
@@ -5,6 +5,7 @@ Black-box tests for the main application flow
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
+from utils.service_discovery import service_catalog
 
 # Define a placeholder for StopException that can be used by mocks
 class StopException(Exception):
@@ -39,7 +40,7 @@ class TestAppFlow(unittest.TestCase):
         """
         # Patch the functions at their source
         with patch('auth.authentication.show_login_page') as mock_show_login_page, \
-             patch('data.symbol_loader.load_symbols_database'):
+             patch('data.symbol_loader.current_symbols'):
             import app
 
             # Arrange
@@ -65,7 +66,8 @@ class TestAppFlow(unittest.TestCase):
         # Patch the functions at their source
         with patch('pages.stock_analysis.render') as mock_render_stock, \
              patch('utils.service_discovery.get_available_services') as mock_get_services, \
-             patch('data.symbol_loader.load_symbols_database'):
+             patch('utils.service_discovery.prefetch_service_urls'), \
+             patch('data.symbol_loader.current_symbols'):
             import app
 
             # Arrange
@@ -75,9 +77,10 @@ class TestAppFlow(unittest.TestCase):
             mock_get_services.return_value = {"Stock Analysis Service": {}}
             self.mock_st.sidebar.selectbox.return_value = "Stock Analysis Service"
 
-            # Reset mocks to clear state from initial import
+            # Reset mocks and the cached service list to clear state from initial import
             mock_get_services.reset_mock()
             mock_render_stock.reset_mock()
+            service_catalog.clear()
 
             # Act
             import importlib
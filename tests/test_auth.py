@@ -2,12 +2,17 @@
 Unit tests for the auth module
 """
 
+import os
+import pickle
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from auth.authentication import (
     hash_password, load_users, save_users,
     create_user, authenticate_user, check_authentication, logout
 )
+from auth.user_store import SQLiteUserStore, UserStore
 
 class TestAuthentication(unittest.TestCase):
     """
@@ -43,56 +48,57 @@ class TestAuthentication(unittest.TestCase):
         save_users(users_data)
         mock_pickle_dump.assert_called_once_with(users_data, unittest.mock.ANY)
 
-    @patch('auth.authentication.load_users')
-    @patch('auth.authentication.save_users')
-    def test_create_user(self, mock_save_users, mock_load_users):
+    @patch('auth.authentication.get_user_store')
+    def test_create_user(self, mock_get_store):
         """
         Test creating a new user.
         """
-        mock_load_users.return_value = {}
+        mock_get_store.return_value.create.return_value = True
         success, message = create_user("new_user", "password123")
         self.assertTrue(success)
         self.assertEqual(message, "Account created successfully")
-        mock_save_users.assert_called_once()
+        username, record = mock_get_store.return_value.create.call_args[0]
+        self.assertEqual(username, "new_user")
+        self.assertEqual(record['password'], hash_password("password123"))
 
-    @patch('auth.authentication.load_users')
-    def test_create_user_already_exists(self, mock_load_users):
+    @patch('auth.authentication.get_user_store')
+    def test_create_user_already_exists(self, mock_get_store):
         """
         Test creating a user that already exists.
         """
-        mock_load_users.return_value = {"existing_user": {"password": "hashed_password"}}
+        mock_get_store.return_value.create.return_value = False
         success, message = create_user("existing_user", "password123")
         self.assertFalse(success)
         self.assertEqual(message, "Username already exists")
 
-    @patch('auth.authentication.load_users')
-    def test_authenticate_user_success(self, mock_load_users):
+    @patch('auth.authentication.get_user_store')
+    def test_authenticate_user_success(self, mock_get_store):
         """
         Test successful user authentication.
         """
         hashed_pw = hash_password("password123")
-        mock_load_users.return_value = {"user1": {"password": hashed_pw}}
+        mock_get_store.return_value.get.return_value = {"password": hashed_pw}
         success, message = authenticate_user("user1", "password123")
         self.assertTrue(success)
         self.assertEqual(message, "Login successful")
 
-    @patch('auth.authentication.load_users')
-    def test_authenticate_user_not_found(self, mock_load_users):
+    @patch('auth.authentication.get_user_store')
+    def test_authenticate_user_not_found(self, mock_get_store):
         """
         Test authentication for a user that does not exist.
         """
-        mock_load_users.return_value = {}
+        mock_get_store.return_value.get.return_value = None
         success, message = authenticate_user("unknown_user", "password123")
         self.assertFalse(success)
         self.assertEqual(message, "Username not found")
 
-    @patch('auth.authentication.load_users')
-    def test_authenticate_user_invalid_password(self, mock_load_users):
+    @patch('auth.authentication.get_user_store')
+    def test_authenticate_user_invalid_password(self, mock_get_store):
         """
         Test authentication with an invalid password.
         """
         hashed_pw = hash_password("password123")
-        mock_load_users.return_value = {"user1": {"password": hashed_pw}}
+        mock_get_store.return_value.get.return_value = {"password": hashed_pw}
         success, message = authenticate_user("user1", "wrong_password")
         self.assertFalse(success)
         self.assertEqual(message, "Invalid password")
@@ -118,5 +124,57 @@ class TestAuthentication(unittest.TestCase):
         mock_st.session_state.clear.assert_called_once()
 
 
+class TestSQLiteUserStore(unittest.TestCase):
+    """
+    Test suite for the SQLite user store.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.store = SQLiteUserStore(os.path.join(self.tmpdir, "users.db"))
+
+    def test_create_get_update(self):
+        self.assertTrue(self.store.create("alice", {'password': 'x', 'portfolio': []}))
+        self.assertFalse(self.store.create("alice", {'password': 'y'}))
+        self.assertTrue(self.store.update("alice", {'preferences': {'theme': 'dark'}}))
+        self.assertEqual(self.store.get("alice"),
+                         {'password': 'x', 'portfolio': [], 'preferences': {'theme': 'dark'}})
+        self.assertEqual(self.store.get_version("alice"), 2)
+        self.assertFalse(self.store.update("bob", {'password': 'z'}))
+        self.assertIsNone(self.store.get("bob"))
+
+    def test_transaction_rolls_back(self):
+        """
+        Test that a failed transaction leaves no partial writes behind.
+        """
+        self.store.create("alice", {'password': 'x'})
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.update("alice", {'password': 'changed'})
+                self.store.create("bob", {'password': 'y'})
+                raise RuntimeError("boom")
+        self.assertEqual(self.store.get("alice"), {'password': 'x'})
+        self.assertEqual(self.store.usernames(), ["alice"])
+
+    def test_migrates_pickle_once(self):
+        pickle_path = os.path.join(self.tmpdir, "users_data.pkl")
+        with open(pickle_path, 'wb') as f:
+            pickle.dump({"alice": {'password': 'x'}, "bob": {'password': 'y'}}, f)
+
+        self.assertEqual(self.store.migrate_from_pickle(pickle_path), 2)
+        self.store.delete("bob")
+        self.assertEqual(self.store.migrate_from_pickle(pickle_path), 0)
+        self.assertEqual(self.store.usernames(), ["alice"])
+
+    def test_incomplete_store_cannot_be_created(self):
+        class GetOnlyStore(UserStore):
+            def get(self, username):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnlyStore()
+
+
 if __name__ == '__main__':
     unittest.main()
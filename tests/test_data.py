@@ -2,10 +2,22 @@
 Unit tests for the data module
 """
 
+import os
+import shutil
+import tempfile
 import unittest
+import numpy as np
 import pandas as pd
 from unittest.mock import patch, MagicMock
-from data.symbol_loader import load_symbols_database, get_stock_suggestions
+from data.symbol_loader import load_symbols_database, get_stock_suggestions, resolve_symbols, browse_symbols
+from data.rate_limiter import RateLimiter
+from data.symbol_index import SymbolIndex, get_symbol_index
+from data.symbol_aliases import SymbolAliases
+from data.symbol_filters import SymbolFilters, parse_filters
+from data.symbol_refresh import SymbolStore, apply_diff, diff_symbols
+from data.symbol_artifact import build_artifact, load_artifact
+from data.service_cache import ServiceResponseCache
+from data.session_payloads import SessionPayloads, payload_size
 
 class TestSymbolLoader(unittest.TestCase):
     """
@@ -62,6 +74,20 @@ class TestSymbolLoader(unittest.TestCase):
         suggestions = get_stock_suggestions(dummy_df, 'AAP')
         self.assertEqual(suggestions, ['AAPL - Apple Inc.'])
 
+    @patch('data.symbol_loader.symbol_client')
+    @patch('data.symbol_loader.remote_symbol_search', return_value=True)
+    def test_get_stock_suggestions_from_service(self, mock_remote, mock_client):
+        """
+        With remote search on, suggestions come from the symbol service and need no local table.
+        """
+        mock_client.suggest.return_value = ['AAPL - Apple Inc.']
+        self.assertEqual(get_stock_suggestions(pd.DataFrame(), 'aap', limit=3), ['AAPL - Apple Inc.'])
+        mock_client.suggest.assert_called_once_with('aap', 3)
+
+        # The service being down leaves the local table, if any
+        mock_client.suggest.side_effect = Exception("connection refused")
+        self.assertEqual(get_stock_suggestions(pd.DataFrame(), 'aap'), [])
+
     def test_get_stock_suggestions_limit(self):
         """
         Test that the number of suggestions is limited.
@@ -73,5 +99,367 @@ class TestSymbolLoader(unittest.TestCase):
         suggestions = get_stock_suggestions(dummy_df, 'A', limit=5)
         self.assertEqual(len(suggestions), 5)
 
+
+class TestRateLimiter(unittest.TestCase):
+    """
+    Test suite for the token bucket rate limiter.
+    """
+
+    def test_burst_then_wait(self):
+        limiter = RateLimiter(requests_per_minute=60, burst=2)
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertTrue(limiter.acquire(timeout=0))
+        self.assertFalse(limiter.acquire(timeout=0.1))
+
+    @patch('data.rate_limiter.time.sleep')
+    @patch('data.rate_limiter.time.monotonic')
+    def test_refills_over_time(self, mock_monotonic, mock_sleep):
+        mock_monotonic.return_value = 100.0
+        limiter = RateLimiter(requests_per_minute=6, burst=1)
+        self.assertTrue(limiter.acquire())
+
+        # Empty bucket: the next token arrives 10 seconds later
+        mock_sleep.side_effect = lambda seconds: setattr(mock_monotonic, 'return_value', 100.0 + seconds)
+        self.assertTrue(limiter.acquire())
+        mock_sleep.assert_called_once_with(10.0)
+
+
+class TestServiceResponseCache(unittest.TestCase):
+    """
+    Test suite for the shared service response cache.
+    """
+
+    def make_response(self, content, status_code=200):
+        res = MagicMock()
+        res.status_code = status_code
+        res.content = content
+        return res
+
+    def test_hit_replays_response(self):
+        cache = ServiceResponseCache()
+        call = MagicMock(return_value=self.make_response(b'{"symbol": "AAPL"}'))
+        cache.fetch("analysis", "AAPL", call)
+        res = cache.fetch("analysis", "AAPL", call)
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), {"symbol": "AAPL"})
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_errors_and_oversized_not_cached(self):
+        """
+        Failed responses and entries over the per-entry cap are passed through.
+        """
+        cache = ServiceResponseCache(max_entry_bytes=10)
+        failing = MagicMock(return_value=self.make_response(b'error', status_code=500))
+        cache.fetch("analysis", "AAPL", failing)
+        cache.fetch("analysis", "AAPL", failing)
+        self.assertEqual(failing.call_count, 2)
+
+        large = MagicMock(return_value=self.make_response(b'x' * 11))
+        cache.fetch("transcript", ("AAPL", "2024Q1"), large)
+        cache.fetch("transcript", ("AAPL", "2024Q1"), large)
+        self.assertEqual(large.call_count, 2)
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_evicts_least_recent_by_bytes(self):
+        cache = ServiceResponseCache(max_bytes=10)
+        for symbol in ("A", "B"):
+            cache.fetch("analysis", symbol, lambda: self.make_response(b'12345'))
+        cache.fetch("analysis", "A", MagicMock())
+        cache.fetch("analysis", "C", lambda: self.make_response(b'12345'))
+
+        call = MagicMock(return_value=self.make_response(b'12345'))
+        cache.fetch("analysis", "A", call)
+        cache.fetch("analysis", "B", call)
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(cache.stats()['evictions'], 2)
+
+    @patch('data.service_cache.time.monotonic')
+    def test_ttl_and_invalidate(self, mock_monotonic):
+        mock_monotonic.return_value = 0.0
+        cache = ServiceResponseCache(ttls={"news": 120})
+        call = MagicMock(return_value=self.make_response(b'{}'))
+        cache.fetch("news", "topic", call)
+        cache.fetch("news", "topic", call)
+        self.assertEqual(call.call_count, 1)
+
+        mock_monotonic.return_value = 121.0
+        cache.fetch("news", "topic", call)
+        self.assertEqual(call.call_count, 2)
+
+        cache.invalidate("news")
+        cache.fetch("news", "topic", call)
+        self.assertEqual(call.call_count, 3)
+
+
+class TestSessionPayloads(unittest.TestCase):
+    """
+    Test suite for the per-session payload budget.
+    """
+
+    def test_compacts_known_payloads(self):
+        state = {}
+        SessionPayloads(state).put('analysis_data', {
+            'symbol': 'AAPL',
+            'overview': {},
+            'daily': {'Time Series (Daily)': {
+                '2024-01-02': {'1. open': '1.0', '4. close': '2.0', '5. volume': '100'},
+            }},
+        })
+        stored = state['analysis_data']
+        self.assertEqual(stored['symbol'], 'AAPL')
+        self.assertNotIn('daily', stored)
+        self.assertEqual(stored['dates'].dtype, np.int64)
+        self.assertEqual(stored['closes'].dtype, np.float32)
+        self.assertEqual(stored['dates'][0], 19724)
+        self.assertAlmostEqual(float(stored['closes'][0]), 2.0)
+
+    def test_evicts_least_recently_used_over_budget(self):
+        """
+        Going over budget drops the payload read longest ago, never the new one.
+        """
+        state = {}
+        item = {'feed': ['x' * 100]}
+        payloads = SessionPayloads(state, budget=payload_size(item) * 2)
+        payloads.put('transcript_data', item)
+        payloads.put('other_data', item)
+        payloads.get('transcript_data')
+        payloads.put('third_data', item)
+
+        self.assertIn('transcript_data', state)
+        self.assertNotIn('other_data', state)
+        self.assertEqual(set(payloads.usage()['payloads']), {'transcript_data', 'third_data'})
+
+        payloads.put('huge_data', {'feed': ['x' * 1000]})
+        self.assertEqual(list(payloads.usage()['payloads']), ['huge_data'])
+
+
+class TestSymbolIndex(unittest.TestCase):
+    """
+    Test suite for the symbol prefix index.
+    """
+
+    def setUp(self):
+        self.index = SymbolIndex(pd.DataFrame({
+            'Symbol': ['MSFT', 'AAPL', 'AAP', 'APLE', 'GOOG'],
+            'Security Name': ['Microsoft Corp.', 'Apple Inc.', 'Advance Auto Parts',
+                              'Apple Hospitality REIT', 'Alphabet Inc.'],
+            'SearchText': ['MSFT - Microsoft Corp.', 'AAPL - Apple Inc.', 'AAP - Advance Auto Parts',
+                           'APLE - Apple Hospitality REIT', 'GOOG - Alphabet Inc.'],
+        }))
+
+    def test_symbol_prefix_then_name_words(self):
+        """
+        Symbols starting with the input come first (exact match leading), then name word matches.
+        """
+        self.assertEqual(self.index.search('aap'), ['AAP - Advance Auto Parts', 'AAPL - Apple Inc.'])
+        self.assertEqual(self.index.search('APPLE'),
+                         ['AAPL - Apple Inc.', 'APLE - Apple Hospitality REIT'])
+        self.assertEqual(self.index.search('inc', limit=1), ['AAPL - Apple Inc.'])
+
+    def test_ranked_search_tolerates_typos(self):
+        """
+        Misspelled names still match, and an exact symbol outranks name matches.
+        """
+        self.assertEqual(self.index.search('microsft', limit=1), ['MSFT - Microsoft Corp.'])
+        self.assertEqual(self.index.search('alphabt'), ['GOOG - Alphabet Inc.'])
+        self.assertEqual(self.index.search('AAP')[0], 'AAP - Advance Auto Parts')
+        self.assertEqual(self.index.search('qqqq'), [])
+
+    def test_longer_prefix_narrows_parent_range(self):
+        for text in ('A', 'AP', 'APL', 'APLX'):
+            self.index._prefix_ranges(text)
+        self.assertEqual(self.index._prefix_ranges('APL')[:2], (2, 3))
+        self.assertEqual(self.index._prefix_ranges('APLX')[:2], (3, 3))
+        self.assertIn('APL', self.index._ranges)
+
+
+class TestSymbolArtifact(unittest.TestCase):
+    """
+    Test suite for the compiled symbols artifact.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.tmpdir, 'symbols.csv')
+        pd.DataFrame({
+            'Symbol': ['AAPL', 'SPY'],
+            'Security Name': ['Apple Inc.', 'SPDR S&P 500 ETF'],
+            'Listing Exchange': ['Q', 'P'],
+            'ETF': ['N', 'Y'],
+        }).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip(self):
+        df = load_artifact(build_artifact(self.csv_path))
+        self.assertEqual(list(df['SearchText']), ['AAPL - Apple Inc.', 'SPY - SPDR S&P 500 ETF'])
+        self.assertEqual(df['ETF'].dtype, 'category')
+        self.assertEqual(df['Listing Exchange'].cat.categories.tolist(), ['P', 'Q'])
+        self.assertEqual(get_stock_suggestions(df, 'spdr'), ['SPY - SPDR S&P 500 ETF'])
+
+    def test_loader_prefers_current_artifact(self):
+        """
+        The loader reads the artifact beside the CSV, even once the CSV is gone.
+        """
+        build_artifact(self.csv_path)
+        os.remove(self.csv_path)
+        df = load_symbols_database(csv_path=self.csv_path)
+        self.assertEqual(list(df['Symbol']), ['AAPL', 'SPY'])
+
+
+class TestSymbolAliases(unittest.TestCase):
+    """
+    Test suite for symbol alias resolution.
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Symbol': ['AGM$A', 'BRK.B', 'AAPL', 'ZXZZT'],
+            'Security Name': ['Federal Agricultural Mortgage Preferred', 'Berkshire Hathaway Class B',
+                              'Apple Inc.', 'NASDAQ Test Stock'],
+            'Test Issue': ['N', 'N', 'N', 'Y'],
+            'CQS Symbol': ['AGMpA', 'BRK.B', 'AAPL', None],
+            'NASDAQ Symbol': ['AGM-A', 'BRK.B', 'AAPL', 'ZXZZT'],
+        })
+        self.aliases = SymbolAliases(self.df)
+
+    def test_every_spelling_resolves(self):
+        for spelling in ('BRK.B', 'brk-b', 'BRK/B', 'brk b', 'BRKB'):
+            self.assertEqual(self.aliases.resolve(spelling), 'BRK.B')
+        for spelling in ('AGMpA', 'AGM-A', 'agm.a'):
+            self.assertEqual(self.aliases.resolve(spelling), 'AGM$A')
+
+    def test_unknown_and_test_issues_rejected(self):
+        self.assertIsNone(self.aliases.resolve('XQZZY'))
+        self.assertIsNone(self.aliases.resolve('ZXZZT'))
+
+    def test_resolve_symbols(self):
+        """
+        Symbols resolve against the table, or pass through without one.
+        """
+        self.assertEqual(resolve_symbols(self.df, ['brk-b', 'NOPE']), {'brk-b': 'BRK.B', 'NOPE': None})
+        self.assertEqual(resolve_symbols(pd.DataFrame(), ['aapl']), {'aapl': 'AAPL'})
+
+
+class TestSymbolFilters(unittest.TestCase):
+    """
+    Test suite for precomputed symbol filter masks.
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Symbol': ['AAPL', 'SPY', 'QQQ', 'IBM', 'TINY'],
+            'Security Name': ['Apple Inc.', 'SPDR S&P 500 ETF Trust', 'Invesco QQQ Trust',
+                              'International Business Machines', 'Tiny Corp'],
+            'Listing Exchange': ['Q', 'P', 'Q', 'N', 'Q'],
+            'ETF': ['N', 'Y', 'Y', 'N', 'N'],
+            'Round Lot Size': [100.0, 100.0, 100.0, 100.0, 10.0],
+            'Financial Status': ['N', None, None, None, 'D'],
+        })
+        self.df['SearchText'] = self.df['Symbol'] + ' - ' + self.df['Security Name']
+        self.filters = SymbolFilters(self.df)
+
+    def test_combined_filters(self):
+        mask = self.filters.mask(parse_filters("exchange:Q|N,etf:n,round_lot:100"))
+        self.assertEqual(list(self.df['Symbol'][mask]), ['AAPL', 'IBM'])
+        self.assertEqual(self.filters.options()['financial_status'], ['', 'D', 'N'])
+
+    def test_masks_shared_per_selection(self):
+        """
+        Repeating a selection returns the same read-only mask.
+        """
+        first = self.filters.mask({"etf": ["Y"]})
+        self.assertIs(self.filters.mask({"etf": ["y"]}), first)
+        self.assertFalse(first.flags.writeable)
+        self.assertIsNone(self.filters.mask({}))
+        self.assertFalse(self.filters.mask({"exchange": ["Z"]}).any())
+
+    def test_unknown_filter(self):
+        with self.assertRaises(ValueError):
+            parse_filters("sector:tech")
+        with self.assertRaises(ValueError):
+            SymbolFilters(self.df[['Symbol']]).mask({"etf": ["Y"]})
+
+    def test_filtered_suggestions_and_browse(self):
+        self.assertEqual(get_stock_suggestions(self.df, 'trust', filters={"exchange": ["Q"]}),
+                         ['QQQ - Invesco QQQ Trust'])
+        self.assertEqual(browse_symbols(self.df, {"etf": ["N"]}, limit=2),
+                         (3, ['AAPL - Apple Inc.', 'IBM - International Business Machines']))
+
+
+class TestSymbolRefresh(unittest.TestCase):
+    """
+    Test suite for incremental symbol database refreshes.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.tmpdir, 'symbols.csv')
+        self.listing = pd.DataFrame({
+            'Symbol': ['AAPL', 'FB', 'MSFT', 'SPY'],
+            'Security Name': ['Apple Inc.', 'Facebook, Inc.', 'Microsoft Corporation', 'SPDR S&P 500 ETF'],
+            'Listing Exchange': ['Q', 'Q', 'Q', 'P'],
+            'ETF': ['N', 'N', 'N', 'Y'],
+        })
+        self.listing.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_update(self):
+        update = self.listing.copy()
+        update.loc[update['Symbol'] == 'FB', 'Symbol'] = 'META'
+        update.loc[update['Symbol'] == 'MSFT', 'Security Name'] = 'Microsoft Corp'
+        update = update[update['Symbol'] != 'SPY']
+        update = pd.concat([update, pd.DataFrame({
+            'Symbol': ['NVDA'], 'Security Name': ['NVIDIA Corporation'],
+            'Listing Exchange': ['Q'], 'ETF': ['N'],
+        })], ignore_index=True)
+        update.to_csv(self.csv_path, index=False)
+
+    def test_incremental_index_matches_rebuild(self):
+        store = SymbolStore(self.csv_path)
+        self.write_update()
+        listing = pd.read_csv(self.csv_path)
+        listing['SearchText'] = listing['Symbol'] + ' - ' + listing['Security Name']
+
+        diff = diff_symbols(store.frame, listing)
+        self.assertEqual((diff.added, diff.removed, diff.changed), (['META', 'NVDA'], ['FB', 'SPY'], ['MSFT']))
+        self.assertEqual(diff.renamed, {'FB': 'META'})
+
+        table, index = apply_diff(store.frame, store.index, listing, diff)
+        rebuilt = SymbolIndex(table)
+        self.assertEqual(index.symbols, rebuilt.symbols)
+        self.assertEqual(index.texts, rebuilt.texts)
+        self.assertEqual(index.tokens, rebuilt.tokens)
+        self.assertEqual(sorted(index.postings), sorted(rebuilt.postings))
+        self.assertEqual(index.filters.options(), rebuilt.filters.options())
+        self.assertEqual(index.search('nvidia', 3), ['NVDA - NVIDIA Corporation'])
+        self.assertEqual(index.aliases.resolve('FB'), 'META')
+        # The previous generation is untouched
+        self.assertEqual(store.index.search('facebook', 1), ['FB - Facebook, Inc.'])
+
+    def test_refresh_publishes_new_generation(self):
+        """
+        Sessions see the new table and its registered index after one refresh.
+        """
+        store = SymbolStore(self.csv_path)
+        first = store.current
+        self.assertIsNone(store.refresh_if_changed())
+
+        self.write_update()
+        os.utime(self.csv_path, (first.loaded_at + 10, first.loaded_at + 10))
+        diff = store.refresh_if_changed()
+
+        self.assertEqual(diff.summary()['added'], 2)
+        self.assertEqual(store.current.number, 2)
+        self.assertIs(get_symbol_index(store.frame), store.index)
+        self.assertEqual(get_stock_suggestions(store.frame, 'nvid', limit=1), ['NVDA - NVIDIA Corporation'])
+        self.assertFalse(store.refresh())
+        self.assertEqual(store.current.number, 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,333 @@
+"""
+Unit tests for the models module
+"""
+
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+from models.ledger import PortfolioLedger
+from models.lots import LotQueue
+from models.portfolio import Portfolio
+from models.user import User, UserRecordCache
+from models.unit_of_work import unit_of_work
+from auth.user_store import SQLiteUserStore
+
+
+class TestLotQueue(unittest.TestCase):
+    """
+    Test suite for the per-symbol lot queue.
+    """
+
+    def setUp(self):
+        self.queue = LotQueue()
+        for lot_id, date, price in [("a", "2024-01-01", 10.0),
+                                    ("b", "2024-02-01", 30.0),
+                                    ("c", "2024-03-01", 20.0)]:
+            self.queue.add({'lot_id': lot_id, 'shares': 10, 'purchase_price': price, 'date_added': date})
+
+    def matched_ids(self, shares, method):
+        return [(lot['lot_id'], taken) for lot, taken in self.queue.match(shares, method)]
+
+    def test_fifo(self):
+        self.assertEqual(self.matched_ids(15, 'FIFO'), [("a", 10), ("b", 5)])
+        self.assertEqual(self.queue.total_shares, 15)
+
+    def test_lifo(self):
+        self.assertEqual(self.matched_ids(15, 'LIFO'), [("c", 10), ("b", 5)])
+
+    def test_hifo(self):
+        self.assertEqual(self.matched_ids(15, 'HIFO'), [("b", 10), ("c", 5)])
+        self.assertEqual(self.matched_ids(10, 'HIFO'), [("c", 5), ("a", 5)])
+
+    def test_backdated_lot_after_sale(self):
+        """
+        Test that a lot older than already-sold lots is still matched first by FIFO.
+        """
+        self.matched_ids(10, 'FIFO')
+        self.queue.add({'lot_id': "old", 'shares': 1, 'purchase_price': 1.0, 'date_added': "2023-01-01"})
+        self.assertEqual(self.matched_ids(2, 'FIFO'), [("old", 1), ("b", 1)])
+
+    def test_oversell_raises(self):
+        with self.assertRaises(ValueError):
+            self.queue.match(31, 'FIFO')
+
+
+class TestPortfolio(unittest.TestCase):
+    """
+    Test suite for the portfolio model.
+    """
+
+    def setUp(self):
+        self.user_data = {'portfolio': [
+            {'symbol': 'AAPL', 'shares': 10, 'purchase_price': 100.0, 'date_added': '2024-01-01'},
+            {'symbol': 'AAPL', 'shares': 10, 'purchase_price': 150.0, 'date_added': '2024-02-01'},
+            {'symbol': 'MSFT', 'shares': 5, 'purchase_price': 300.0, 'date_added': '2024-01-15'},
+        ]}
+        self.ledger_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.ledger_dir)
+        ledger_patcher = patch('models.ledger.LEDGER_DIR', self.ledger_dir)
+        ledger_patcher.start()
+        self.addCleanup(ledger_patcher.stop)
+
+        patcher = patch('models.portfolio.User')
+        mock_user_cls = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_user = MagicMock()
+        self.mock_user.get_data.return_value = self.user_data
+        self.mock_user.update_data.return_value = True
+        mock_user_cls.return_value = self.mock_user
+        self.portfolio = Portfolio("test_user")
+
+    def test_legacy_positions_get_lot_ids(self):
+        self.assertEqual(self.portfolio.get_total_positions(), 3)
+        self.assertTrue(all(p['lot_id'] for p in self.portfolio.get_all()))
+
+    def test_partial_sell_fifo(self):
+        """
+        Test that a partial FIFO sale realizes the oldest lot and keeps the rest open.
+        """
+        self.assertTrue(self.portfolio.sell('aapl', 15, 200.0, '2024-06-01'))
+        realized = self.portfolio.get_realized_gains()
+        self.assertEqual([r['shares'] for r in realized], [10, 5])
+        self.assertEqual(sum(r['gain_loss'] for r in realized), 10 * 100 + 5 * 50)
+        self.assertEqual([lot['shares'] for lot in self.portfolio.get_lots('AAPL')], [5])
+        self.assertEqual(self.portfolio.get_total_positions(), 2)
+
+    def test_sell_hifo_gain_report(self):
+        self.portfolio.sell('AAPL', 10, 120.0, method='HIFO')
+        report = self.portfolio.get_gain_report({'AAPL': 120.0, 'MSFT': 310.0})
+        self.assertEqual(report['realized'], -300.0)
+        self.assertEqual(report['unrealized'], 200.0 + 50.0)
+
+    def test_sell_more_than_held(self):
+        self.assertFalse(self.portfolio.sell('MSFT', 6, 310.0))
+        self.assertFalse(self.portfolio.sell('TSLA', 1, 100.0))
+
+    def test_remove_position_removes_all_lots(self):
+        self.portfolio.remove_position('AAPL')
+        self.assertEqual(self.portfolio.get_symbols(), ['MSFT'])
+        self.assertEqual(Portfolio("test_user").get_symbols(), ['MSFT'])
+
+    def test_changes_persist_through_ledger(self):
+        """
+        Test that a reloaded portfolio replays sells and updates from the ledger.
+        """
+        self.portfolio.sell('AAPL', 15, 200.0, '2024-06-01')
+        self.portfolio.update_position('MSFT', purchase_price=250.0)
+        self.portfolio.add_position('tsla', 2, 180.0, '2024-03-01')
+
+        reloaded = Portfolio("test_user")
+        self.assertEqual(reloaded.get_all(), self.portfolio.get_all())
+        self.assertEqual(len(reloaded.get_realized_gains()), 2)
+        self.assertEqual(reloaded.get_position('MSFT')['purchase_price'], 250.0)
+        self.mock_user.update_data.assert_not_called()
+
+    def test_sees_changes_from_other_sessions(self):
+        other = Portfolio("test_user")
+        other.remove_position('MSFT')
+        self.assertFalse(self.portfolio.sell('MSFT', 1, 310.0))
+        self.assertEqual(self.portfolio.get_symbols(), ['AAPL', 'AAPL'])
+
+    def test_clear_after_other_session_adds(self):
+        """
+        Test that clearing removes lots another session added since loading.
+        """
+        other = Portfolio("test_user")
+        other.add_position('NVDA', 1, 100.0)
+        other.add_position('TSLA', 1, 200.0)
+        self.portfolio.clear()
+
+        self.assertEqual(self.portfolio.get_all(), [])
+        self.assertEqual(Portfolio("test_user").get_all(), [])
+        self.portfolio.save()
+        self.assertEqual(Portfolio("test_user").get_all(), [])
+
+
+class TestPortfolioLedger(unittest.TestCase):
+    """
+    Test suite for the portfolio event log.
+    """
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def add_lot(self, ledger, lot_id, shares=1):
+        lot = {'lot_id': lot_id, 'symbol': 'AAPL', 'shares': shares,
+               'purchase_price': 100.0, 'date_added': '2024-01-01'}
+        ledger.state['lots'][lot_id] = dict(lot)
+        return ledger.append({'type': 'lot_added', 'lot': lot})
+
+    def test_reload_replays_at_most_snapshot_interval(self):
+        ledger = PortfolioLedger("alice", root=self.root, snapshot_interval=10)
+        for i in range(25):
+            self.add_lot(ledger, f"lot{i}")
+
+        reloaded = PortfolioLedger("alice", root=self.root, snapshot_interval=10)
+        self.assertEqual(len(reloaded.state['lots']), 25)
+        self.assertEqual(reloaded.seq, 25)
+        self.assertEqual(reloaded.replayed, 5)
+
+    def test_state_at_point_in_time(self):
+        """
+        Test that state is reconstructed as of an event timestamp, across snapshots.
+        """
+        ledger = PortfolioLedger("alice", root=self.root, snapshot_interval=3)
+        stamps = [self.add_lot(ledger, f"lot{i}")['ts'] for i in range(7)]
+        ledger.state['lots'].clear()
+        ledger.append({'type': 'cleared'})
+
+        self.assertEqual(len(ledger.state_at(stamps[4])['lots']), 5)
+        self.assertEqual(len(ledger.state_at(stamps[6])['lots']), 7)
+        self.assertEqual(ledger.state_at('1999-12-31'), {'lots': {}, 'realized': []})
+        self.assertEqual(ledger.state_at('2999-12-31')['lots'], {})
+
+    def test_sold_lot_replay(self):
+        ledger = PortfolioLedger("bob", root=self.root)
+        self.add_lot(ledger, "a", shares=10)
+        ledger.append({'type': 'lot_sold', 'symbol': 'AAPL',
+                       'matches': [{'lot_id': 'a', 'shares': 4}],
+                       'realized': [{'lot_id': 'a', 'shares': 4, 'gain_loss': 8.0}]})
+
+        reloaded = PortfolioLedger("bob", root=self.root)
+        self.assertEqual(reloaded.state['lots']['a']['shares'], 6)
+        self.assertEqual(reloaded.state['realized'][0]['gain_loss'], 8.0)
+
+
+class TestUserRecordCache(unittest.TestCase):
+    """
+    Test suite for the process-local user record cache.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.db_path = f"{self.tmpdir}/users.db"
+        self.store = SQLiteUserStore(self.db_path)
+        self.store.create("alice", {'password': 'x', 'preferences': {}})
+        self.store.create("bob", {'password': 'y'})
+        patcher = patch('models.user.get_user_store', return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = UserRecordCache()
+
+    def test_unchanged_store_is_served_from_memory(self):
+        self.cache.get("alice")
+        with patch.object(self.store, 'get', side_effect=AssertionError("disk read")):
+            record = self.cache.get("alice")
+        record['password'] = 'mutated'
+        self.assertEqual(self.cache.get("alice")['password'], 'x')
+        self.assertEqual(self.cache.stats()['misses'], 1)
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_write_from_another_process_invalidates(self):
+        """
+        Test that a commit through a separate connection is picked up, and that
+        users whose rows did not change are revalidated without a reload.
+        """
+        self.cache.get("alice")
+        self.cache.get("bob")
+        SQLiteUserStore(self.db_path).update("alice", {'password': 'changed'})
+
+        self.assertEqual(self.cache.get("alice")['password'], 'changed')
+        self.assertEqual(self.cache.get("bob")['password'], 'y')
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['reloads_avoided'], 1)
+
+    def test_user_save_refreshes_cache(self):
+        with patch('models.user.user_cache', self.cache):
+            User("alice").update_preferences({'theme': 'dark'})
+            self.assertEqual(User("alice").get_preferences(), {'theme': 'dark'})
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """
+    Test suite for batched User and Portfolio writes.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.store = SQLiteUserStore(f"{self.tmpdir}/users.db")
+        self.store.create("alice", {'password': 'x', 'preferences': {}})
+        for target in ('models.user.get_user_store', 'models.unit_of_work.get_user_store'):
+            patcher = patch(target, return_value=self.store)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch('models.ledger.LEDGER_DIR', self.tmpdir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bulk_import_is_one_ledger_write(self):
+        portfolio = Portfolio("alice")
+        with patch.object(portfolio.ledger, 'append_many', wraps=portfolio.ledger.append_many) as append:
+            with unit_of_work():
+                for i in range(200):
+                    portfolio.add_position(f"S{i}", 1, 10.0, '2024-01-01')
+        append.assert_called_once()
+        self.assertEqual(Portfolio("alice").get_total_positions(), 200)
+
+    def test_user_fields_flush_once(self):
+        """
+        Test that several User edits become one store update, and that a new
+        User in the same unit reads its own writes.
+        """
+        with patch.object(self.store, 'update', wraps=self.store.update) as update:
+            with unit_of_work():
+                user = User("alice")
+                user.update_preferences({'theme': 'dark'})
+                user.change_password('hashed')
+                update.assert_not_called()
+                self.assertEqual(User("alice").get_preferences(), {'theme': 'dark'})
+        update.assert_called_once_with("alice", {'preferences': {'theme': 'dark'}, 'password': 'hashed'})
+
+    def test_watchlist_edits(self):
+        with unit_of_work():
+            user = User("alice")
+            self.assertTrue(user.add_to_watchlist("aapl"))
+            self.assertFalse(user.add_to_watchlist("AAPL"))
+            self.assertTrue(user.add_to_watchlist("MSFT"))
+            self.assertTrue(user.remove_from_watchlist("aapl"))
+        self.assertEqual(User("alice").get_watchlist(), ["MSFT"])
+
+    def test_rollback_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with unit_of_work():
+                Portfolio("alice").add_position('AAPL', 1, 100.0)
+                User("alice").change_password('hashed')
+                raise RuntimeError("boom")
+        self.assertEqual(Portfolio("alice").get_total_positions(), 0)
+        self.assertEqual(self.store.get("alice")['password'], 'x')
+
+    def test_flush_on_error_when_requested(self):
+        with self.assertRaises(RuntimeError):
+            with unit_of_work(rollback_on_error=False):
+                Portfolio("alice").add_position('AAPL', 1, 100.0)
+                raise RuntimeError("rerun")
+        self.assertEqual(Portfolio("alice").get_symbols(), ['AAPL'])
+
+    def test_other_session_writes_come_first(self):
+        """
+        Test that events another session logs while a unit is open end up
+        before the unit's own, in memory and snapshots as in the log.
+        """
+        portfolio = Portfolio("alice")
+        with unit_of_work():
+            portfolio.add_position('TSLA', 1, 200.0, '2024-01-01')
+            # Outside this thread's unit, like another session
+            other = threading.Thread(target=lambda: Portfolio("alice").clear())
+            other.start()
+            other.join()
+            portfolio.add_position('NVDA', 1, 100.0, '2024-01-01')
+
+        self.assertEqual(sorted(portfolio.get_symbols()), ['NVDA', 'TSLA'])
+        self.assertEqual(sorted(Portfolio("alice").get_symbols()), ['NVDA', 'TSLA'])
+        portfolio.save()
+        self.assertEqual(sorted(Portfolio("alice").get_symbols()), ['NVDA', 'TSLA'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,16 +2,22 @@
 Subsystem tests for the pages
 """
 
+import io
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from pages import stock_analysis
+from pages import stock_analysis, portfolio_manager
+from data.service_cache import service_cache
 
 class TestStockAnalysisPage(unittest.TestCase):
     """
     Test suite for the stock analysis page.
     """
 
+    def setUp(self):
+        # Responses are shared across sessions; start each test cold
+        service_cache.clear()
+
     @patch('pages.stock_analysis.display_company_header')
     @patch('pages.stock_analysis.display_key_metrics')
     @patch('pages.stock_analysis.st')
@@ -114,5 +120,58 @@ class TestStockAnalysisPage(unittest.TestCase):
         # Assert
         mock_st.warning.assert_called_with("Please enter a stock symbol.")
 
+
+
+class TestPortfolioValuationCache(unittest.TestCase):
+    """
+    Test suite for the portfolio page's per-session valuation cache.
+    """
+
+    @patch('pages.portfolio_manager.st')
+    @patch('pages.portfolio_manager.requests.post')
+    @patch('pages.portfolio_manager.get_service_url')
+    def test_fetch_valuation_reuses_result(self, mock_get_service_url, mock_requests_post, mock_st):
+        """
+        Unchanged positions are valued once per session until refreshed.
+        """
+        mock_st.session_state = {}
+        mock_get_service_url.return_value = "http://test_service"
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"positions": [], "summary": {"total_value": 1500.0}}
+        mock_requests_post.return_value = mock_response
+
+        positions = [{"symbol": "AAPL", "shares": 10.0, "purchase_price": 150.0, "date_added": None}]
+        first = portfolio_manager.fetch_valuation(positions)
+        second = portfolio_manager.fetch_valuation(list(positions))
+        self.assertEqual(first, second)
+        self.assertEqual(mock_requests_post.call_count, 1)
+
+        portfolio_manager.fetch_valuation(positions + [{"symbol": "MSFT", "shares": 1.0,
+                                                        "purchase_price": 300.0, "date_added": None}])
+        self.assertEqual(mock_requests_post.call_count, 2)
+
+        portfolio_manager.fetch_valuation(positions, refresh=True)
+        self.assertEqual(mock_requests_post.call_count, 3)
+
+
+class TestParsePositionsCsv(unittest.TestCase):
+    """
+    Test suite for the portfolio CSV import parser.
+    """
+
+    def test_bad_date_skips_only_its_row(self):
+        csv = io.StringIO(
+            "symbol,shares,purchase_price,date_added\n"
+            "AAPL,10,150,2024-01-05\n"
+            "MSFT,5,300,not a date\n"
+            "TSLA,2,200,\n"
+        )
+        positions, skipped = portfolio_manager.parse_positions_csv(csv)
+        self.assertEqual([(p['symbol'], p['date_added']) for p in positions],
+                         [("AAPL", "2024-01-05"), ("TSLA", None)])
+        self.assertEqual(skipped, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,10 +2,28 @@
 Unit tests for the services module
 """
 
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
 import unittest
+from datetime import date, timedelta
 from unittest.mock import patch, MagicMock
+import numpy as np
+import pandas as pd
 from fastapi.testclient import TestClient
 from services.stock_analysis.stock_analysis_service import app
+from services.portfolio import portfolio_service
+from services.portfolio.price_history import PriceHistoryCache, ReturnMatrixCache
+from services.portfolio.optimizer import project_capped_simplex
+from services.portfolio.projection import iter_projection
+from services.portfolio.revaluation_job import revalue_all
+from services.portfolio.quote_board import QuoteBoard
+from services.portfolio.valuation import fetch_quotes
+from services.symbols import symbol_service
+from services.registry import service_registry
 
 class TestStockAnalysisService(unittest.TestCase):
     """
@@ -41,6 +59,15 @@ class TestStockAnalysisService(unittest.TestCase):
         response = self.client.get("/analysis/UNKNOWN")
         self.assertEqual(response.status_code, 404)
 
+    @patch('services.stock_analysis.stock_analysis_service.api_client')
+    def test_unknown_symbol_rejected_locally(self, mock_api_client):
+        """
+        Test that an unlisted symbol is rejected without an API call.
+        """
+        response = self.client.get("/analysis/XQZZY")
+        self.assertEqual(response.status_code, 404)
+        mock_api_client.get_company_overview.assert_not_called()
+
     @patch('services.stock_analysis.stock_analysis_service.api_client')
     def test_get_analysis_api_error(self, mock_api_client):
         """
@@ -66,5 +93,568 @@ class TestStockAnalysisService(unittest.TestCase):
 
         mock_post.assert_called_once()
 
+def make_daily_payload(closes, start=date(2024, 1, 1)):
+    """Build a TIME_SERIES_DAILY style payload from a list of closes."""
+    return {
+        "Time Series (Daily)": {
+            (start + timedelta(days=i)).isoformat(): {"4. close": f"{c:.4f}"}
+            for i, c in enumerate(closes)
+        }
+    }
+
+
+class PortfolioAnalyticsTestCase(unittest.TestCase):
+    """
+    Base class wiring the portfolio service to synthetic price history.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        market = rng.normal(0.0005, 0.01, 80)
+        self.payloads = {
+            "SPY": make_daily_payload(100 * np.cumprod(1 + market)),
+            "AAA": make_daily_payload(50 * np.cumprod(1 + 2 * market)),
+            "BBB": make_daily_payload(20 * np.cumprod(1 + rng.normal(0, 0.01, 80))),
+        }
+        self.mock_api = MagicMock()
+        self.mock_api.get_daily_prices.side_effect = lambda s: self.payloads.get(s)
+
+        history = PriceHistoryCache(self.mock_api)
+        patchers = [
+            patch.object(portfolio_service, 'price_history', history),
+            patch.object(portfolio_service, 'return_matrices', ReturnMatrixCache(history)),
+            # The synthetic symbols stand in for listed ones
+            patch.object(portfolio_service, 'is_unknown_symbol', side_effect=lambda s: s.upper() == "XQZZY"),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+        self.client = TestClient(portfolio_service.app)
+
+
+class TestPortfolioRiskService(PortfolioAnalyticsTestCase):
+    """
+    Test suite for the portfolio risk endpoint.
+    """
+
+    def post_risk(self, positions, **kwargs):
+        return self.client.post("/portfolio/risk", json={"positions": positions, **kwargs})
+
+    def test_risk_metrics(self):
+        """
+        Test that the endpoint returns sane metrics for a two-stock portfolio.
+        """
+        response = self.post_risk([
+            {"symbol": "AAA", "shares": 10, "purchase_price": 40},
+            {"symbol": "BBB", "shares": 30, "purchase_price": 20},
+        ])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertAlmostEqual(sum(data['weights'].values()), 1.0)
+        self.assertEqual(data['observations'], 60)
+        self.assertGreater(data['annualized_volatility'], 0)
+        self.assertGreater(data['beta'], 0)
+        self.assertGreaterEqual(data['historical_cvar'], data['historical_var'])
+        self.assertGreaterEqual(data['parametric_cvar'], data['parametric_var'])
+        self.assertGreaterEqual(data['max_drawdown'], 0)
+
+    def test_single_stock_beta(self):
+        """
+        Test that a stock returning twice the benchmark has a beta of two.
+        """
+        response = self.post_risk([{"symbol": "AAA", "shares": 1, "purchase_price": 1}])
+        self.assertAlmostEqual(response.json()['beta'], 2.0, places=3)
+
+    def test_weight_change_reuses_matrix(self):
+        """
+        Test that changing share counts does not rebuild the covariance matrix.
+        """
+        self.post_risk([{"symbol": "AAA", "shares": 1, "purchase_price": 1},
+                        {"symbol": "BBB", "shares": 1, "purchase_price": 1}])
+        self.post_risk([{"symbol": "AAA", "shares": 5, "purchase_price": 1},
+                        {"symbol": "BBB", "shares": 2, "purchase_price": 1}])
+        self.assertEqual(portfolio_service.return_matrices.builds, 1)
+        self.assertEqual(self.mock_api.get_daily_prices.call_count, 3)
+
+    def test_missing_history(self):
+        """
+        Test that a symbol without price history returns a 502.
+        """
+        response = self.post_risk([{"symbol": "ZZZ", "shares": 1, "purchase_price": 1}])
+        self.assertEqual(response.status_code, 502)
+
+    def test_unknown_benchmark_rejected_locally(self):
+        response = self.post_risk([{"symbol": "AAA", "shares": 1, "purchase_price": 1}], benchmark="xqzzy")
+        self.assertEqual(response.status_code, 404)
+        self.mock_api.get_daily_prices.assert_not_called()
+
+
+class TestPortfolioProjection(PortfolioAnalyticsTestCase):
+    """
+    Test suite for the Monte Carlo projection.
+    """
+
+    positions = [
+        {"symbol": "AAA", "shares": 10, "purchase_price": 40},
+        {"symbol": "BBB", "shares": 30, "purchase_price": 20},
+    ]
+
+    def post_projection(self, path="/portfolio/projection", **kwargs):
+        body = {"positions": self.positions, "paths": 2000, "horizon_days": 20, "seed": 1, **kwargs}
+        return self.client.post(path, json=body)
+
+    def test_projection_is_reproducible(self):
+        """
+        Test that the same seed gives the same percentile bands.
+        """
+        first = self.post_projection().json()
+        second = self.post_projection().json()
+        self.assertEqual(first['percentiles'], second['percentiles'])
+        self.assertEqual(first['completed_paths'], 2000)
+
+        bands = list(first['percentiles'].values())
+        self.assertEqual(bands, sorted(bands))
+
+    def test_normal_method(self):
+        """
+        Test the multivariate normal projection.
+        """
+        response = self.post_projection(method="normal")
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(response.json()['percentiles']['50'], 0)
+
+    def test_invalid_method(self):
+        """
+        Test that an unknown return model is rejected.
+        """
+        self.assertEqual(self.post_projection(method="garch").status_code, 400)
+
+    def test_stream_reports_progress(self):
+        """
+        Test that the stream yields running results ending with every path.
+        """
+        response = self.post_projection("/portfolio/projection/stream", paths=20_000)
+        updates = [json.loads(line) for line in response.text.splitlines() if line]
+        self.assertGreater(len(updates), 1)
+        completed = [u['completed_paths'] for u in updates]
+        self.assertEqual(completed, sorted(completed))
+        self.assertEqual(completed[-1], 20_000)
+
+    def test_blocks_independent_of_executor(self):
+        """
+        Test that pooled and in-process runs give identical results.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        returns = np.random.default_rng(3).normal(0, 0.01, (50, 2))
+        values = np.array([100.0, 200.0])
+
+        serial = list(iter_projection(returns, values, 10, 3000, seed=5, block_size=500))
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            pooled = list(iter_projection(returns, values, 10, 3000, seed=5, block_size=500,
+                                          executor=executor))
+        self.assertEqual(serial[-1]['percentiles'], pooled[-1]['percentiles'])
+
+
+class TestPortfolioOptimizer(PortfolioAnalyticsTestCase):
+    """
+    Test suite for the efficient frontier optimizer.
+    """
+
+    def post_optimize(self, **kwargs):
+        body = {
+            "positions": [{"symbol": "AAA", "shares": 10, "purchase_price": 40}],
+            "candidates": ["BBB", "SPY"],
+            **kwargs,
+        }
+        return self.client.post("/portfolio/optimize", json=body)
+
+    def test_frontier_respects_constraints(self):
+        """
+        Test that every frontier point is fully invested, long-only and capped.
+        """
+        response = self.post_optimize(max_weight=0.6)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertGreater(len(data['frontier']), 1)
+        for point in data['frontier']:
+            weights = list(point['weights'].values())
+            self.assertAlmostEqual(sum(weights), 1.0, places=6)
+            self.assertGreaterEqual(min(weights), -1e-9)
+            self.assertLessEqual(max(weights), 0.6 + 1e-9)
+
+        returns = [p['expected_return'] for p in data['frontier']]
+        self.assertEqual(returns, sorted(returns))
+        self.assertEqual(data['current_weights']['AAA'], 1.0)
+        self.assertEqual(set(data['trades']), {"AAA", "BBB", "SPY"})
+
+    def test_infeasible_cap(self):
+        """
+        Test that a cap too small to invest fully is rejected.
+        """
+        self.assertEqual(self.post_optimize(max_weight=0.2).status_code, 400)
+
+    def test_capped_simplex_projection(self):
+        """
+        Test the projection onto the capped simplex.
+        """
+        w = project_capped_simplex(np.array([3.0, 0.2, 0.1, -1.0]), 0.5)
+        self.assertAlmostEqual(w.sum(), 1.0)
+        self.assertAlmostEqual(w[0], 0.5)
+        self.assertGreaterEqual(w.min(), 0.0)
+
+
+def make_quote(price, change="0.5%"):
+    return {"Global Quote": {"05. price": str(price), "10. change percent": change}}
+
+
+class TestPortfolioCalculate(unittest.TestCase):
+    """
+    Test suite for the portfolio valuation endpoint.
+    """
+
+    def setUp(self):
+        self.client = TestClient(portfolio_service.app)
+
+    @patch('services.portfolio.portfolio_service.api_client')
+    def test_lots_of_one_symbol_share_a_quote(self, mock_api_client):
+        mock_api_client.get_quote.side_effect = lambda symbol: make_quote(120.0) if symbol == "AAPL" else None
+        response = self.client.post("/portfolio/calculate", json=[
+            {"symbol": "AAPL", "shares": 10, "purchase_price": 100.0},
+            {"symbol": "AAPL", "shares": 5, "purchase_price": 140.0},
+            {"symbol": "MSFT", "shares": 1, "purchase_price": 1.0},
+        ])
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['positions']), 2)
+        self.assertEqual(data['summary']['total_value'], 1800.0)
+        self.assertEqual(data['summary']['total_gain_loss'], 100.0)
+        self.assertEqual(mock_api_client.get_quote.call_count, 2)
+
+    @patch('services.portfolio.portfolio_service.api_client')
+    def test_unknown_symbol_rejected_locally(self, mock_api_client):
+        response = self.client.post("/portfolio/calculate", json=[
+            {"symbol": "AAPL", "shares": 10, "purchase_price": 100.0},
+            {"symbol": "XQZZY", "shares": 1, "purchase_price": 1.0},
+        ])
+        self.assertEqual(response.status_code, 404)
+        mock_api_client.get_quote.assert_not_called()
+
+
+class TestWatchlistQuotes(unittest.TestCase):
+    """
+    Test suite for watchlist quotes served from the shared quote board.
+    """
+
+    def setUp(self):
+        self.client = TestClient(portfolio_service.app)
+        self.api_client = MagicMock()
+        self.prices = {"AAPL": 120.0, "MSFT": 310.0, "TSLA": 200.0}
+        self.api_client.get_quote.side_effect = lambda symbol: make_quote(self.prices[symbol])
+        self.board = QuoteBoard(lambda symbols: fetch_quotes(self.api_client, symbols))
+        patcher = patch.object(portfolio_service, 'quote_board', self.board)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_overlapping_watchlists_share_quotes(self):
+        first = self.client.post("/watchlist/quotes", json={"symbols": ["aapl", "MSFT"]})
+        second = self.client.post("/watchlist/quotes", json={"symbols": ["MSFT", "TSLA", "AAPL"]})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.json()['quotes']['MSFT']['price'], 310.0)
+        self.assertEqual(second.json()['pending'], [])
+        self.assertEqual(self.api_client.get_quote.call_count, 3)
+
+    def test_sweep_refreshes_union_once(self):
+        """
+        Test that one sweep fetches every watched symbol exactly once.
+        """
+        self.client.post("/watchlist/quotes", json={"symbols": ["AAPL", "MSFT"]})
+        self.client.post("/watchlist/quotes", json={"symbols": ["AAPL"]})
+        self.api_client.get_quote.reset_mock()
+        self.prices["AAPL"] = 125.0
+
+        self.board.sweep()
+
+        self.assertEqual(sorted(c.args[0] for c in self.api_client.get_quote.call_args_list), ["AAPL", "MSFT"])
+        response = self.client.post("/watchlist/quotes", json={"symbols": ["AAPL"]})
+        self.assertEqual(response.json()['quotes']['AAPL']['price'], 125.0)
+        self.assertIsNotNone(response.json()['updated_at'])
+
+    def test_stream_sends_only_deltas(self):
+        """
+        Test that the update stream sends every quote first, then only moved symbols.
+        """
+        self.board.ensure(["AAPL", "MSFT"])
+        holdings = {"AAPL": {'shares': 10.0, 'cost': 1000.0}}
+
+        async def collect():
+            updates = self.board.aiter_updates(["AAPL", "MSFT"], holdings, heartbeat=0.01)
+            received = [await updates.__anext__() for _ in range(4)]
+            self.prices["MSFT"] = 320.0
+            self.board.sweep()
+            received += [await updates.__anext__() for _ in range(2)]
+            await updates.aclose()
+            return received
+
+        received = asyncio.run(collect())
+        self.assertEqual([kind for kind, _ in received[:3]], ['quote', 'quote', 'summary'])
+        self.assertEqual(received[0][1]['market_value'], 1200.0)
+        self.assertEqual(received[2][1]['total_gain_loss'], 200.0)
+
+        self.assertEqual(received[3], ('heartbeat', None))
+        kind, row = received[4]
+        self.assertEqual((kind, row['symbol'], row['price']), ('quote', "MSFT", 320.0))
+        self.assertEqual(received[5][0], 'heartbeat')
+
+    def test_unquoted_symbol_waits_for_sweep(self):
+        """
+        Test that a symbol that returned no quote is not refetched per request.
+        """
+        self.api_client.get_quote.side_effect = lambda symbol: (
+            None if symbol == "MSFT" else make_quote(self.prices[symbol]))
+        for _ in range(3):
+            response = self.client.post("/watchlist/quotes", json={"symbols": ["AAPL", "MSFT"]})
+        self.assertEqual(response.json()['pending'], ["MSFT"])
+        self.assertEqual(self.api_client.get_quote.call_count, 2)
+
+        self.board.sweep()
+        self.assertEqual(self.api_client.get_quote.call_count, 4)
+
+    def test_sweep_budget_rotates(self):
+        """
+        Test that a budgeted sweep refreshes the least recently fetched symbols first.
+        """
+        board = QuoteBoard(lambda symbols: fetch_quotes(self.api_client, symbols), max_per_sweep=2)
+        board.watch(["AAPL", "MSFT", "TSLA"])
+        swept = []
+        for _ in range(3):
+            self.api_client.get_quote.reset_mock()
+            board.sweep()
+            swept.append(sorted(c.args[0] for c in self.api_client.get_quote.call_args_list))
+        self.assertEqual(swept, [["AAPL", "MSFT"], ["AAPL", "TSLA"], ["AAPL", "MSFT"]])
+
+    def test_new_symbol_not_blocked_by_sweep(self):
+        """
+        Test that a request for a new symbol does not wait for a running sweep.
+        """
+        release = threading.Event()
+
+        def fetch(symbols):
+            if "AAPL" in symbols:
+                release.wait(5)
+            return fetch_quotes(self.api_client, symbols)
+
+        board = QuoteBoard(fetch)
+        board.watch(["AAPL"])
+        sweeping = threading.Thread(target=board.sweep)
+        sweeping.start()
+        try:
+            board.ensure(["AAPL", "MSFT"])
+            snapshot = board.snapshot(["AAPL", "MSFT"])
+            self.assertEqual(list(snapshot['quotes']), ["MSFT"])
+            self.assertEqual(snapshot['pending'], ["AAPL"])
+        finally:
+            release.set()
+            sweeping.join()
+        self.assertIn("AAPL", board.snapshot(["AAPL"])['quotes'])
+
+    def test_async_stream_wakes_on_sweep(self):
+        """
+        Test that the async stream heartbeats while idle and wakes on a sweep.
+        """
+        self.board.ensure(["AAPL"])
+
+        async def collect():
+            updates = self.board.aiter_updates(["AAPL"], heartbeat=0.01)
+            received = [await updates.__anext__(), await updates.__anext__()]
+            self.prices["AAPL"] = 130.0
+            await asyncio.to_thread(self.board.sweep)
+            received.append(await updates.__anext__())
+            await updates.aclose()
+            return received
+
+        first, idle, moved = asyncio.run(collect())
+        self.assertEqual((first[0], first[1]['price']), ('quote', 120.0))
+        self.assertEqual(idle, ('heartbeat', None))
+        self.assertEqual((moved[0], moved[1]['price']), ('quote', 130.0))
+        self.assertEqual(self.board._waiters, set())
+
+    def test_unknown_symbols_not_polled(self):
+        response = self.client.post("/watchlist/quotes", json={"symbols": ["AAPL", "XQZZY"]})
+        self.assertEqual(response.json()['unknown'], ["XQZZY"])
+        self.assertEqual(list(response.json()['quotes']), ["AAPL"])
+        self.assertEqual(self.api_client.get_quote.call_count, 1)
+
+    def test_empty_watchlist(self):
+        response = self.client.post("/watchlist/quotes", json={"symbols": [" "]})
+        self.assertEqual(response.status_code, 400)
+
+
+class TestRevaluationJob(unittest.TestCase):
+    """
+    Test suite for the multi-user revaluation job.
+    """
+
+    def setUp(self):
+        from auth.user_store import SQLiteUserStore
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.store = SQLiteUserStore(f"{self.tmpdir}/users.db")
+        # The job must use the store it is given, never the configured one
+        for patcher in (patch('models.user.get_user_store', side_effect=AssertionError("default store")),
+                        patch('models.ledger.LEDGER_DIR', self.tmpdir)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_one_quote_per_symbol_across_users(self):
+        """
+        Test that overlapping holdings are priced from one fetch per symbol.
+        """
+        from models.portfolio import Portfolio
+        holdings = {"alice": [("AAPL", 10, 100.0), ("MSFT", 2, 300.0)],
+                    "bob": [("AAPL", 1, 150.0), ("TSLA", 3, 200.0)],
+                    "carol": []}
+        for username, lots in holdings.items():
+            self.store.create(username, {'password': 'x'})
+            portfolio = Portfolio(username, self.store)
+            for symbol, shares, price in lots:
+                portfolio.add_position(symbol, shares, price, '2024-01-01')
+
+        api_client = MagicMock()
+        prices = {"AAPL": 120.0, "MSFT": 310.0}
+        api_client.get_quote.side_effect = lambda symbol: make_quote(prices[symbol]) if symbol in prices else None
+
+        snapshots = revalue_all(api_client, self.store)
+
+        self.assertEqual(sorted(c.args[0] for c in api_client.get_quote.call_args_list), ["AAPL", "MSFT", "TSLA"])
+        self.assertEqual(set(snapshots), {"alice", "bob"})
+        alice = self.store.get("alice")['valuation']
+        self.assertEqual(alice['summary']['total_value'], 1200.0 + 620.0)
+        self.assertEqual(alice['signature'], Portfolio("alice", self.store).get_signature())
+        self.assertEqual(self.store.get("bob")['valuation']['missing_symbols'], ["TSLA"])
+        self.assertNotIn('valuation', self.store.get("carol"))
+
+
+class TestSymbolService(unittest.TestCase):
+    """
+    Test suite for the symbol search service.
+    """
+
+    def setUp(self):
+        self.saved_catalog = symbol_service.catalog
+        symbol_service.catalog = symbol_service.SymbolCatalog(pd.DataFrame({
+            'Symbol': ['AAPL', 'MSFT', 'SPY', 'QQQ'],
+            'Security Name': ['Apple Inc.', 'Microsoft Corporation',
+                              'SPDR S&P 500 ETF Trust', 'Invesco QQQ Trust'],
+            'SearchText': ['AAPL - Apple Inc.', 'MSFT - Microsoft Corporation',
+                           'SPY - SPDR S&P 500 ETF Trust', 'QQQ - Invesco QQQ Trust'],
+            'ETF': ['N', 'N', 'Y', 'Y'],
+            'Listing Exchange': ['Q', 'Q', 'P', 'Q'],
+        }))
+        self.client = TestClient(symbol_service.app)
+
+    def tearDown(self):
+        symbol_service.catalog = self.saved_catalog
+        symbol_service.store = None
+
+    def test_suggest_cached_per_query(self):
+        """
+        Repeated queries are answered from the LRU.
+        """
+        first = self.client.get("/suggest", params={"q": "microsft", "limit": 3})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["suggestions"], ["MSFT - Microsoft Corporation"])
+
+        self.client.get("/suggest", params={"q": "MICROSFT", "limit": 3})
+        self.assertEqual(symbol_service.catalog.hits, 1)
+        self.assertEqual(symbol_service.catalog.misses, 1)
+
+    def test_suggest_filters(self):
+        response = self.client.get("/suggest", params={"q": "trust", "filters": "etf:Y,exchange:Q"})
+        self.assertEqual(response.json()["suggestions"], ["QQQ - Invesco QQQ Trust"])
+
+        response = self.client.get("/suggest", params={"q": "trust", "filters": "sector:tech"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_browse(self):
+        response = self.client.get("/browse", params={"filters": "etf:Y", "limit": 1})
+        self.assertEqual(response.json(), {"total": 2, "symbols": ["QQQ - Invesco QQQ Trust"]})
+        self.assertEqual(self.client.get("/filters").json()["exchange"], ["P", "Q"])
+
+    def test_refresh_swaps_catalog(self):
+        """
+        A refresh applies the changed listing file and serves it from a new catalog.
+        """
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        csv_path = os.path.join(tmpdir, 'symbols.csv')
+        listing = symbol_service.catalog.symbols_df.drop(columns=['SearchText'])
+        listing.to_csv(csv_path, index=False)
+        symbol_service.store = symbol_service.SymbolStore(csv_path, on_refresh=symbol_service.serve_generation)
+        symbol_service.serve_generation(symbol_service.store.current)
+
+        listing[listing['Symbol'] != 'QQQ'].to_csv(csv_path, index=False)
+        response = self.client.post("/refresh")
+        self.assertEqual(response.json(), {"generation": 2, "added": 0, "removed": 1, "changed": 0, "renamed": {}})
+        self.assertEqual(self.client.get("/suggest", params={"q": "QQQ"}).json()["suggestions"], [])
+
+    def test_resolve_batch(self):
+        response = self.client.post("/resolve", json={"symbols": ["aapl", "SPY", "NOPE"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "resolved": {"AAPL": "AAPL - Apple Inc.", "SPY": "SPY - SPDR S&P 500 ETF Trust"},
+            "canonical": {"aapl": "AAPL", "SPY": "SPY"},
+            "unknown": ["NOPE"],
+        })
+
+
+class TestServiceRegistry(unittest.TestCase):
+    """
+    Test suite for the service registry.
+    """
+
+    def setUp(self):
+        self.client = TestClient(service_registry.app)
+
+    @patch('services.registry.service_registry.requests.get')
+    def test_resolve_all_services(self, mock_get):
+        services, checks = MagicMock(status_code=200), MagicMock(status_code=200)
+        services.json.return_value = {
+            "Portfolio_Service-a1": {"Service": "Portfolio_Service", "Address": "a1", "Port": 8002},
+            "Portfolio_Service-b2": {"Service": "Portfolio_Service", "Address": "b2", "Port": 8002},
+            "Portfolio_Service-c3": {"Service": "Portfolio_Service", "Address": "c3", "Port": 8002},
+            "consul": {"Service": "consul", "Address": "consul", "Port": 8300},
+        }
+        # c3 is failing its health check
+        checks.json.return_value = [{"ServiceID": "Portfolio_Service-a1"}, {"ServiceID": "Portfolio_Service-b2"}]
+        mock_get.side_effect = [services, checks]
+
+        response = self.client.get("/services/resolve")
+        self.assertEqual(response.json(), {
+            "Portfolio_Service": [{"service_url": "http://a1:8002"}, {"service_url": "http://b2:8002"}],
+        })
+
+    @patch('services.registry.service_registry.requests.get')
+    def test_service_lists_passing_instances(self, mock_get):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = [
+            {"Node": {"Address": "10.0.0.1"}, "Service": {"Address": "a1", "Port": 8003}},
+            {"Node": {"Address": "10.0.0.1"}, "Service": {"Address": "b2", "Port": 8003}},
+        ]
+        response = self.client.get("/services/Portfolio_Service")
+
+        self.assertEqual(response.json(), {
+            "service_url": "http://a1:8003",
+            "instances": ["http://a1:8003", "http://b2:8003"],
+        })
+        self.assertEqual(mock_get.call_args.kwargs["params"], {"passing": "true"})
+
+    @patch('services.registry.service_registry.requests.get')
+    def test_no_passing_instances(self, mock_get):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = []
+        response = self.client.get("/services/Portfolio_Service")
+        self.assertEqual(response.status_code, 404)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,7 +9,12 @@ from utils.helpers import (
     infer_quarter, format_date, get_sentiment_color,
     get_sentiment_emoji, get_sentiment_label
 )
-from utils.service_discovery import get_available_services, get_service_url, deregister_service
+import requests
+from utils.service_discovery import (
+    get_available_services, get_service_url, deregister_service, ServiceCatalog,
+    service_urls, prefetch_service_urls, track_service_call
+)
+from utils.load_balancer import LoadBalancer
 
 class TestHelpers(unittest.TestCase):
     """
@@ -123,5 +128,150 @@ class TestServiceDiscovery(unittest.TestCase):
         with self.assertRaises(Exception):
             deregister_service("failing_service")
 
+
+class TestServiceCatalog(unittest.TestCase):
+    """
+    Test suite for the cached service list.
+    """
+
+    @patch('utils.service_discovery.get_available_services')
+    def test_empty_result_not_cached(self, mock_get_services):
+        catalog = ServiceCatalog(ttl=30)
+        mock_get_services.return_value = {}
+        self.assertEqual(catalog.get(), {})
+
+        mock_get_services.return_value = {"Stock Analysis Service": {}}
+        self.assertEqual(catalog.get(), {"Stock Analysis Service": {}})
+        catalog.get()
+        self.assertEqual(mock_get_services.call_count, 2)
+
+    @patch('utils.service_discovery.time.monotonic')
+    @patch('utils.service_discovery.get_available_services')
+    def test_stale_list_served_while_refreshing(self, mock_get_services, mock_monotonic):
+        """
+        Once stale, callers get the old list and the refresh runs in the background.
+        """
+        mock_monotonic.return_value = 0.0
+        catalog = ServiceCatalog(ttl=30)
+        mock_get_services.return_value = {"Stock Analysis Service": {}}
+        catalog.get()
+
+        mock_monotonic.return_value = 31.0
+        mock_get_services.return_value = {"Stock Analysis Service": {}, "Earnings Service": {}}
+        self.assertEqual(catalog.get(), {"Stock Analysis Service": {}})
+        catalog._refresh_thread.join(timeout=5)
+        self.assertIn("Earnings Service", catalog.get())
+        self.assertEqual(mock_get_services.call_count, 2)
+
+
+class TestServiceUrlCache(unittest.TestCase):
+    """
+    Test suite for cached service URL resolution.
+    """
+
+    def setUp(self):
+        service_urls.invalidate()
+
+    def tearDown(self):
+        service_urls.invalidate()
+
+    @patch('utils.service_discovery.requests.get')
+    def test_resolved_url_reused(self, mock_get):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {"service_url": "http://portfolio:8002"}
+
+        self.assertEqual(get_service_url("Portfolio_Service"), "http://portfolio:8002")
+        self.assertEqual(get_service_url("Portfolio_Service"), "http://portfolio:8002")
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('utils.service_discovery.requests.get')
+    def test_failed_call_invalidates(self, mock_get):
+        """
+        A connection failure to a cached URL resolves it again on the next call.
+        """
+        service_urls.put("Portfolio_Service", ["http://old:8002"])
+        with self.assertRaises(requests.ConnectionError):
+            with track_service_call("Portfolio_Service", "http://old:8002"):
+                raise requests.ConnectionError("refused")
+
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {"service_url": "http://new:8002"}
+        self.assertEqual(get_service_url("Portfolio_Service"), "http://new:8002")
+
+    @patch('utils.service_discovery.requests.get')
+    def test_prefetch_resolves_all_once(self, mock_get):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {
+            "Portfolio_Service": [{"service_url": "http://portfolio:8002"}],
+            "Earnings_Service": [{"service_url": "http://earnings:8003"}],
+        }
+        prefetch_service_urls().join()
+        self.assertIsNone(prefetch_service_urls())
+
+        self.assertEqual(get_service_url("Earnings_Service"), "http://earnings:8003")
+        mock_get.assert_called_once()
+        self.assertTrue(mock_get.call_args[0][0].endswith("/services/resolve"))
+
+    @patch('utils.service_discovery.requests.get')
+    def test_calls_spread_over_instances(self, mock_get):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = {
+            "service_url": "http://portfolio-1:8003",
+            "instances": ["http://portfolio-1:8003", "http://portfolio-2:8003", "http://portfolio-3:8003"],
+        }
+        chosen = {get_service_url("Portfolio_Service") for _ in range(6)}
+        self.assertEqual(len(chosen), 3)
+        mock_get.assert_called_once()
+
+
+class TestLoadBalancer(unittest.TestCase):
+    """
+    Test suite for choosing between service instances.
+    """
+
+    URLS = ["http://a:8000", "http://b:8000", "http://c:8000"]
+
+    def test_round_robin(self):
+        balancer = LoadBalancer("round_robin")
+        balancer.update(self.URLS)
+        self.assertEqual(sorted(balancer.choose() for _ in range(3)), self.URLS)
+
+    def test_least_outstanding(self):
+        balancer = LoadBalancer("least_outstanding")
+        balancer.update(self.URLS)
+        balancer.started("http://a:8000")
+        balancer.started("http://b:8000")
+        self.assertEqual(balancer.choose(), "http://c:8000")
+
+    def test_ewma_prefers_faster_instance(self):
+        balancer = LoadBalancer("ewma")
+        balancer.update(self.URLS)
+        for url, seconds in zip(self.URLS, (0.5, 0.05, 0.2)):
+            with patch('utils.load_balancer.time.perf_counter', side_effect=[0.0, seconds]):
+                with balancer.track(url):
+                    pass
+        self.assertEqual(balancer.choose(), "http://b:8000")
+
+    def test_failing_instance_ejected(self):
+        """
+        Consecutive connection failures take an instance out of rotation.
+        """
+        balancer = LoadBalancer("round_robin", eject_after=2)
+        balancer.update(self.URLS[:2])
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                with balancer.track("http://a:8000", (requests.ConnectionError,)):
+                    raise requests.ConnectionError("refused")
+        self.assertEqual({balancer.choose() for _ in range(4)}, {"http://b:8000"})
+
+        # Stats survive a refresh of the instance list
+        balancer.update(self.URLS[:2])
+        self.assertEqual(balancer.choose(), "http://b:8000")
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            LoadBalancer("random")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,144 @@
+"""
+Load Balancer
+Client-side choice between the healthy instances of a service
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+# How the next instance is chosen: round_robin, least_outstanding or ewma
+LOAD_BALANCING = os.environ.get("LOAD_BALANCING", "round_robin")
+# Weight of the newest sample in an instance's average latency
+EWMA_ALPHA = 0.3
+# Consecutive failed calls before an instance is taken out of rotation
+EJECT_AFTER = 3
+# Seconds an ejected instance is skipped before it is tried again
+EJECT_SECONDS = 30.0
+
+
+class Instance:
+    """One replica of a service and what its recent calls looked like."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.latency: Optional[float] = None  # EWMA of call durations, in seconds
+        self.failures = 0  # consecutive
+        self.ejected_until = 0.0
+
+    def available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def cost(self) -> float:
+        # Untried instances look free so they get measured; busy ones look slower
+        return (self.latency or 0.0) * (self.outstanding + 1)
+
+
+class LoadBalancer:
+    """
+    Spreads one service's calls over its instances.
+
+    Strategies:
+    - round_robin: each instance in turn
+    - least_outstanding: the instance with the fewest calls in flight
+    - ewma: the lowest average latency, scaled by calls in flight
+
+    Every strategy records each call's latency and outcome. An instance
+    that fails EJECT_AFTER calls in a row is skipped for EJECT_SECONDS;
+    if every instance is ejected, the one due back first is used anyway.
+    """
+
+    STRATEGIES = ("round_robin", "least_outstanding", "ewma")
+
+    def __init__(self, strategy: str = LOAD_BALANCING, alpha: float = EWMA_ALPHA,
+                 eject_after: int = EJECT_AFTER, eject_seconds: float = EJECT_SECONDS):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown load balancing strategy '{strategy}'; use {', '.join(self.STRATEGIES)}")
+        self.strategy = strategy
+        self.alpha = alpha
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.instances: Dict[str, Instance] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def update(self, urls: Iterable[str]):
+        """Set the current instances, keeping the stats of those still listed."""
+        with self._lock:
+            self.instances = {url: self.instances.get(url) or Instance(url) for url in urls}
+
+    def choose(self) -> str:
+        """URL of the instance for the next call."""
+        with self._lock:
+            if not self.instances:
+                raise LookupError("No instances to choose from")
+            now = time.monotonic()
+            candidates: List[Instance] = [i for i in self.instances.values() if i.available(now)]
+            if not candidates:
+                return min(self.instances.values(), key=lambda i: i.ejected_until).url
+
+            if self.strategy == "least_outstanding":
+                # Rotate the start so ties don't all land on the first instance
+                self._next += 1
+                start = self._next % len(candidates)
+                candidates = candidates[start:] + candidates[:start]
+                return min(candidates, key=lambda i: i.outstanding).url
+            if self.strategy == "ewma":
+                return min(candidates, key=Instance.cost).url
+            self._next += 1
+            return candidates[self._next % len(candidates)].url
+
+    def started(self, url: str):
+        with self._lock:
+            instance = self.instances.get(url)
+            if instance is not None:
+                instance.outstanding += 1
+
+    def finished(self, url: str, seconds: float, ok: bool = True):
+        with self._lock:
+            instance = self.instances.get(url)
+            if instance is None:
+                return
+            instance.outstanding = max(0, instance.outstanding - 1)
+            if instance.latency is None:
+                instance.latency = seconds
+            else:
+                instance.latency += self.alpha * (seconds - instance.latency)
+            if ok:
+                instance.failures = 0
+                return
+            instance.failures += 1
+            if instance.failures >= self.eject_after:
+                instance.ejected_until = time.monotonic() + self.eject_seconds
+                instance.failures = 0
+
+    @contextmanager
+    def track(self, url: str, failures=(Exception,)):
+        """Count a call to `url` as in flight and record how it went."""
+        self.started(url)
+        started = time.perf_counter()
+        try:
+            yield
+        except failures:
+            self.finished(url, time.perf_counter() - started, ok=False)
+            raise
+        except BaseException:
+            self.finished(url, time.perf_counter() - started)
+            raise
+        self.finished(url, time.perf_counter() - started)
+
+    def stats(self) -> List[Dict[str, object]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": i.url,
+                    "outstanding": i.outstanding,
+                    "latency_ms": None if i.latency is None else round(i.latency * 1000, 1),
+                    "ejected": not i.available(now),
+                }
+                for i in self.instances.values()
+            ]
@@ -1,6 +1,11 @@
 import requests
 import os
 import json
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.load_balancer import LoadBalancer
 
 SERVICE_REGISTRY_URL = "http://service_registry:8010"  # Replace with the actual service registry URL
 
@@ -30,17 +35,220 @@ def get_available_services():
         print(f"Error contacting service registry: {e}")
         return {}
 
+# Seconds the cached service list is served before a background refresh
+SERVICES_TTL = 30
+
+
+class ServiceCatalog:
+    """
+    The registry's service list, cached for every session in the process.
+
+    Only the first call waits on the registry. Once the list is older than
+    the TTL, callers keep getting it while one background thread refreshes
+    it. Empty results (registry down or still starting) are never cached.
+    """
+
+    def __init__(self, ttl: float = SERVICES_TTL):
+        self.ttl = ttl
+        self._services = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+
+    def _fetch(self):
+        services = get_available_services()
+        if services:
+            with self._lock:
+                self._services = services
+                self._fetched_at = time.monotonic()
+        return services
+
+    def get(self) -> dict:
+        """Cached services by display name; refreshes in the background once stale."""
+        with self._lock:
+            services = self._services
+            stale = time.monotonic() - self._fetched_at >= self.ttl
+            refreshing = self._refresh_thread is not None and self._refresh_thread.is_alive()
+            if services is not None and stale and not refreshing:
+                self._refresh_thread = threading.Thread(target=self._fetch, name="service-catalog", daemon=True)
+                self._refresh_thread.start()
+
+        if services is None:
+            return self._fetch()
+        return services
+
+    def clear(self):
+        with self._lock:
+            self._services = None
+            self._fetched_at = 0.0
+
+
+service_catalog = ServiceCatalog()
+
+# Seconds a resolved service URL is reused before asking the registry again
+SERVICE_URL_TTL = 60
+# Connect and read timeouts for registry calls
+REGISTRY_TIMEOUT = (1.0, 3.0)
+
+
+class ServiceUrlCache:
+    """
+    Resolved instance URLs, shared by every session in the process.
+
+    A page action normally finds its URLs here and makes no registry call.
+    Entries expire after the TTL, and are dropped as soon as a call to them
+    fails to connect, so a moved service is resolved again on the next try.
+    Each service has a load balancer that picks one of its instances per
+    call; it outlives the entries so instance stats survive re-resolution.
+    """
+
+    def __init__(self, ttl: float = SERVICE_URL_TTL):
+        self.ttl = ttl
+        self._urls = {}  # service name -> (instance urls, expires at)
+        self._balancers = {}  # service name -> LoadBalancer
+        self._resolved_at = None
+        self._lock = threading.Lock()
+
+    def balancer(self, service_name) -> LoadBalancer:
+        with self._lock:
+            balancer = self._balancers.get(service_name)
+            if balancer is None:
+                balancer = self._balancers[service_name] = LoadBalancer()
+            return balancer
+
+    def get(self, service_name):
+        with self._lock:
+            entry = self._urls.get(service_name)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+        return None
+
+    def choose(self, service_name):
+        """URL of the instance for the next call, or None when not resolved."""
+        if not self.get(service_name):
+            return None
+        return self.balancer(service_name).choose()
+
+    def put(self, service_name, urls):
+        urls = list(urls)
+        with self._lock:
+            self._urls[service_name] = (urls, time.monotonic() + self.ttl)
+        self.balancer(service_name).update(urls)
+
+    def put_all(self, urls: dict):
+        """Replace every entry with one bulk resolution."""
+        now = time.monotonic()
+        with self._lock:
+            self._urls = {name: (list(instances), now + self.ttl) for name, instances in urls.items()}
+            self._resolved_at = now
+        for name, instances in urls.items():
+            self.balancer(name).update(instances)
+
+    def defer_bulk(self):
+        """Wait a TTL before the next bulk resolution, keeping current entries."""
+        with self._lock:
+            self._resolved_at = time.monotonic()
+
+    def bulk_stale(self) -> bool:
+        """True when the last bulk resolution is missing or older than the TTL."""
+        with self._lock:
+            return self._resolved_at is None or time.monotonic() - self._resolved_at >= self.ttl
+
+    def invalidate(self, service_name=None):
+        with self._lock:
+            if service_name is None:
+                self._urls.clear()
+                self._balancers.clear()
+                self._resolved_at = None
+            else:
+                self._urls.pop(service_name, None)
+
+
+service_urls = ServiceUrlCache()
+
+
+def _resolve_all():
+    try:
+        response = requests.get(f"{SERVICE_REGISTRY_URL}/services/resolve", timeout=REGISTRY_TIMEOUT)
+        if response.status_code == 200:
+            service_urls.put_all({
+                name: [instance['service_url'] for instance in instances]
+                for name, instances in response.json().items() if instances
+            })
+            return
+        print(f"Failed to resolve services: {response.text}")
+    except Exception as e:
+        print(f"Error contacting service registry: {e}")
+
+
+_prefetch_lock = threading.Lock()
+_prefetch_thread = None
+
+
+def prefetch_service_urls():
+    """
+    Resolve every service's instances with one registry call, in a background
+    thread. Cheap to call on every rerun: it does nothing until the previous
+    resolution is a TTL old, and never waits on the registry; until the
+    thread finishes, calls use the current entries or resolve on their own.
+    Returns the thread it started, if any.
+    """
+    global _prefetch_thread
+    with _prefetch_lock:
+        refreshing = _prefetch_thread is not None and _prefetch_thread.is_alive()
+        if refreshing or not service_urls.bulk_stale():
+            return None
+        # Claims this round; if the registry is unavailable, it isn't retried on every rerun
+        service_urls.defer_bulk()
+        _prefetch_thread = threading.Thread(target=_resolve_all, name="service-urls", daemon=True)
+        _prefetch_thread.start()
+        return _prefetch_thread
+
+
+@contextmanager
+def track_service_call(service_name, service_url=None):
+    """
+    Record a call to one of a service's instances for its load balancer,
+    and forget the service's cached URLs when the call cannot connect.
+    """
+    failures = (requests.ConnectionError, requests.Timeout)
+    try:
+        if service_url is None:
+            yield
+        else:
+            with service_urls.balancer(service_name).track(service_url, failures):
+                yield
+    except failures:
+        service_urls.invalidate(service_name)
+        raise
+
+
+def tracked_call(service_name, service_url, call):
+    """
+    `call` wrapped in track_service_call, for callers that may not make it,
+    e.g. on a response cache hit, which should not count as a fast call.
+    """
+    def run():
+        with track_service_call(service_name, service_url):
+            return call()
+    return run
+
+
 def get_service_url(service_name):
-    #Fetch the service URL from the service registry microservice.
+    #Pick one of the service's healthy instances, resolved from the cache when it is fresh, otherwise from the service registry microservice.
+    chosen = service_urls.choose(service_name)
+    if chosen:
+        return chosen
     try:
-        response = requests.get(f"{SERVICE_REGISTRY_URL}/services/{service_name}")
+        response = requests.get(f"{SERVICE_REGISTRY_URL}/services/{service_name}", timeout=REGISTRY_TIMEOUT)
 
         if response.status_code == 200:
-            # Parse the JSON response to get the service URL
+            # Parse the JSON response to get the instance URLs
             service_data = response.json()
             service_url = service_data.get('service_url')
             if service_url:
-                return service_url
+                service_urls.put(service_name, service_data.get('instances') or [service_url])
+                return service_urls.choose(service_name)
             else:
                 raise Exception(f"Service {service_name} URL not found.")
         else: